@@ -16,11 +16,22 @@ port="$1"
 # Apply migrations
 poetry run python manage.py migrate
 
+# Build the Bloom filter of taken usernames, off the request path
+poetry run python manage.py build_username_index
+
 # Creation of cache table
 poetry run python manage.py createcachetable
 
 # Collect static files
 poetry run python manage.py collectstatic --noinput
 
-# Start the Django development server
-exec poetry run gunicorn setup.wsgi:application -b 0.0.0.0:"$port"
+# Generate the OpenAPI schema once, rather than in each worker
+poetry run python manage.py build_openapi_schema
+
+# Start the Django server, with threaded workers: the long polls and event streams of
+# the task batches hold a thread each (see src.batches), and must not hold a whole worker
+exec poetry run gunicorn setup.wsgi:application -b 0.0.0.0:"$port" \
+    --worker-class gthread \
+    --workers "${GUNICORN_WORKERS:-2}" \
+    --threads "${GUNICORN_THREADS:-16}" \
+    --timeout 30
@@ -0,0 +1,283 @@
+"""
+This module provides the logging handler, filter and formatter configured by `LOGGING`.
+
+Records are written to the log file by a background thread: the handler only puts them
+on a bounded queue, so the threads serving requests never wait for the disk. When the
+queue is full, records are dropped (and counted) rather than waited for; while it is
+more than half full, only a sample of the DEBUG records is kept.
+
+By default, the file is not rotated by the process: it is reopened when it was moved
+or removed (`WatchedFileHandler`), so an external rotation (e.g. logrotate) works with
+any number of processes appending to it. Rotation by size, or at a time interval (e.g.
+at midnight), is only safe with a single process writing the file: each process rotates
+on its own, renaming or removing the files the others are writing.
+
+The numbers of records dropped and sampled out are logged, as a WARNING, by the
+background thread, at most every `report_interval` seconds.
+
+Classes:
+    QueuedFileHandler: A handler writing to a rotating file from a background thread.
+    RateLimitFilter: A filter capping the number of records per second of each logger.
+    JsonFormatter: A formatter writing each record as one JSON object per line.
+"""
+
+import os
+from copy import copy
+from datetime import datetime, timezone
+from logging import DEBUG, ERROR, WARNING, Formatter, Filter, LogRecord, getLevelName
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+    WatchedFileHandler,
+)
+from queue import Full, Queue
+from threading import Lock
+from time import monotonic
+from weakref import WeakSet
+
+import orjson
+
+_queued_handlers = WeakSet()
+
+
+class _ReportingListener(QueueListener):
+    def __init__(self, queue, handler):
+        super().__init__(queue, handler.target)
+        self.owner = handler
+
+    def handle(self, record):
+        super().handle(record)
+        self.owner.report_losses()
+
+    def enqueue_sentinel(self):
+        # Wait for room in a full queue, rather than failing to stop
+        self.queue.put(self._sentinel)
+
+
+class QueuedFileHandler(QueueHandler):
+    """
+    QueuedFileHandler Class
+
+    A handler putting records on a bounded queue, from which a background thread writes
+    them to a file, reopened when moved (by default), or rotated by size or time. The
+    formatter set on the handler is used by that thread.
+
+    Attributes:
+        target (Handler): The file handler, called by the background thread.
+        queue_size (int): The maximum number of records waiting to be written.
+        debug_sample_rate (float): The fraction of DEBUG records kept while the queue is
+            more than half full.
+        report_interval (float): The minimum number of seconds between two reports of
+            the records lost.
+        dropped (int): The number of records dropped because the queue was full.
+        sampled_out (int): The number of DEBUG records left out by the sampling.
+
+    """
+
+    def __init__(
+        self,
+        filename,
+        max_bytes=0,
+        backup_count=0,
+        when='',
+        queue_size=10000,
+        debug_sample_rate=1.0,
+        report_interval=60,
+    ):
+        if when:
+            self.target = TimedRotatingFileHandler(
+                filename, when=when, backupCount=backup_count, encoding='utf-8', delay=True
+            )
+        elif not max_bytes:
+            self.target = WatchedFileHandler(filename, encoding='utf-8', delay=True)
+        else:
+            self.target = RotatingFileHandler(
+                filename,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+                encoding='utf-8',
+                delay=True,
+            )
+
+        super().__init__(Queue(queue_size))
+        self.queue_size = queue_size
+        self.debug_sample_rate = debug_sample_rate
+        self.report_interval = report_interval
+        self.dropped = 0
+        self.sampled_out = 0
+        self._debug_seen = 0
+        self._reported = (0, 0)
+        self._reported_at = float('-inf')
+        self.listener = None
+
+        self.start()
+        _queued_handlers.add(self)
+
+    def start(self):
+        """
+        Start the background thread writing the records, on a new queue.
+        """
+        self.queue = Queue(self.queue_size)
+        self.listener = _ReportingListener(self.queue, self)
+        self.listener.start()
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Only merge the arguments into the message, while they are unchanged: the
+        # formatting (and that of the exception) is left to the background thread
+        record = copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+
+        return record
+
+    def enqueue(self, record):
+        if record.levelno <= DEBUG and self.queue.qsize() * 2 > self.queue_size:
+            # Keep one DEBUG record out of every 1 / debug_sample_rate
+            self._debug_seen += 1
+            if self._debug_seen * self.debug_sample_rate < 1:
+                self.sampled_out += 1
+                return
+            self._debug_seen = 0
+
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+    def report_losses(self, force=False):
+        """
+        Write a WARNING with the numbers of records dropped and sampled out since the
+        last report, if any, at most every `report_interval` seconds. Called by the
+        background thread.
+
+        Args:
+            force (bool): Whether to report regardless of the interval.
+
+        """
+        lost = (self.dropped, self.sampled_out)
+        if lost == self._reported:
+            return
+
+        now = monotonic()
+        if not force and now - self._reported_at < self.report_interval:
+            return
+
+        dropped, sampled_out = (total - reported for total, reported in zip(lost, self._reported))
+        self._reported, self._reported_at = lost, now
+        self.target.handle(
+            LogRecord(
+                __name__,
+                WARNING,
+                __file__,
+                0,
+                'Log records lost: %d dropped (queue full), %d DEBUG records sampled out',
+                (dropped, sampled_out),
+                None,
+            )
+        )
+
+    def close(self):
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+            self.report_losses(force=True)
+
+        self.target.close()
+        super().close()
+
+
+def _restart_queued_handlers():
+    # The background threads do not survive a fork (e.g. of gunicorn or Celery workers)
+    for handler in list(_queued_handlers):
+        if handler.listener is not None:
+            handler.start()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_queued_handlers)
+
+
+class RateLimitFilter(Filter):
+    """
+    RateLimitFilter Class
+
+    A filter capping the number of records per second of each logger, with a token
+    bucket per logger name. Records at or above `exempt_level` always pass. The number
+    of records dropped is set, as `suppressed`, on the next record of the logger passing.
+
+    Attributes:
+        rate (float): The number of records per second allowed per logger, 0 for no cap.
+        burst (float): The number of records allowed at once.
+        exempt_level (int): The level from which records are never dropped.
+
+    """
+
+    def __init__(self, rate=100, burst=None, exempt_level=ERROR):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst or rate
+        self.exempt_level = (
+            exempt_level if isinstance(exempt_level, int) else getLevelName(exempt_level)
+        )
+        self._buckets = {}
+        self._suppressed = {}
+        self._lock = Lock()
+
+    def filter(self, record):
+        if not self.rate or record.levelno >= self.exempt_level:
+            return True
+
+        now = monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(record.name, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+            if tokens < 1:
+                self._buckets[record.name] = (tokens, now)
+                self._suppressed[record.name] = self._suppressed.get(record.name, 0) + 1
+                return False
+
+            self._buckets[record.name] = (tokens - 1, now)
+            suppressed = self._suppressed.pop(record.name, 0)
+
+        if suppressed:
+            record.suppressed = suppressed
+
+        return True
+
+
+class JsonFormatter(Formatter):
+    """
+    JsonFormatter Class
+
+    A formatter writing each record as one JSON object per line, with its time (UTC,
+    ISO 8601), level, logger, message, process, thread, source location, and its
+    exception and number of `suppressed` records, if any.
+
+    """
+
+    def format(self, record):
+        data = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.thread,
+            'module': record.module,
+            'line': record.lineno,
+        }
+
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exception'] = record.exc_text
+        if getattr(record, 'suppressed', 0):
+            data['suppressed'] = record.suppressed
+
+        return orjson.dumps(data, default=str).decode()
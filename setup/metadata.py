@@ -0,0 +1,93 @@
+"""
+This module reads the metadata of the project (name, version, description, authors and
+license) from the `[tool.poetry]` table of `pyproject.toml`, on first use.
+
+The settings only hold the path of the file (`PYPROJECT_PATH`), so that importing them,
+as every `manage.py` command, Celery worker and web worker does, reads and parses
+nothing. The values are TOML strings and arrays of strings: they are decoded as Python
+literals, which they also are, so that they come without their quotes.
+
+Functions:
+    read_pyproject: Read the values of a table of a `pyproject.toml` file.
+    parse_authors: Split authors like 'Name <email>' into their name and email.
+    get_project_metadata: Return the metadata of the project, read once.
+"""
+
+from ast import literal_eval
+from configparser import ConfigParser
+from functools import lru_cache
+from re import compile as compile_regex
+
+from django.conf import settings
+
+AUTHOR_PATTERN = compile_regex(r'\s*(.*?)\s*<(.*?)>\s*')
+
+
+def read_pyproject(path, table='tool.poetry'):
+    """
+    Read the values of a table of a `pyproject.toml` file.
+
+    Args:
+        path (str): The path of the file.
+        table (str): The dotted name of the table.
+
+    Returns:
+        dict: The values of the table; strings and arrays of strings decoded, and any
+        other value (e.g. an inline table) left as written.
+
+    """
+    parser = ConfigParser()
+    parser.read(path, encoding='utf-8')
+
+    values = {}
+    for key, value in parser[table].items():
+        try:
+            values[key] = literal_eval(value)
+        except (ValueError, SyntaxError):
+            values[key] = value
+
+    return values
+
+
+def parse_authors(authors):
+    """
+    Split authors like 'Name <email>' into their name and email.
+
+    Args:
+        authors (list): The authors, as in `pyproject.toml`.
+
+    Returns:
+        list: A dictionary with the `name` and `email` of each author; the email is
+        empty for authors written without one.
+
+    """
+    parsed = []
+    for author in authors:
+        match = AUTHOR_PATTERN.fullmatch(author)
+        if match:
+            parsed.append({'name': match.group(1), 'email': match.group(2).strip()})
+        else:
+            parsed.append({'name': author.strip(), 'email': ''})
+
+    return parsed
+
+
+@lru_cache(maxsize=None)
+def get_project_metadata():
+    """
+    Return the metadata of the project, read from `PYPROJECT_PATH` on the first call.
+
+    Returns:
+        dict: The `name`, `version`, `description`, `license` and `authors` (see
+        `parse_authors`) of the project.
+
+    """
+    poetry = read_pyproject(settings.PYPROJECT_PATH)
+
+    return {
+        'name': poetry.get('name', ''),
+        'version': poetry.get('version', ''),
+        'description': poetry.get('description', ''),
+        'license': poetry.get('license', ''),
+        'authors': parse_authors(poetry.get('authors', [])),
+    }
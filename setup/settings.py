@@ -11,37 +11,14 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
-from re import findall
 from pathlib import Path
-from configparser import ConfigParser
-from sys import argv
+from sys import argv, modules
+from tempfile import gettempdir
 from decouple import config
-from drf_yasg.openapi import Info, Contact, License
-
-# Determine the path to the pyproject.toml file one folder above the current location
-current_dir = os.path.dirname(__file__)
-relative_py_tol_path = os.path.join(current_dir, '..', 'pyproject.toml')
-pyproject_path = os.path.abspath(relative_py_tol_path)
-
-# Create a configparser instance and read the pyproject.toml file
-pyproject_config = ConfigParser()
-pyproject_config.read(pyproject_path)
-
-# Access values from the pyproject.toml file
-PROJECT_NAME = pyproject_config['tool.poetry']['name']
-PROJECT_VERSION = pyproject_config['tool.poetry']['version']
-PROJECT_DESCRIPTION = pyproject_config['tool.poetry']['description']
-PROJECT_AUTHORS = pyproject_config['tool.poetry']['authors']
-PROJECT_LICENSE = pyproject_config['tool.poetry']['license']
-
-# Extract authors' names and email addresses using regular expressions
-AUTHOR_PATTERN = r'(.*?) <(.*?)>'
-author_matches = findall(AUTHOR_PATTERN, PROJECT_AUTHORS)
-
-# Create a list of dictionaries with author names and emails
-author_info = [
-    {'name': name.strip(), 'email': email.strip()} for name, email in author_matches
-]
+
+# The pyproject.toml file one folder above, read on first use of the project metadata
+# (see setup.metadata) rather than on every import of the settings
+PYPROJECT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pyproject.toml'))
 
 # Login/logout URLs
 LOGIN_URL = '/api/login/'
@@ -51,8 +28,13 @@ LOGOUT_REDIRECT_URL = '/api/login/'
 # Use the database model user for authentication
 AUTH_USER_MODEL = 'auth.user'
 
-# Use the database for session storage (recommended for production)
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Store sessions in the database, read through an in-process LRU and Redis (see src.sessions).
+# The LRU is off by default: other workers keep accepting a session for up to
+# SESSION_L1_TIMEOUT seconds after it is logged out or its key is cycled
+SESSION_ENGINE = 'src.sessions'
+SESSION_CACHE_ALIAS = 'sessions'
+SESSION_L1_SIZE = config('SESSION_L1_SIZE', default=1000, cast=int)
+SESSION_L1_TIMEOUT = config('SESSION_L1_TIMEOUT', default=0, cast=float)
 
 # Use the default session serializer (JSON serializer is common)
 SESSION_SERIALIZER = 'django.contrib.sessions.serializers.JSONSerializer'
@@ -97,6 +79,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'src.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -110,6 +93,10 @@ MIDDLEWARE = [
 if DEBUG:
     MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
 
+# Resolved URL paths cached per process, and unresolved ones (kept apart, see src.resolvers)
+RESOLVER_CACHE_SIZE = config('RESOLVER_CACHE_SIZE', default=1024, cast=int)
+RESOLVER_NEGATIVE_CACHE_SIZE = config('RESOLVER_NEGATIVE_CACHE_SIZE', default=256, cast=int)
+
 # Allow access to the Debug Toolbar only from localhost
 INTERNAL_IPS = [
     '127.0.0.1',
@@ -136,35 +123,32 @@ STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
-#
-# NOTE: Replace with your API's terms of service URL
-first_author = author_info[0]
-
-api_info = Info(
-    title=PROJECT_NAME,
-    default_version=PROJECT_VERSION,
-    description=PROJECT_DESCRIPTION,
-    terms_of_service='',
-    contact=Contact(name=first_author['name'], email=first_author['email']),
-    license=License(name=PROJECT_LICENSE),
-    authors=author_info,
-)
-
-
+# The API info is built in `setup.swagger`: importing drf_yasg here would make DRF read
+# its settings before `REST_FRAMEWORK` is defined, silently ignoring them
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
         'Bearer': {'type': 'apiKey', 'name': 'Authorization', 'in': 'header'},
     },
     'USE_SESSION_AUTH': False,
     'JSON_EDITOR': True,
-    'DEFAULT_INFO': api_info,
+    'DEFAULT_INFO': 'setup.swagger.api_info',
+    'SPEC_URL': 'schema-json',
 }
 
+# The OpenAPI schema written by `manage.py build_openapi_schema` during the deploy, served from
+# memory with an ETag (see setup.swagger); generated once per process if missing, live in DEBUG
+OPENAPI_SCHEMA_FILE = config(
+    'OPENAPI_SCHEMA_FILE', default=os.path.join(STATIC_ROOT, 'openapi.json')
+)
+
 ROOT_URLCONF = 'setup.urls'
 
+# The Django template backend (still named 'django'), timing the renders for the Server-Timing
+# header (see src.timing)
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'src.timing.TimedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -211,10 +195,70 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
-# Use an in-memory database for tests to avoid modifying your development or production database
-if 'test' in argv:
+# Batches of tasks (see `src.batches`): Redis holding their results, number of tasks per
+# message, largest batch, lifetime (in seconds) of the results after the last one, and
+# seconds after which the missing results of a batch are reported lost
+TASK_BATCH_URL = config('TASK_BATCH_URL', default=CELERY_BROKER_URL)
+TASK_BATCH_CHUNK_SIZE = config('TASK_BATCH_CHUNK_SIZE', default=100, cast=int)
+TASK_BATCH_MAX_SIZE = config('TASK_BATCH_MAX_SIZE', default=10000, cast=int)
+TASK_BATCH_TTL = config('TASK_BATCH_TTL', default=3600, cast=int)
+TASK_BATCH_TIMEOUT = config('TASK_BATCH_TIMEOUT', default=600, cast=int)
+
+# Longest wait (in seconds) of a long poll or a server-sent event stream of the results,
+# holding a worker thread: serve them with threaded (gunicorn -k gthread) or ASGI workers,
+# and keep both well below the worker timeout (30 seconds by default)
+TASK_BATCH_POLL_TIMEOUT = config('TASK_BATCH_POLL_TIMEOUT', default=15, cast=int)
+TASK_BATCH_STREAM_DURATION = config('TASK_BATCH_STREAM_DURATION', default=20, cast=int)
+
+# Task metrics (see `src.metrics`): directory of the metrics files of the worker processes
+# (empty to keep them in memory only), and minimum number of seconds between two writes
+TASK_METRICS_DIR = config(
+    'TASK_METRICS_DIR', default=os.path.join(gettempdir(), 'tarzan-task-metrics')
+)
+TASK_METRICS_FLUSH_INTERVAL = config('TASK_METRICS_FLUSH_INTERVAL', default=5, cast=float)
+
+# Timings of the requests of each web worker (see src.metrics), written to a file of this
+# directory every REQUEST_METRICS_FLUSH_INTERVAL seconds, and merged by the /metrics endpoint;
+# empty to serve those of the answering process only
+REQUEST_METRICS_DIR = config(
+    'REQUEST_METRICS_DIR', default=os.path.join(gettempdir(), 'tarzan-request-metrics')
+)
+REQUEST_METRICS_FLUSH_INTERVAL = config('REQUEST_METRICS_FLUSH_INTERVAL', default=5, cast=float)
+
+# The bearer token required by the /metrics endpoint, empty to serve it to INTERNAL_IPS only
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Caches: API responses are cached in the Redis instance also running Celery's broker. The
+# backends time their calls for the Server-Timing header (see src.timing)
+CACHES = {
+    'default': {
+        'BACKEND': 'src.timing.TimedLocMemCache',
+    },
+    'api': {
+        'BACKEND': 'src.timing.TimedRedisCache',
+        'LOCATION': config('CACHE_URL', default='redis://redis:6379/1'),
+    },
+    'sessions': {
+        'BACKEND': 'src.timing.TimedRedisCache',
+        'LOCATION': config('SESSION_CACHE_URL', default='redis://redis:6379/2'),
+    },
+}
+
+# Redis holding the Bloom filter of taken usernames (see `src.usernames`), or empty to keep
+# it in the memory of the process (single process only); rebuild it after resizing it
+USERNAME_INDEX_URL = config('USERNAME_INDEX_URL', default='redis://redis:6379/3')
+USERNAME_BLOOM_BITS = config('USERNAME_BLOOM_BITS', default=1 << 24, cast=int)
+USERNAME_BLOOM_HASHES = config('USERNAME_BLOOM_HASHES', default=7, cast=int)
+
+# Cache alias and lifetime (in seconds) of the cached API responses
+API_CACHE_ALIAS = 'api'
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=300, cast=int)
+
+# Use an in-memory database for tests (manage.py test or pytest) to avoid modifying your
+# development or production database
+if 'test' in argv or 'pytest' in modules:
     DATABASES['default'] = {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
     }
 
@@ -225,11 +269,42 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly'
     ],
     'EXCEPTION_HANDLER': 'setup.exceptions.custom_exception_handler',
+    # Fast JSON (orjson) first, MessagePack for service-to-service consumers
+    'DEFAULT_RENDERER_CLASSES': [
+        'src.renderers.ORJSONRenderer',
+        'src.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'src.parsers.ORJSONParser',
+        'src.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Requests per client (user, or IP address) to the scoped routes, e.g. the username
+    # availability checks open to anyone
+    'DEFAULT_THROTTLE_RATES': {
+        'usernames': config('USERNAME_AVAILABILITY_RATE', default='60/min'),
+    },
 }
 
+# Serve post reads from values() rows, skipping the serializer fields (see src.fastpath)
+API_FAST_READ = config('API_FAST_READ', default=False, cast=bool)
+
+# Bulk API: rows written or deleted per query, and items accepted per request
+BULK_BATCH_SIZE = config('BULK_BATCH_SIZE', default=500, cast=int)
+BULK_MAX_ITEMS = config('BULK_MAX_ITEMS', default=10000, cast=int)
+
+# Streaming exports: rows fetched from the server-side cursor and sent at once
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
+# Sorted file of common/breached passwords (see `manage.py build_common_passwords`),
+# memory-mapped by every worker; Django's list of common passwords when empty
+COMMON_PASSWORDS_FILE = config('COMMON_PASSWORDS_FILE', default='')
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -238,13 +313,17 @@ AUTH_PASSWORD_VALIDATORS = [
         'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
     },
     {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+        'NAME': 'src.passwords.SharedCommonPasswordValidator',
     },
     {
         'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
     },
 ]
 
+# Stop validating a password at its first error (see `src.passwords.PasswordPipeline`),
+# rather than reporting every error at once
+PASSWORD_VALIDATION_FAIL_FAST = config('PASSWORD_VALIDATION_FAIL_FAST', default=False, cast=bool)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -272,13 +351,40 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Default logging
 # https://docs.djangoproject.com/en/4.2/ref/logging/
 
+# The log file is written by a background thread, from a queue of LOG_QUEUE_SIZE records
+# (see setup.logs), and reopened when moved, for an external rotation (e.g. logrotate); it is
+# only rotated by the process at LOG_MAX_BYTES, or at LOG_ROTATE_WHEN (e.g. 'midnight'), if
+# set, which is safe with a single process writing the file only
+LOG_FILE = config('LOG_FILE', default='general.log')
+LOG_MAX_BYTES = config('LOG_MAX_BYTES', default=0, cast=int)
+LOG_ROTATE_WHEN = config('LOG_ROTATE_WHEN', default='')
+LOG_BACKUP_COUNT = config('LOG_BACKUP_COUNT', default=5, cast=int)
+LOG_QUEUE_SIZE = config('LOG_QUEUE_SIZE', default=10000, cast=int)
+
+# The fraction of DEBUG records kept while the queue is more than half full
+LOG_DEBUG_SAMPLE_RATE = config('LOG_DEBUG_SAMPLE_RATE', default=0.1, cast=float)
+
+# The records per second (and at once) allowed per logger below ERROR, 0 for no cap
+LOG_RATE_LIMIT = config('LOG_RATE_LIMIT', default=100, cast=float)
+LOG_RATE_BURST = config('LOG_RATE_BURST', default=500, cast=float)
+
+# 'text', or 'json' for one JSON object per line
+LOG_FORMAT = config('LOG_FORMAT', default='text')
+
 LOGGING = {
     'version': 1,  # the dictConfig format version
     'disable_existing_loggers': False,  # retain the default loggers
     'handlers': {
         'file': {
-            'class': 'logging.FileHandler',
-            'filename': 'general.log',
+            '()': 'setup.logs.QueuedFileHandler',
+            'filename': LOG_FILE,
+            'max_bytes': LOG_MAX_BYTES,
+            'when': LOG_ROTATE_WHEN,
+            'backup_count': LOG_BACKUP_COUNT,
+            'queue_size': LOG_QUEUE_SIZE,
+            'debug_sample_rate': LOG_DEBUG_SAMPLE_RATE,
+            'filters': ['rate_limit'],
+            'formatter': 'json' if LOG_FORMAT == 'json' else 'verbose',
         },
         'mail_admins': {
             'level': 'ERROR',
@@ -301,10 +407,18 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'setup.logs.JsonFormatter',
+        },
     },
     'filters': {
         'require_debug_false': {
             '()': 'django.utils.log.RequireDebugFalse',
         },
+        'rate_limit': {
+            '()': 'setup.logs.RateLimitFilter',
+            'rate': LOG_RATE_LIMIT,
+            'burst': LOG_RATE_BURST,
+        },
     },
 }
@@ -4,9 +4,31 @@ This module sets up a Django Rest Framework (DRF) API documentation schema view
 It defines an OpenAPI schema view for the "Tarzan API" with version 'v1'. The schema includes
 information such as the API's title, description, contact information, and license details.
 
+drf_yasg (with its OpenAPI codecs and validators) is only imported on the first request to the
+documentation, and the project metadata only read then, so loading the URL configuration stays
+cheap for workers that never serve it.
+
+The schema itself is not generated per request: `manage.py build_openapi_schema` writes it to
+`OPENAPI_SCHEMA_FILE` during the deploy, and `openapi_schema` serves that file from memory, with
+a content-hash ETag and gzip. Without the file, the schema is generated once per process, on
+its first request. In DEBUG, it is generated on every request, so it follows the code.
+
+Classes:
+    SchemaDocument: The encoded schema, with its gzipped content and ETag.
+
+Functions:
+    get_api_info: Return the API information of the project's `pyproject.toml`.
+    get_schema_info: Return the API information of the schema views.
+    get_schema_view_class: Return the schema view class of the API, built once.
+    schema_view: Return a view serving the schema, built on its first request.
+    generate_schema: Generate the schema of the API, encoded as JSON.
+    get_schema_document: Return the schema served, read or generated once.
+    openapi_schema: Serve the schema, precomputed, with an ETag and gzip.
+
 Attributes:
-    schema_view (callable): A callable schema view configured with the specified API information.
-        This view is accessible to the public and allows any user to access API documentation.
+    api_info (openapi.Info): The API information of the project's `pyproject.toml`, the
+        `DEFAULT_INFO` of `SWAGGER_SETTINGS` (used by `manage.py generate_swagger`), built
+        on first access.
 
 Example Usage:
     To access the API documentation, navigate to the schema view URL in your web browser.
@@ -14,20 +36,219 @@ Example Usage:
     URL: http://your-api-url/swagger/
 """
 
-# Import necessary modules
+# pylint: disable=import-outside-toplevel
+import gzip
+import os
+import re
+from functools import lru_cache
+from hashlib import sha256
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_safe
 from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 
-# Create an OpenAPI schema view with the specified API information
-SchemaView = get_schema_view(
-    openapi.Info(
+from .metadata import get_project_metadata
+
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
+@lru_cache(maxsize=None)
+def get_api_info():
+    """
+    Return the API information of the project's `pyproject.toml`.
+
+    Returns:
+        openapi.Info: The title, version, description, contact, license and authors of the
+        project.
+
+    """
+    from drf_yasg import openapi
+
+    metadata = get_project_metadata()
+    authors = metadata['authors']
+
+    # NOTE: Replace with your API's terms of service URL
+    first_author = authors[0] if authors else {'name': '', 'email': ''}
+
+    return openapi.Info(
+        title=metadata['name'],
+        default_version=metadata['version'],
+        description=metadata['description'],
+        terms_of_service='',
+        contact=openapi.Contact(name=first_author['name'], email=first_author['email']),
+        license=openapi.License(name=metadata['license']),
+        authors=authors,
+    )
+
+
+def __getattr__(name):
+    if name == 'api_info':
+        return get_api_info()
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+@lru_cache(maxsize=None)
+def get_schema_info():
+    """
+    Return the API information of the schema views.
+
+    Returns:
+        openapi.Info: The title, version, description, contact and license of the API.
+
+    """
+    from drf_yasg import openapi
+
+    return openapi.Info(
         title='Tarzan API',
         default_version='v1',
         description='Django API boilerplate',
         contact=openapi.Contact(email='brunolnetto@gmail.com'),
         license=openapi.License(name='MIT License'),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_schema_view_class():
+    """
+    Return the schema view class of the API, built once.
+
+    Returns:
+        type: An OpenAPI schema view with the specified API information, accessible to any
+        user.
+
+    """
+    from drf_yasg.views import get_schema_view
+
+    return get_schema_view(
+        get_schema_info(),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+    )
+
+
+def schema_view(renderer=None, cache_timeout=0):
+    """
+    Return a view serving the schema, built on its first request.
+
+    Args:
+        renderer (str): The UI of the schema, e.g. 'swagger', or None for the raw schema.
+        cache_timeout (int): The number of seconds the schema is cached for.
+
+    Returns:
+        callable: The view.
+
+    """
+
+    @lru_cache(maxsize=None)
+    def get_view():
+        view_class = get_schema_view_class()
+        if renderer is None:
+            return view_class.without_ui(cache_timeout=cache_timeout)
+
+        return view_class.with_ui(renderer, cache_timeout=cache_timeout)
+
+    @csrf_exempt
+    def view(request, *args, **kwargs):
+        return get_view()(request, *args, **kwargs)
+
+    return view
+
+
+def generate_schema():
+    """
+    Generate the schema of the API, encoded as JSON.
+
+    The schema is generated without a request, as by `manage.py generate_swagger`: it has no
+    host, so the Swagger UI uses its own.
+
+    Returns:
+        bytes: The schema, in JSON.
+
+    """
+    from drf_yasg.codecs import OpenAPICodecJson
+
+    view_class = get_schema_view_class()
+    generator = view_class.generator_class(get_schema_info())
+    schema = generator.get_schema(request=None, public=view_class.public)
+
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+class SchemaDocument:
+    """
+    SchemaDocument Class
+
+    The encoded schema, with its gzipped content and ETag, computed once.
+
+    Attributes:
+        content (bytes): The schema, in JSON.
+        compressed (bytes): The schema, gzipped.
+        etag (str): The weak ETag of the schema, from the hash of its content (weak, as
+            it is shared by both encodings).
+
+    """
+
+    def __init__(self, content):
+        self.content = content
+        self.compressed = gzip.compress(content, mtime=0)
+        self.etag = f'W/"{sha256(content).hexdigest()[:32]}"'
+
+
+@lru_cache(maxsize=None)
+def get_schema_document():
+    """
+    Return the schema served: the `OPENAPI_SCHEMA_FILE` built during the deploy, or the
+    schema generated, once per process, without it.
+
+    Returns:
+        SchemaDocument: The schema.
+
+    """
+    path = settings.OPENAPI_SCHEMA_FILE
+    if path and os.path.exists(path):
+        with open(path, 'rb') as file:
+            return SchemaDocument(file.read())
+
+    return SchemaDocument(generate_schema())
+
+
+_live_schema = schema_view(cache_timeout=0)
+
+
+@csrf_exempt
+@require_safe
+def openapi_schema(request):
+    """
+    Serve the schema in JSON, from memory, with an ETag (answering a matching
+    `If-None-Match` with a 304) and gzipped for the clients accepting it.
+
+    In DEBUG, the schema is generated on every request instead.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        HttpResponse: The schema, or a 304 response.
+
+    """
+    if settings.DEBUG:
+        return _live_schema(request, format='json')
+
+    document = get_schema_document()
+    response = get_conditional_response(request, etag=document.etag)
+    if response is None:
+        if ACCEPTS_GZIP.search(request.headers.get('Accept-Encoding', '')):
+            response = HttpResponse(document.compressed, content_type='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(document.content, content_type='application/json')
+
+    response.headers['ETag'] = document.etag
+    response.headers['Cache-Control'] = 'public, no-cache'
+    patch_vary_headers(response, ('Accept-Encoding',))
+
+    return response
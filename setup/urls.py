@@ -18,10 +18,11 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
 
-from .swagger import SchemaView
+from src.views import metrics
 
-swagger_with_ui = SchemaView.with_ui('swagger', cache_timeout=0)
-swagger_without_ui = SchemaView.without_ui(cache_timeout=0)
+from .swagger import openapi_schema, schema_view
+
+swagger_with_ui = schema_view('swagger', cache_timeout=0)
 favicon_redirect = RedirectView.as_view(url='/static/images/favicon.ico')
 wild_redirect = RedirectView.as_view(url='/api/', permanent=False)
 
@@ -29,5 +30,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('src.urls')),
     path('swagger/', swagger_with_ui, name='schema-swagger-ui'),
+    path('swagger/openapi.json', openapi_schema, name='schema-json'),
     path('favicon.ico', favicon_redirect),
+    path('metrics', metrics, name='metrics'),
 ]
@@ -0,0 +1,4 @@
+# Load the Celery app of the project with Django, so that tasks are sent to its broker
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
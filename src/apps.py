@@ -9,6 +9,8 @@ Attributes:
     name (str): The name of the app. In this configuration, the name is set to 'src',
         indicating that this AppConfig class is associated with the 'src' Django app.
 
+    ready (method): Connects the signal receivers of the app (see `src.signals`).
+
 Description:
     This AppConfig class allows customization of app-specific settings. In this case,
     it specifies the default primary key field type and associates it with the 'src' app.
@@ -44,7 +46,15 @@ class MyappConfig(AppConfig):
         default_auto_field (str): The default primary key field type.
         name (str): The name of the app ('src').
 
+    Methods:
+        ready(self): Connects the signal receivers of the app.
+
     """
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'src'
+
+    def ready(self):
+        # Import the signal receivers so that they get connected
+        # pylint: disable=import-outside-toplevel,unused-import
+        from . import signals  # noqa: F401
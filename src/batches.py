@@ -0,0 +1,291 @@
+"""
+Module: batches.py
+
+This module runs batches of Celery tasks submitted at once, and delivers their results
+as they finish.
+
+A batch of argument sets is split into chunks of `TASK_BATCH_CHUNK_SIZE`, each run by
+one `run_batch_chunk` task (see `src.tasks`), and the chunks are sent as one Celery
+`group`: a single submission, and one message per chunk rather than per task.
+
+Each finished task appends its result to a Redis stream of the batch. Clients read the
+stream with a blocking `XREAD`: Redis pushes the results to them as they are added, so
+nothing polls `AsyncResult` in a loop. Unlike a pub/sub channel, a stream keeps the
+results, so a client connecting late or reconnecting (with the last id it received)
+misses none of them. The keys of a batch expire `TASK_BATCH_TTL` seconds after its
+last result.
+
+A chunk failing (e.g. its results cannot all be published) publishes an error for each
+of its remaining tasks. A chunk lost with its worker publishes nothing: a batch without
+every result `TASK_BATCH_TIMEOUT` seconds after its submission is reported done, with
+its missing results counted as `lost`, so clients never wait for its keys to expire.
+
+The long polls and streams hold a web worker thread while they wait, and are bounded by
+`TASK_BATCH_POLL_TIMEOUT` and `TASK_BATCH_STREAM_DURATION`: they must be served by
+threaded workers (e.g. `gunicorn -k gthread`, as in `scripts/django-deploy.sh`), or by
+ASGI ones, and those limits kept below the worker timeout.
+
+Functions:
+    - get_client: Return the Redis client of the batches.
+    - build_batch: Build the group of chunk tasks running a batch.
+    - submit_batch: Submit a batch of argument sets, and return its id.
+    - publish_result: Append the result of a task to the stream of its batch.
+    - publish_errors: Append the same error for several tasks of a batch.
+    - batch_exists: Return whether a batch exists.
+    - read_results: Read the results of a batch after a cursor, waiting for new ones.
+    - format_event: Format a result as a server-sent event.
+    - stream_events: Stream the results of a batch as server-sent events.
+
+"""
+
+from functools import lru_cache
+from time import monotonic, time
+from uuid import uuid4
+
+import orjson
+import redis
+from celery import group
+from django.conf import settings
+
+
+@lru_cache(maxsize=None)
+def get_client():
+    """
+    Return the Redis client of the batches, connected on first use.
+
+    Returns:
+        Redis: The client of `TASK_BATCH_URL`.
+
+    """
+    return redis.Redis.from_url(settings.TASK_BATCH_URL)
+
+
+def _stream_key(batch_id):
+    return f'batches:{batch_id}:results'
+
+
+def _meta_key(batch_id):
+    return f'batches:{batch_id}:meta'
+
+
+def build_batch(batch_id, task_name, arg_sets, chunk_size):
+    """
+    Build the group of chunk tasks running a batch.
+
+    Args:
+        batch_id (str): The id of the batch.
+        task_name (str): The name of the task run on each argument set.
+        arg_sets (list): The positional arguments of each task.
+        chunk_size (int): The number of tasks run per chunk.
+
+    Returns:
+        group: One `run_batch_chunk` signature per chunk.
+
+    """
+    # pylint: disable=import-outside-toplevel
+    from .tasks import run_batch_chunk
+
+    return group(
+        run_batch_chunk.s(batch_id, task_name, offset, arg_sets[offset:offset + chunk_size])
+        for offset in range(0, len(arg_sets), chunk_size)
+    )
+
+
+def submit_batch(task_name, arg_sets):
+    """
+    Submit a batch of argument sets, and return its id.
+
+    Args:
+        task_name (str): The name of the task run on each argument set.
+        arg_sets (list): The positional arguments of each task.
+
+    Returns:
+        str: The id of the batch.
+
+    """
+    batch_id = uuid4().hex
+    meta = {'total': len(arg_sets), 'deadline': time() + settings.TASK_BATCH_TIMEOUT}
+
+    pipeline = get_client().pipeline(transaction=False)
+    pipeline.hset(_meta_key(batch_id), mapping=meta)
+    pipeline.expire(_meta_key(batch_id), settings.TASK_BATCH_TTL)
+    pipeline.execute()
+
+    build_batch(batch_id, task_name, arg_sets, settings.TASK_BATCH_CHUNK_SIZE).apply_async()
+
+    return batch_id
+
+
+def _publish(batch_id, payloads):
+    client = get_client()
+    pipeline = client.pipeline(transaction=False)
+    for payload in payloads:
+        pipeline.xadd(_stream_key(batch_id), {'data': orjson.dumps(payload)})
+    pipeline.expire(_stream_key(batch_id), settings.TASK_BATCH_TTL)
+    pipeline.expire(_meta_key(batch_id), settings.TASK_BATCH_TTL)
+    pipeline.execute()
+
+
+def publish_result(batch_id, index, result=None, error=None):
+    """
+    Append the result (or error) of a task to the stream of its batch.
+
+    Args:
+        batch_id (str): The id of the batch.
+        index (int): The position of the task in the batch.
+        result: The JSON-serializable result of the task.
+        error (str): The error raised by the task, if it failed.
+
+    """
+    if error is None:
+        payload = {'index': index, 'result': result}
+    else:
+        payload = {'index': index, 'error': error}
+
+    _publish(batch_id, [payload])
+
+
+def publish_errors(batch_id, indexes, error):
+    """
+    Append the same error for several tasks of a batch, e.g. those of a failed chunk.
+
+    Args:
+        batch_id (str): The id of the batch.
+        indexes (iterable): The positions of the tasks in the batch.
+        error (str): The error.
+
+    """
+    _publish(batch_id, [{'index': index, 'error': error} for index in indexes])
+
+
+def batch_exists(batch_id):
+    """
+    Return whether a batch exists.
+
+    Args:
+        batch_id (str): The id of the batch.
+
+    Returns:
+        bool: True if the batch was submitted, and did not expire.
+
+    """
+    return bool(get_client().exists(_meta_key(batch_id)))
+
+
+def read_results(batch_id, cursor='0', timeout=0, count=1000):
+    """
+    Read the results of a batch after a cursor, waiting up to `timeout` seconds for new
+    ones when there are none yet.
+
+    Args:
+        batch_id (str): The id of the batch.
+        cursor (str): The id of the last result already read, '0' for none.
+        timeout (float): The number of seconds to wait for a new result, 0 to return at once.
+        count (int): The maximum number of results read.
+
+    Returns:
+        dict or None: The `total` number of tasks, the number `completed`, the
+        `results` read as `(id, payload)` pairs, the `cursor` to read from next, whether
+        the batch is `done` (every result read, or its deadline passed), and the number
+        of results `lost` (missing at the deadline); or None if the batch does not exist
+        (or expired).
+
+    """
+    client = get_client()
+    pipeline = client.pipeline(transaction=False)
+    pipeline.hmget(_meta_key(batch_id), 'total', 'deadline')
+    pipeline.xlen(_stream_key(batch_id))
+    (total, deadline), completed = pipeline.execute()
+    if total is None:
+        return None
+
+    # Counted before reading, so that a complete batch is never reported done early
+    total = int(total)
+    remaining = float(deadline) - time()
+    finished = completed >= total or remaining <= 0
+
+    block = None if finished else int(min(timeout, remaining) * 1000) or None
+    response = client.xread({_stream_key(batch_id): cursor}, count=count, block=block)
+
+    results = []
+    for _stream, entries in response or ():
+        for entry_id, fields in entries:
+            results.append((entry_id.decode(), orjson.loads(fields[b'data'])))
+
+    if results:
+        cursor = results[-1][0]
+
+    done = finished and len(results) < count
+    return {
+        'total': total,
+        'completed': completed,
+        'results': results,
+        'cursor': cursor,
+        'done': done,
+        'lost': max(total - completed, 0) if done else 0,
+    }
+
+
+def format_event(event, data, event_id=None):
+    """
+    Format a server-sent event.
+
+    Args:
+        event (str): The type of the event.
+        data: The JSON-serializable data of the event.
+        event_id (str): The id of the event, sent back by the client as `Last-Event-ID`
+            when it reconnects.
+
+    Returns:
+        bytes: The event, terminated by a blank line.
+
+    """
+    lines = [] if event_id is None else [f'id: {event_id}']
+    lines += [f'event: {event}', f'data: {orjson.dumps(data).decode()}', '', '']
+
+    return '\n'.join(lines).encode()
+
+
+def stream_events(batch_id, cursor, duration, heartbeat=15):
+    """
+    Stream the results of a batch as server-sent events, as they finish.
+
+    One `result` event is sent per result, with the stream id as event id, then a
+    `done` event once every task finished (or the batch reached its deadline, with the
+    number of results `lost`). The stream ends after `duration` seconds,
+    and the client reconnects from its `Last-Event-ID`; a comment is sent at least every
+    `heartbeat` seconds, so that proxies keep the connection open.
+
+    Args:
+        batch_id (str): The id of the batch.
+        cursor (str): The id of the last result already received, '0' for none.
+        duration (float): The number of seconds to stream for.
+        heartbeat (float): The longest wait for a result, in seconds.
+
+    Yields:
+        bytes: The events.
+
+    """
+    deadline = monotonic() + duration
+
+    while True:
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            return
+
+        batch = read_results(batch_id, cursor, timeout=min(heartbeat, remaining))
+        if batch is None:
+            yield format_event('error', {'detail': 'The batch expired.'})
+            return
+
+        for event_id, payload in batch['results']:
+            yield format_event('result', payload, event_id)
+
+        if batch['done']:
+            yield format_event('done', {'total': batch['total'], 'lost': batch['lost']})
+            return
+
+        if not batch['results']:
+            yield b': keep-alive\n\n'
+
+        cursor = batch['cursor']
@@ -0,0 +1,67 @@
+"""
+Module: bulk.py
+
+This module provides helpers for writing and deleting many rows at once in bounded
+batches, so that no single statement or transaction grows with the input size.
+
+Functions:
+    - batched: Split an iterable into lists of a bounded size.
+    - delete_in_batches: Delete the rows of a queryset in short, separate transactions.
+
+"""
+
+from itertools import islice
+
+from django.db import transaction
+
+
+def batched(iterable, size):
+    """
+    Split an iterable into lists of a bounded size.
+
+    Args:
+        iterable (iterable): The items to split.
+        size (int): The maximum number of items per batch.
+
+    Yields:
+        list: The next batch of at most `size` items.
+
+    """
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+def delete_in_batches(queryset, batch_size):
+    """
+    Delete the rows of a queryset in short, separate transactions.
+
+    Each batch selects at most `batch_size` primary keys and deletes them in its own
+    transaction, so locks are only ever held on one batch of rows at a time.
+
+    Args:
+        queryset (QuerySet): The rows to delete.
+        batch_size (int): The maximum number of rows deleted per transaction.
+
+    Returns:
+        int: The number of rows of the queryset's model deleted.
+
+    """
+    model = queryset.model
+    label = model._meta.label
+    primary_keys = queryset.order_by().values_list('pk', flat=True)
+    deleted = 0
+
+    while True:
+        with transaction.atomic(using=queryset.db):
+            batch = list(primary_keys[:batch_size])
+            if not batch:
+                break
+
+            _, counts = model._base_manager.using(queryset.db).filter(pk__in=batch).delete()
+            deleted += counts.get(label, 0)
+
+    return deleted
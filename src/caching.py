@@ -0,0 +1,456 @@
+"""
+Module: caching.py
+
+This module defines viewset mixins answering repeated reads of the API cheaply.
+
+Classes:
+    - ConditionalGetMixin: Answers `If-None-Match`/`If-Modified-Since` with 304 responses,
+        from validators computed without running the serializer.
+    - ResponseCache: A versioned cache of rendered responses, with hit/miss counters.
+    - CachedResponseMixin: Serves the list and detail routes from a `ResponseCache`.
+
+Attributes:
+    post_cache (ResponseCache): The response cache of the post routes, invalidated by the
+        signals of the Post model (see `src.signals`).
+
+"""
+
+import logging
+from functools import partial
+from hashlib import sha1
+from threading import Lock, local
+from time import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+logger = logging.getLogger(__name__)
+
+UNCACHED_HEADERS = ('Content-Type', 'Set-Cookie', 'X-Cache')
+
+
+def _digest(*parts):
+    """
+    Hash the parts of a validator into an ETag.
+
+    Args:
+        parts: The values the validator depends on.
+
+    Returns:
+        str: The quoted ETag.
+
+    """
+    return quote_etag(sha1('|'.join(map(str, parts)).encode('utf-8')).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    ConditionalGetMixin Class
+
+    Viewset mixin answering conditional GETs of the list and detail routes with 304
+    responses, without running the serializer.
+
+    The validators of the list are the latest `last_modified_field` of the (filtered)
+    queryset, read by one aggregate query on the indexed field, and the version of the
+    viewset's `response_cache`, if any, which every write bumps. The validators of the
+    detail are the `last_modified_field` of the row. ETags also depend on the full path
+    and the `Accept` header, since they select the page and the representation.
+
+    Note that deleting rows does not move the latest modification date back, so only
+    the ETag of the list (through the version of the response cache) reflects
+    deletions; clients should prefer `If-None-Match` over `If-Modified-Since`.
+
+    Attributes:
+        last_modified_field (str): The indexed field holding the date of the last write.
+
+    """
+
+    last_modified_field = 'updated_at'
+
+    def get_conditional_response(self, request, etag, last_modified):
+        """
+        Return a 304 response if the client's copy is still valid.
+
+        Args:
+            request (Request): The incoming request.
+            etag (str): The current ETag of the resource.
+            last_modified (datetime or None): The current modification date.
+
+        Returns:
+            HttpResponse or None: The 304 response, or None if the resource is needed.
+
+        """
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+    def set_validators(self, response, etag, last_modified):
+        """
+        Set the ETag and Last-Modified headers of a successful response.
+
+        Args:
+            response (Response): The response of the view.
+            etag (str): The current ETag of the resource.
+            last_modified (datetime or None): The current modification date.
+
+        Returns:
+            Response: The response, with its validators.
+
+        """
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+
+        return response
+
+    def get_list_version(self):
+        """
+        Return the version of the viewset's response cache, which every write bumps.
+
+        Returns:
+            int or str: The version, or '' without a response cache or when it is
+            unavailable.
+
+        """
+        response_cache = getattr(self, 'response_cache', None)
+        if response_cache is None:
+            return ''
+
+        try:
+            return response_cache.get_version()
+        # pylint: disable=W0718
+        except Exception:
+            logger.warning('Response cache %s unavailable', response_cache.namespace, exc_info=True)
+            return ''
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        last_modified = queryset.aggregate(
+            last_modified=Max(self.last_modified_field)
+        )['last_modified']
+
+        etag = _digest(
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+            last_modified.isoformat() if last_modified else '',
+            self.get_list_version(),
+        )
+
+        response = self.get_conditional_response(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+
+        try:
+            rows = self.get_queryset().filter(**lookup)
+            last_modified = rows.values_list(self.last_modified_field, flat=True)[:1]
+            last_modified = next(iter(last_modified), None)
+        except (TypeError, ValueError, ValidationError):
+            last_modified = None
+
+        if last_modified is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = _digest(
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+            last_modified.isoformat(),
+        )
+
+        response = self.get_conditional_response(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        response = super().retrieve(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+
+class ResponseCache:
+    """
+    ResponseCache Class
+
+    A cache of rendered responses, keyed by path, query string and accepted media type,
+    stored under a version number shared by every worker.
+
+    Writes invalidate every entry at once by bumping the version, once the transaction
+    commits: a request reading the new version is guaranteed to read the new rows, and
+    entries stored under an old version are never read again and simply expire. When
+    the version is lost (e.g. evicted), it restarts from the current time in
+    milliseconds, so that it never matches an old version again.
+
+    Cache errors are logged and treated as misses, so the API keeps working when the
+    cache is down.
+
+    Attributes:
+        namespace (str): The prefix of the keys of this cache.
+        hits (int): The number of responses served from the cache by this process.
+        misses (int): The number of responses rendered because of a cache miss.
+
+    """
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._pending = local()
+
+    @property
+    def cache(self):
+        """
+        Return the cache backend storing the responses.
+
+        Returns:
+            BaseCache: The `settings.API_CACHE_ALIAS` cache.
+
+        """
+        return caches[settings.API_CACHE_ALIAS]
+
+    @property
+    def version_key(self):
+        """
+        Return the key of the version number.
+
+        Returns:
+            str: The key of the version number.
+
+        """
+        return f'{self.namespace}:version'
+
+    def get_version(self):
+        """
+        Return the current version number, initializing it if needed.
+
+        Returns:
+            int: The current version number.
+
+        """
+        version = self.cache.get(self.version_key)
+        if version is None:
+            self.cache.add(self.version_key, int(time() * 1000), timeout=None)
+            version = self.cache.get(self.version_key)
+
+        return version
+
+    def bump(self):
+        """
+        Bump the version number, invalidating every cached response.
+        """
+        try:
+            self.cache.incr(self.version_key)
+        except ValueError:
+            self.cache.set(self.version_key, int(time() * 1000), timeout=None)
+
+    def invalidate_on_commit(self, using=None):
+        """
+        Bump the version number once the current transaction commits.
+
+        Within a transaction, the version is bumped once, however many rows are written:
+        the callbacks scheduled share a flag of the connection, set by the first one run
+        (a callback dropped with a rolled back savepoint or transaction never sets it).
+
+        Args:
+            using (str): The alias of the database written to.
+
+        """
+        using = using or DEFAULT_DB_ALIAS
+        pending = self._pending.__dict__
+        flag = pending.setdefault(using, {'bumped': False})
+
+        transaction.on_commit(partial(self._bump_once, using, flag), using=using, robust=True)
+
+    def _bump_once(self, using, flag):
+        pending = self._pending.__dict__
+        if pending.get(using) is flag:
+            del pending[using]
+
+        if not flag['bumped']:
+            flag['bumped'] = True
+            self.bump()
+
+    def make_key(self, request, version):
+        """
+        Return the key of the response to a request.
+
+        Args:
+            request (Request): The incoming request.
+            version (int): The current version number.
+
+        Returns:
+            str: The key of the response.
+
+        """
+        digest = sha1(
+            '|'.join([
+                request.method,
+                request.get_full_path(),
+                request.accepted_media_type,
+                request.META.get('HTTP_ACCEPT_LANGUAGE', ''),
+            ]).encode('utf-8')
+        ).hexdigest()
+
+        return f'{self.namespace}:{version}:{digest}'
+
+    def count(self, hit):
+        """
+        Count a cache hit or miss.
+
+        Args:
+            hit (bool): Whether the response was served from the cache.
+
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """
+        Return the hit/miss counters of this process.
+
+        Returns:
+            dict: The number of hits and misses, and the hit ratio.
+
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+            }
+
+    def get(self, request):
+        """
+        Return the cached response to a request.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            tuple: The cached response or None, and the key to store the response under
+            (None when the cache is unavailable).
+
+        """
+        try:
+            key = self.make_key(request, self.get_version())
+            cached = self.cache.get(key)
+        # pylint: disable=W0718
+        except Exception:
+            logger.warning('Response cache %s unavailable', self.namespace, exc_info=True)
+            return None, None
+
+        self.count(cached is not None)
+        if cached is None:
+            return None, key
+
+        content, content_type, headers = cached
+        response = HttpResponse(content, content_type=content_type)
+        for name, value in headers.items():
+            response[name] = value
+        response['X-Cache'] = 'HIT'
+
+        return response, key
+
+    def set(self, key, response):
+        """
+        Store a rendered response, if it is a success.
+
+        Args:
+            key (str): The key returned by `get`.
+            response (HttpResponse): The rendered response.
+
+        """
+        if response.status_code != 200:
+            return
+
+        headers = {
+            name: value for name, value in response.items() if name not in UNCACHED_HEADERS
+        }
+        cached = (response.content, response['Content-Type'], headers)
+
+        try:
+            self.cache.set(key, cached, timeout=settings.API_CACHE_TIMEOUT)
+        # pylint: disable=W0718
+        except Exception:
+            logger.warning('Response cache %s unavailable', self.namespace, exc_info=True)
+
+
+post_cache = ResponseCache('posts')
+
+
+class CachedResponseMixin:
+    """
+    CachedResponseMixin Class
+
+    Viewset mixin serving the list and detail routes from a `ResponseCache`, and storing
+    their rendered responses on misses, with their headers. Responses rendered for the
+    browsable API are never cached, since they depend on the user.
+
+    It goes before `ConditionalGetMixin` in the bases of a viewset: a hit is served
+    without any query, and a conditional GET is answered from the ETag and Last-Modified
+    stored with the response, which are current as long as its version is.
+
+    Attributes:
+        response_cache (ResponseCache): The cache of the viewset's responses.
+
+    """
+
+    response_cache = None
+
+    def get_cached_response(self, request, render):
+        """
+        Serve a response from the cache, or render it and store it.
+
+        Args:
+            request (Request): The incoming request.
+            render (callable): Returns the response on a cache miss.
+
+        Returns:
+            Response: The cached or rendered response.
+
+        """
+        if self.response_cache is None or request.accepted_renderer.format == 'api':
+            return render()
+
+        cached, key = self.response_cache.get(request)
+        if cached is not None:
+            return get_conditional_response(
+                request,
+                etag=cached.get('ETag'),
+                last_modified=parse_http_date_safe(cached.get('Last-Modified')),
+                response=cached,
+            )
+
+        response = render()
+        if key is not None and response.status_code == 200:
+            response['X-Cache'] = 'MISS'
+            response.add_post_render_callback(
+                lambda rendered: self.response_cache.set(key, rendered)
+            )
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            request, lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            request,
+            lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs),
+        )
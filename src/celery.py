@@ -19,12 +19,17 @@ The following functions and settings are defined in this module:
 - `app.autodiscover_tasks()`: Discovers and auto-imports task modules from
     all installed Django apps.
 
+- `from . import metrics`: Connects the receivers recording the latency and outcome of
+    tasks (see `src.metrics`).
+
 Make sure to import and execute this module to configure Celery for your Django project.
 """
 
 import os
 from celery import Celery
 
+from . import metrics  # noqa: F401  pylint: disable=unused-import
+
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
 
@@ -0,0 +1,204 @@
+"""
+Module: export.py
+
+This module streams the export of posts as NDJSON or CSV.
+
+Rows are read through a server-side cursor (`QuerySet.iterator(chunk_size=...)`), encoded
+and sent to the client chunk by chunk, so the memory of a worker stays flat whatever the
+size of the table. On PostgreSQL, the rows are read in a REPEATABLE READ, READ ONLY
+transaction, so a long export sees a consistent snapshot of the table.
+
+Classes:
+    - Echo: A file-like object handing back what is written to it.
+    - IgnoreClientContentNegotiation: Content negotiation leaving the format to the view.
+
+Functions:
+    - iter_snapshot: Iterate over a queryset within a consistent snapshot.
+    - encode_ndjson: Encode rows as NDJSON lines, with orjson.
+    - encode_csv: Encode rows as CSV lines, after a header line.
+    - stream_export: Stream the encoded rows of a queryset, chunk by chunk.
+
+"""
+
+from csv import writer
+
+import orjson
+from django.db import connections, transaction
+from rest_framework.fields import DateTimeField
+from rest_framework.negotiation import BaseContentNegotiation
+
+from .bulk import batched
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class Echo:
+    """
+    Echo Class
+
+    A file-like object handing back what is written to it, so that `csv.writer` can
+    encode rows one at a time without buffering them.
+    """
+
+    def write(self, value):
+        """
+        Hand back the written value.
+
+        Args:
+            value (str): The value written.
+
+        Returns:
+            str: The same value.
+
+        """
+        return value
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """
+    IgnoreClientContentNegotiation Class
+
+    Content negotiation that never rejects a request, for views choosing and encoding
+    their output format themselves (e.g. `Accept: text/csv` on an export).
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
+
+
+def iter_snapshot(queryset, chunk_size):
+    """
+    Iterate over a queryset within a consistent snapshot.
+
+    Args:
+        queryset (QuerySet): The rows to read.
+        chunk_size (int): The number of rows fetched from the server-side cursor at once.
+
+    Yields:
+        The rows of the queryset.
+
+    """
+    connection = connections[queryset.db]
+    isolate = connection.vendor == 'postgresql' and not connection.in_atomic_block
+
+    with transaction.atomic(using=queryset.db):
+        if isolate:
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+
+        yield from queryset.iterator(chunk_size=chunk_size)
+
+
+def _converters(fields, datetime_fields):
+    """
+    Return the functions turning the values of each field into primitives.
+
+    Args:
+        fields (tuple): The names of the exported fields.
+        datetime_fields (tuple): The names of the exported datetime fields.
+
+    Returns:
+        list: A converter per field, or None for values exported as is.
+
+    """
+    datetime_field = DateTimeField()
+    return [
+        datetime_field.to_representation if name in datetime_fields else None
+        for name in fields
+    ]
+
+
+def _convert(row, converters):
+    """
+    Turn the values of a row into primitives.
+
+    Args:
+        row (tuple): The values of a row.
+        converters (list): A converter per value, or None.
+
+    Returns:
+        list: The converted values.
+
+    """
+    return [
+        value if convert is None or value is None else convert(value)
+        for value, convert in zip(row, converters)
+    ]
+
+
+def encode_ndjson(rows, fields, datetime_fields=()):
+    """
+    Encode rows as NDJSON lines.
+
+    Args:
+        rows (iterable): Tuples of values, in the order of `fields`.
+        fields (tuple): The names of the exported fields.
+        datetime_fields (tuple): The names of the fields holding datetimes.
+
+    Yields:
+        bytes: One UTF-8 encoded JSON object per row, with a trailing newline.
+
+    """
+    converters = _converters(fields, datetime_fields)
+    option = orjson.OPT_APPEND_NEWLINE
+
+    for row in rows:
+        values = _convert(row, converters)
+        yield orjson.dumps(dict(zip(fields, values)), option=option)
+
+
+def encode_csv(rows, fields, datetime_fields=()):
+    """
+    Encode rows as CSV lines, after a header line.
+
+    Args:
+        rows (iterable): Tuples of values, in the order of `fields`.
+        fields (tuple): The names of the exported fields.
+        datetime_fields (tuple): The names of the fields holding datetimes.
+
+    Yields:
+        str: The header line, then one line per row.
+
+    """
+    converters = _converters(fields, datetime_fields)
+    csv_writer = writer(Echo())
+
+    yield csv_writer.writerow(fields)
+
+    for row in rows:
+        yield csv_writer.writerow(_convert(row, converters))
+
+
+def stream_export(queryset, fields, export_format, chunk_size, datetime_fields=()):
+    """
+    Stream the encoded rows of a queryset, chunk by chunk.
+
+    Args:
+        queryset (QuerySet): The rows to export.
+        fields (tuple): The names of the exported fields.
+        export_format (str): One of the keys of `EXPORT_FORMATS`.
+        chunk_size (int): The number of rows read and sent at once.
+        datetime_fields (tuple): The names of the fields holding datetimes.
+
+    Yields:
+        str or bytes: The encoded lines of up to `chunk_size` rows at a time.
+
+    """
+    if export_format == 'csv':
+        encode, empty = encode_csv, ''
+    else:
+        encode, empty = encode_ndjson, b''
+
+    rows = iter_snapshot(queryset.values_list(*fields), chunk_size)
+
+    try:
+        for lines in batched(encode(rows, fields, datetime_fields), chunk_size):
+            yield empty.join(lines)
+    finally:
+        rows.close()
@@ -0,0 +1,255 @@
+"""
+Module: fastpath.py
+
+This module implements a fast read path for model serializers, building the same
+representation as `Serializer.data` straight from `QuerySet.values()` rows.
+
+DRF serializes a row by instantiating a model, then looking up every field's attribute
+and calling its `to_representation`. For plain model columns, most of that work is
+identical from one row to the next: the fast path resolves, once per request, the
+column behind each field and the function converting its values (none for strings,
+integers, booleans and floats, which are already primitives, and a conversion of
+datetimes with their format and time zone resolved up front), and then builds each
+row's dict with a single loop over these pairs.
+
+Functions:
+    - datetime_converter: Return a fast converter of the values of a `DateTimeField`.
+    - ordering_columns: Return the columns a queryset is explicitly ordered by.
+
+Classes:
+    - ValuesSerializer: Builds the representation of `values()` rows of a serializer.
+    - FastReadMixin: Serves the list and detail routes through a `ValuesSerializer`.
+
+"""
+
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.http import Http404
+from django.utils import timezone
+from rest_framework import ISO_8601, fields
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Fields whose representation of a database value is the value itself
+PRIMITIVE_FIELDS = (
+    fields.BooleanField,
+    fields.CharField,
+    fields.FloatField,
+    fields.IntegerField,
+)
+
+
+def datetime_converter(field):
+    """
+    Return a function giving the representation of a `DateTimeField` for aware values.
+
+    The output format and time zone of the field are resolved once, instead of on every
+    value as `DateTimeField.to_representation` does. Values it does not handle (naive
+    datetimes, strings, other formats) are passed to the field.
+
+    Args:
+        field (DateTimeField): The serializer field.
+
+    Returns:
+        callable: The converter of the field's values.
+
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not isinstance(value, datetime) or timezone.is_naive(value):
+            return field.to_representation(value)
+
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    return convert
+
+
+def ordering_columns(queryset):
+    """
+    Return the columns a queryset is explicitly ordered by.
+
+    Args:
+        queryset (QuerySet): The ordered queryset.
+
+    Returns:
+        list: The names of the ordering columns or annotations, without direction.
+
+    """
+    return [field.lstrip('-') for field in queryset.query.order_by if isinstance(field, str)]
+
+
+class ValuesSerializer:
+    """
+    ValuesSerializer Class
+
+    Builds the representation of `values()` rows with the fields of a serializer
+    instance, giving the same output as the serializer for the fields it supports:
+    fields reading a model column directly (no dotted source, no method field).
+
+    Attributes:
+        serializer (Serializer): The serializer whose (possibly trimmed) fields are used.
+        names (list): The names of the fields, in output order.
+        sources (list): The column read for each field.
+        converters (list): The converter of each field, or None for primitive values.
+
+    """
+
+    def __init__(self, serializer):
+        self.serializer = serializer
+        self.names = []
+        self.sources = []
+        self.converters = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if field.source == '*' or '.' in field.source:
+                raise ImproperlyConfigured(
+                    f'Field {name!r} does not read a model column and cannot be '
+                    'serialized from values() rows.'
+                )
+
+            self.names.append(name)
+            self.sources.append(field.source)
+            # Exact types only: subclasses may override to_representation
+            if type(field) in PRIMITIVE_FIELDS:
+                self.converters.append(None)
+            elif type(field) is fields.DateTimeField:
+                self.converters.append(datetime_converter(field))
+            else:
+                self.converters.append(field.to_representation)
+
+    def values(self, queryset, *extra):
+        """
+        Return the `values()` rows needed to represent the rows of a queryset.
+
+        Args:
+            queryset (QuerySet): The rows to represent.
+            extra (str): Other columns or annotations to read, e.g. the ordering fields
+                needed by a paginator.
+
+        Returns:
+            QuerySet: The rows, as dicts of the needed columns.
+
+        """
+        return queryset.values(*dict.fromkeys([*self.sources, *extra]))
+
+    def to_representation(self, row):
+        """
+        Build the representation of one row.
+
+        Args:
+            row (dict): A `values()` row.
+
+        Returns:
+            dict: The same representation as the serializer's.
+
+        """
+        data = {}
+        for name, source, convert in zip(self.names, self.sources, self.converters):
+            value = row[source]
+            data[name] = value if convert is None or value is None else convert(value)
+
+        return data
+
+    def many(self, rows):
+        """
+        Build the representation of many rows.
+
+        Args:
+            rows (iterable): `values()` rows.
+
+        Returns:
+            list: The representation of every row.
+
+        """
+        if any(self.converters):
+            return [self.to_representation(row) for row in rows]
+
+        pairs = list(zip(self.names, self.sources))
+        return [{name: row[source] for name, source in pairs} for row in rows]
+
+
+class FastReadMixin:
+    """
+    FastReadMixin Class
+
+    Viewset mixin serving the list and detail routes from `values()` rows through a
+    `ValuesSerializer`, instead of instantiating models and running the serializer.
+
+    The path is opt-in: it is taken when `fast_read` is true, and otherwise when the
+    `API_FAST_READ` setting is. The columns named in the queryset ordering (e.g. the
+    `rank` of search results) are read too, for the paginator to build its cursors.
+
+    Attributes:
+        fast_read (bool or None): Whether to take the fast path, or None to follow the
+            `API_FAST_READ` setting.
+
+    """
+
+    fast_read = None
+
+    def use_fast_read(self):
+        """
+        Return whether the fast path is enabled.
+
+        Returns:
+            bool: True if the list and detail routes read `values()` rows.
+
+        """
+        if self.fast_read is not None:
+            return self.fast_read
+
+        return settings.API_FAST_READ
+
+    def get_values_serializer(self):
+        """
+        Return the values serializer of the request.
+
+        Returns:
+            ValuesSerializer: Built on the serializer of the request.
+
+        """
+        return ValuesSerializer(self.get_serializer())
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_read():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_values_serializer()
+        rows = serializer.values(queryset, *ordering_columns(queryset))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.many(page))
+
+        return Response(serializer.many(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_fast_read():
+            return super().retrieve(request, *args, **kwargs)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        queryset = self.get_queryset()
+        serializer = self.get_values_serializer()
+
+        try:
+            row = serializer.values(queryset.filter(**lookup)).get()
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError) as exc:
+            raise Http404(
+                f'No {queryset.model._meta.object_name} matches the given query.'
+            ) from exc
+
+        self.check_object_permissions(request, row)
+        return Response(serializer.to_representation(row))
@@ -15,8 +15,9 @@ Attributes:
         (e.g., CharField, EmailField) with customizable attributes like max length, required,
         label, input type, and validators.
 
-    password_validators (list): A list of custom password validation functions, including checks
-        for password similarity, length, common passwords, and numeric content.
+    The passwords are validated once, in `_post_clean`, by the password validation pipeline
+    (see `src.passwords.PasswordPipeline`): similarity, length, common passwords, and numeric
+    content.
 
 Description:
     This module provides a flexible and extensible way to create custom user registration forms
@@ -50,15 +51,16 @@ Usage:
 from django.forms import (
     CharField,
     EmailField,
+    ModelForm,
     PasswordInput,
     ValidationError,
     TextInput,
 )
 from django.contrib.auth.forms import UserCreationForm
-from django.contrib.auth import password_validation
 from django.contrib.auth.models import User
 
-from . import utils
+from .passwords import get_password_pipeline
+from .usernames import username_index
 from .utils import label_required
 
 
@@ -114,14 +116,6 @@ def get_type_field(
     )
 
 
-password_validators = [
-    password_validation.validate_password,  # Password similarity check
-    utils.validate_password_length,  # Password length check
-    utils.validate_common_password,  # Commonly used password check
-    utils.validate_password_numeric,  # Numeric check
-]
-
-
 # pylint: disable=too-many-ancestors
 class CustomUserCreationForm(UserCreationForm):
     """
@@ -137,6 +131,8 @@ class CustomUserCreationForm(UserCreationForm):
         first_name (CharField): The first name field with a maximum length of 30 characters.
         last_name (CharField): The last name field with a maximum length of 30 characters.
         email (EmailField): The email field with a maximum length of 254 characters.
+        username_taken_message (str): The error of a username already in use, also
+            reported by the signup view when a concurrent signup takes it first.
 
     Methods:
         __init__(self, *args, **kwargs): Initializes the form, customizing the help text
@@ -145,6 +141,8 @@ class CustomUserCreationForm(UserCreationForm):
         clean_username(self): Custom username validation to check if the username is
             already in use.
 
+        _post_clean(self): Validates each distinct password once, against the user.
+
     Description:
         This form class allows developers to create custom user registration forms
         with specific field attributes and validation rules. It extends Django's
@@ -171,13 +169,13 @@ class CustomUserCreationForm(UserCreationForm):
     """
 
     username = get_type_field(CharField, 150, True, 'Username', TextInput, [])
-    password = get_type_field(
-        CharField, 150, True, 'Password', PasswordInput, password_validators
-    )
+    password = get_type_field(CharField, 150, True, 'Password', PasswordInput, [])
     first_name = get_type_field(CharField, 30, True, 'First Name', TextInput, [])
     last_name = get_type_field(CharField, 30, True, 'Last Name', TextInput, [])
     email = get_type_field(EmailField, 254, True, 'Email', TextInput, [])
 
+    username_taken_message = 'This username is already in use. Please choose another.'
+
     class Meta:
         """
         Meta:
@@ -203,7 +201,8 @@ class CustomUserCreationForm(UserCreationForm):
         Validate and clean a username.
 
         This method is used as part of form validation to ensure that the provided
-        username is unique and does not already exist in the User database.
+        username is unique and does not already exist in the User database. The username
+        index (see `src.usernames`) answers for most available usernames without a query.
 
         Returns:
             str: The cleaned and validated username if it is unique.
@@ -217,9 +216,33 @@ class CustomUserCreationForm(UserCreationForm):
         username = self.cleaned_data['username']
 
         # Check if the username is already taken
-        if User.objects.filter(username=username).exists():
-            raise ValidationError(
-                'This username is already in use. Please choose another.'
-            )
+        if not username_index.is_available(username):
+            raise ValidationError(self.username_taken_message)
 
         return username
+
+    def _post_clean(self):
+        """
+        Validate the passwords, once the instance is updated with the form data.
+
+        `UserCreationForm` validates `password2`, on top of the validators of the fields:
+        instead, each distinct password of `password` and `password2` is run once through
+        the password validation pipeline, against the user, and its errors are reported
+        on the first field holding it.
+
+        """
+        # Skips the `_post_clean` of `UserCreationForm`, validating `password2` again
+        ModelForm._post_clean(self)  # pylint: disable=protected-access
+
+        fields = {}
+        for field in ('password', 'password2'):
+            password = self.cleaned_data.get(field)
+            if password:
+                fields.setdefault(password, field)
+
+        pipeline = get_password_pipeline()
+        for password, field in fields.items():
+            try:
+                pipeline.validate(password, self.instance)
+            except ValidationError as error:
+                self.add_error(field, error)
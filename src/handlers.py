@@ -0,0 +1,96 @@
+"""
+Module: handlers.py
+
+This module defines the WSGI and ASGI handlers of the project, which resolve the path
+of each request through the resolver cache of `src.resolvers` instead of walking the
+URL patterns.
+
+Classes:
+    - CachedResolverMixin: Handler mixin resolving requests through the resolver cache.
+    - CachedResolverWSGIHandler: The WSGI handler, with cached resolution.
+    - CachedResolverASGIHandler: The ASGI handler, with cached resolution.
+
+Functions:
+    - get_wsgi_application: Set up Django and return the WSGI handler.
+    - get_asgi_application: Set up Django and return the ASGI handler.
+
+"""
+
+import django
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.urls import set_urlconf
+
+from .resolvers import resolver_cache
+
+
+class CachedResolverMixin:
+    """
+    CachedResolverMixin Class
+
+    Handler mixin resolving the path of requests through the resolver cache, as
+    `BaseHandler.resolve_request` does through the URL resolver.
+    """
+
+    def resolve_request(self, request):
+        """
+        Resolve the path of a request, and set the match on the request.
+
+        Args:
+            request (HttpRequest): The incoming request.
+
+        Returns:
+            ResolverMatch: The match of the path.
+
+        Raises:
+            Resolver404: If the path does not resolve.
+
+        """
+        urlconf = getattr(request, 'urlconf', None)
+        if urlconf is not None:
+            set_urlconf(urlconf)
+
+        resolver_match = resolver_cache.resolve(request.path_info, urlconf)
+        request.resolver_match = resolver_match
+
+        return resolver_match
+
+
+class CachedResolverWSGIHandler(CachedResolverMixin, WSGIHandler):
+    """
+    CachedResolverWSGIHandler Class
+
+    The WSGI handler of the project, with cached URL resolution.
+    """
+
+
+class CachedResolverASGIHandler(CachedResolverMixin, ASGIHandler):
+    """
+    CachedResolverASGIHandler Class
+
+    The ASGI handler of the project, with cached URL resolution.
+    """
+
+
+def get_wsgi_application():
+    """
+    Set up Django and return the WSGI handler, like `django.core.wsgi`.
+
+    Returns:
+        CachedResolverWSGIHandler: The WSGI callable.
+
+    """
+    django.setup(set_prefix=False)
+    return CachedResolverWSGIHandler()
+
+
+def get_asgi_application():
+    """
+    Set up Django and return the ASGI handler, like `django.core.asgi`.
+
+    Returns:
+        CachedResolverASGIHandler: The ASGI callable.
+
+    """
+    django.setup(set_prefix=False)
+    return CachedResolverASGIHandler()
@@ -0,0 +1,177 @@
+"""
+Module: loaders.py
+
+This module loads posts in bulk from a JSON array of objects with a `title`, `content`
+and `pub_date`, such as `src/migrations/sample_posts.json`.
+
+The array is parsed incrementally, one object at a time, from chunks of the file, so
+the memory used is bounded by a batch of posts whatever the size of the file. Each batch
+is written in its own transaction: with `COPY ... FROM STDIN` on PostgreSQL (one round
+trip, and no SQL to parse per row), and with `bulk_create` on other databases.
+
+Neither COPY nor `bulk_create` sends `post_save`, so the cached post responses are
+invalidated after each batch, as by the bulk routes of the API (see `src.caching`).
+
+Functions:
+    - iter_json_array: Parse the items of a JSON array from a file, one at a time.
+    - copy_objects: Insert unsaved objects with COPY, on PostgreSQL.
+    - insert_objects: Insert unsaved objects, with COPY where available.
+    - load_posts: Load the posts of a JSON file, batch by batch.
+
+Attributes:
+    POST_FIELDS (tuple): The fields of the posts read from the file.
+
+"""
+
+import gzip
+from io import StringIO
+from json import JSONDecodeError, JSONDecoder
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .bulk import batched
+from .caching import post_cache
+
+POST_FIELDS = ('title', 'content', 'pub_date')
+
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def iter_json_array(file, chunk_size=65536):
+    """
+    Parse the items of a JSON array from a file, one at a time.
+
+    Args:
+        file (file): The text file, holding a JSON array.
+        chunk_size (int): The number of characters read at once.
+
+    Yields:
+        The items of the array.
+
+    Raises:
+        ValueError: If the file does not hold a JSON array.
+
+    """
+    decoder = JSONDecoder()
+    buffer, position, eof = '', 0, False
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer, position = buffer[position:] + chunk, 0
+
+    def skip(characters):
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in characters:
+                position += 1
+            if position < len(buffer) or eof:
+                return
+            fill()
+
+    skip(' \t\r\n')
+    if buffer[position:position + 1] != '[':
+        raise ValueError('Expected a JSON array.')
+    position += 1
+
+    while True:
+        skip(' \t\r\n,')
+        if position == len(buffer):
+            raise ValueError('Unterminated JSON array.')
+        if buffer[position] == ']':
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+
+        # A number ending the buffer may continue in the next chunk
+        if end == len(buffer) and not eof:
+            fill()
+            continue
+
+        position = end
+        yield item
+
+
+def copy_objects(model, objects, using=DEFAULT_DB_ALIAS):
+    """
+    Insert unsaved objects with `COPY ... FROM STDIN`, on PostgreSQL.
+
+    The values are prepared like `bulk_create` does (`auto_now` fields included), and
+    the primary keys are left to the database.
+
+    Args:
+        model (Model): The model of the objects.
+        objects (list): The unsaved objects.
+        using (str): The alias of the PostgreSQL database.
+
+    """
+    connection = connections[using]
+    opts = model._meta
+    fields = [field for field in opts.concrete_fields if field is not opts.auto_field]
+
+    data = StringIO()
+    for obj in objects:
+        values = []
+        for field in fields:
+            value = field.get_db_prep_save(field.pre_save(obj, True), connection)
+            values.append('\\N' if value is None else str(value).translate(COPY_ESCAPES))
+        data.write('\t'.join(values) + '\n')
+    data.seek(0)
+
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    table = connection.ops.quote_name(opts.db_table)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN', data)
+
+
+def insert_objects(model, objects, using=DEFAULT_DB_ALIAS):
+    """
+    Insert unsaved objects in one transaction, with COPY on PostgreSQL and
+    `bulk_create` elsewhere.
+
+    Args:
+        model (Model): The model of the objects.
+        objects (list): The unsaved objects.
+        using (str): The alias of the database.
+
+    """
+    with transaction.atomic(using=using):
+        if connections[using].vendor == 'postgresql':
+            copy_objects(model, objects, using)
+        else:
+            model.objects.using(using).bulk_create(objects)
+
+
+def load_posts(model, path, batch_size=5000, using=DEFAULT_DB_ALIAS):
+    """
+    Load the posts of a JSON file, plain or gzipped, batch by batch.
+
+    Args:
+        model (Model): The post model.
+        path (str): The path of the JSON array of posts.
+        batch_size (int): The number of posts written per transaction.
+        using (str): The alias of the database.
+
+    Yields:
+        int: The number of posts loaded so far, after each batch.
+
+    """
+    opener = gzip.open if str(path).endswith('.gz') else open
+    loaded = 0
+
+    with opener(path, 'rt', encoding='utf-8') as file:
+        for records in batched(iter_json_array(file), batch_size):
+            posts = [model(**{field: record[field] for field in POST_FIELDS}) for record in records]
+            insert_objects(model, posts, using)
+            # Neither COPY nor bulk_create sends a post_save signal
+            post_cache.invalidate_on_commit(using)
+
+            loaded += len(posts)
+            yield loaded
@@ -0,0 +1,136 @@
+"""
+Module: benchmark_serializers.py
+
+This module defines a custom Django management command comparing the throughput of
+`PostSerializer` with the fast read path of `src.fastpath`.
+
+Both are fed in-memory rows (model instances for the serializer, `values()` dicts for
+the fast path), so that the benchmark measures serialization alone, without a database.
+
+Custom Management Command:
+    - Command: Benchmark post serialization, in rows per second.
+
+"""
+
+from datetime import timedelta
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from src.fastpath import ValuesSerializer
+from src.models import Post
+from src.serializers import PostSerializer
+
+
+def make_rows(count):
+    """
+    Build posts and their `values()` rows, without saving them.
+
+    Args:
+        count (int): The number of posts.
+
+    Returns:
+        tuple: The list of posts and the list of their rows.
+
+    """
+    now = timezone.now()
+    posts = [
+        Post(
+            id=index,
+            title=f'Post {index}',
+            content='Lorem ipsum dolor sit amet. ' * 20,
+            pub_date=now - timedelta(minutes=index),
+            updated_at=now,
+        )
+        for index in range(1, count + 1)
+    ]
+    columns = [field.attname for field in Post._meta.concrete_fields]
+    rows = [{column: getattr(post, column) for column in columns} for post in posts]
+
+    return posts, rows
+
+
+def best_time(function, repeat):
+    """
+    Return the best time of several runs of a function.
+
+    Args:
+        function (callable): The function to time.
+        repeat (int): The number of runs.
+
+    Returns:
+        float: The shortest run, in seconds.
+
+    """
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+
+    return min(times)
+
+
+class Command(BaseCommand):
+    """
+    Command Class
+
+    Custom management command comparing `PostSerializer` with `ValuesSerializer`.
+
+    Attributes:
+        help (str): A brief description of the command for the user.
+
+    """
+
+    help = 'Benchmark post serialization against the fast read path, in rows per second'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            nargs='+',
+            default=[1000, 10000, 100000],
+            help='The numbers of rows to serialize (default: 1000 10000 100000).',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='The number of runs per measure, the best of which is kept (default: 3).',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Handle Method
+
+        Serialize each number of rows with both serializers, check that they give the
+        same output, and print their throughputs.
+
+        Args:
+            args: Positional arguments.
+            options: Keyword arguments.
+
+        """
+        self.stdout.write(
+            f'{"rows":>8}  {"PostSerializer":>16}  {"ValuesSerializer":>16}  {"speedup":>8}'
+        )
+
+        for count in options['rows']:
+            posts, rows = make_rows(count)
+            fast = ValuesSerializer(PostSerializer())
+
+            if PostSerializer(posts, many=True).data != fast.many(rows):
+                raise CommandError('The fast read path and PostSerializer disagree.')
+
+            slow_time = best_time(
+                lambda posts=posts: PostSerializer(posts, many=True).data, options['repeat']
+            )
+            fast_time = best_time(
+                lambda fast=fast, rows=rows: fast.many(rows), options['repeat']
+            )
+
+            self.stdout.write(
+                f'{count:>8}  {count / slow_time:>12,.0f} r/s  '
+                f'{count / fast_time:>12,.0f} r/s  {slow_time / fast_time:>7.1f}x'
+            )
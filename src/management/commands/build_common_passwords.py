@@ -0,0 +1,151 @@
+"""
+Module: build_common_passwords.py
+
+This module defines a custom Django management command building the file of sorted
+common passwords read by `src.passwords` (see the `COMMON_PASSWORDS_FILE` setting),
+from any number of plain or gzipped lists of passwords, one per line.
+
+Lists of millions of passwords are sorted externally: runs of `--run-size` passwords
+are sorted in memory and written to temporary files, which are then merged, so the
+memory used stays bounded whatever the size of the lists.
+
+Custom Management Command:
+    - Command: Build the sorted common password file.
+
+"""
+
+import gzip
+import heapq
+import os
+from contextlib import ExitStack
+from itertools import islice
+from tempfile import TemporaryDirectory
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from src.passwords import DJANGO_PASSWORD_LIST_PATH, normalize
+
+
+def read_passwords(path):
+    """
+    Read the normalized passwords of a plain or gzipped list.
+
+    Args:
+        path (str): The path of the list.
+
+    Yields:
+        bytes: The UTF-8 encoded, normalized, non-empty passwords. Passwords with
+        control characters are skipped, since they would sort before the newlines.
+
+    """
+    opener = gzip.open if str(path).endswith('.gz') else open
+
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as file:
+        for line in file:
+            password = normalize(line)
+            if password and password.isprintable():
+                yield password.encode('utf-8')
+
+
+def write_run(passwords, directory, index):
+    """
+    Sort and deduplicate a run of passwords into a temporary file.
+
+    Args:
+        passwords (list): The passwords of the run.
+        directory (str): The temporary directory.
+        index (int): The number of the run.
+
+    Returns:
+        str: The path of the run file.
+
+    """
+    path = os.path.join(directory, f'run-{index}')
+    with open(path, 'wb') as file:
+        file.writelines(password + b'\n' for password in sorted(set(passwords)))
+
+    return path
+
+
+class Command(BaseCommand):
+    """
+    Command Class
+
+    Custom management command building the sorted common password file.
+
+    Attributes:
+        help (str): A brief description of the command for the user.
+
+    """
+
+    help = 'Build the sorted, memory-mappable file of common passwords from password lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'lists', nargs='*', help='Plain or gzipped password lists, one per line.'
+        )
+        parser.add_argument(
+            '--output',
+            default=settings.COMMON_PASSWORDS_FILE,
+            help='The file to build (default: the COMMON_PASSWORDS_FILE setting).',
+        )
+        parser.add_argument(
+            '--no-django',
+            action='store_true',
+            help="Leave Django's list of 20,000 common passwords out.",
+        )
+        parser.add_argument(
+            '--run-size',
+            type=int,
+            default=1_000_000,
+            help='The number of passwords sorted in memory at once (default: 1000000).',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Handle Method
+
+        Sort the passwords of every list into runs, merge them into the output file,
+        and replace the previous file atomically.
+
+        Args:
+            args: Positional arguments.
+            options: Keyword arguments.
+
+        """
+        output = options['output']
+        if not output:
+            raise CommandError('Set COMMON_PASSWORDS_FILE or pass --output.')
+
+        lists = list(options['lists'])
+        if not options['no_django']:
+            lists.append(DJANGO_PASSWORD_LIST_PATH)
+        if not lists:
+            raise CommandError('No password list to build from.')
+
+        count = 0
+        with TemporaryDirectory() as directory, ExitStack() as stack:
+            runs = []
+            for path in lists:
+                passwords = read_passwords(path)
+                run = list(islice(passwords, options['run_size']))
+                while run:
+                    runs.append(write_run(run, directory, len(runs)))
+                    run = list(islice(passwords, options['run_size']))
+
+            files = [stack.enter_context(open(path, 'rb')) for path in runs]
+            partial = f'{output}.partial'
+
+            with open(partial, 'wb') as file:
+                previous = None
+                for line in heapq.merge(*files):
+                    if line != previous:
+                        file.write(line)
+                        previous = line
+                        count += 1
+
+            # Workers still mapping the previous file keep reading it until they restart
+            os.replace(partial, output)
+
+        self.stdout.write(f'Wrote {count} passwords to {output}')
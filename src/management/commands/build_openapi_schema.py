@@ -0,0 +1,74 @@
+"""
+Module: build_openapi_schema.py
+
+This module defines a custom Django management command generating the OpenAPI schema of
+the API once, during the deploy, into the `OPENAPI_SCHEMA_FILE` served by `/swagger/`
+(see `setup.swagger`), so no web worker generates it.
+
+The file is replaced atomically, so workers starting meanwhile read either schema whole.
+
+Custom Management Command:
+    - Command: Generate the OpenAPI schema into a file.
+
+"""
+
+import os
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from setup.swagger import generate_schema
+
+
+class Command(BaseCommand):
+    """
+    Command Class
+
+    Custom management command generating the OpenAPI schema into a file.
+
+    Attributes:
+        help (str): A brief description of the command for the user.
+
+    """
+
+    help = 'Generate the OpenAPI schema once, into the file served by /swagger/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=settings.OPENAPI_SCHEMA_FILE,
+            help='The file written (default: the OPENAPI_SCHEMA_FILE setting).',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Handle Method
+
+        Generate the schema, write it next to the output file, then move it in place.
+
+        Args:
+            args: Positional arguments.
+            options: Keyword arguments.
+
+        """
+        path = options['output']
+        if not path:
+            raise CommandError('No output file: set OPENAPI_SCHEMA_FILE or --output.')
+
+        start = perf_counter()
+        content = generate_schema()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        partial = f'{path}.partial'
+        with open(partial, 'wb') as file:
+            file.write(content)
+        os.replace(partial, path)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Wrote the schema ({len(content)} bytes) to {path} '
+                f'in {perf_counter() - start:.2f}s'
+            )
+        )
@@ -0,0 +1,53 @@
+"""
+Module: build_username_index.py
+
+This module defines a custom Django management command rebuilding the Bloom filter of
+taken usernames (see `src.usernames`) from the database: during the deploy, after
+resizing it, or to drop the usernames of deleted users. It fails if another build is in
+progress.
+
+Custom Management Command:
+    - Command: Rebuild the username index.
+
+"""
+
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from src.usernames import username_index
+
+
+class Command(BaseCommand):
+    """
+    Command Class
+
+    Custom management command rebuilding the username index.
+
+    Attributes:
+        help (str): A brief description of the command for the user.
+
+    """
+
+    help = 'Rebuild the Bloom filter of taken usernames from the database'
+
+    def handle(self, *args, **options):
+        """
+        Handle Method
+
+        Rebuild the username index, and report the number of usernames and the time taken.
+
+        Args:
+            args: Positional arguments.
+            options: Keyword arguments.
+
+        """
+        start = perf_counter()
+        count = username_index.rebuild()
+        if count is None:
+            raise CommandError('Another build of the username index is in progress.')
+
+        self.stdout.write(
+            f'Indexed {count} usernames in {perf_counter() - start:.2f}s '
+            f'({username_index.bloom.bits} bits, {username_index.bloom.hashes} hashes)'
+        )
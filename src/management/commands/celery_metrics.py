@@ -0,0 +1,127 @@
+"""
+Module: celery_metrics.py
+
+This module defines a custom Django management command reporting the latency and
+outcome of Celery tasks, merged from the metrics files of every worker process (see
+`src.metrics`).
+
+For each task name, the table reports the number of runs and their outcomes, the
+throughput, the median, 90th and 99th percentiles of the queue wait and the run time,
+and the average number of busy worker processes (throughput times mean run time, by
+Little's law): a worker concurrency close to it leaves tasks waiting in the queue.
+
+Custom Management Command:
+    - Command: Report the latency and outcome of Celery tasks.
+
+"""
+
+import os
+import shutil
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from src.metrics import load_metrics
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _format_seconds(value):
+    if value is None:
+        return '-'
+    if value == float('inf'):
+        return 'inf'
+
+    return f'{value * 1000:.0f}ms' if value < 1 else f'{value:.1f}s'
+
+
+class Command(BaseCommand):
+    """
+    Command Class
+
+    Custom management command reporting the latency and outcome of Celery tasks.
+
+    Attributes:
+        help (str): A brief description of the command for the user.
+
+    """
+
+    help = 'Report the queue wait, run time and outcome of Celery tasks, per task name'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prometheus',
+            action='store_true',
+            help='Print the metrics in the Prometheus text format.',
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Delete the metrics files, e.g. before a load test.',
+        )
+
+    def report(self, metrics):
+        """
+        Print the metrics of each task as a table.
+
+        Args:
+            metrics (TaskMetrics): The merged metrics.
+
+        """
+        waits = ' '.join(f'wait p{quantile * 100:g}' for quantile in QUANTILES)
+        runs = ' '.join(f'run p{quantile * 100:g}' for quantile in QUANTILES)
+        self.stdout.write(f'task: runs (outcomes), tasks/s, {waits}, {runs}, busy workers')
+
+        for name, task in sorted(metrics.tasks.items()):
+            runs = task['run_time']
+            outcomes = ', '.join(f'{state} {count}' for state, count in task['outcomes'].items())
+
+            elapsed = (task['last'] or 0) - (task['first'] or 0)
+            rate = runs.count / elapsed if elapsed > 0 else 0.0
+            busy = rate * runs.sum / runs.count if runs.count else 0.0
+
+            wait_quantiles = [task['queue_wait'].quantile(q) for q in QUANTILES]
+            run_quantiles = [runs.quantile(q) for q in QUANTILES]
+
+            self.stdout.write(
+                f'{name}: {runs.count} ({outcomes}), {rate:.1f}/s, '
+                f'{" ".join(map(_format_seconds, wait_quantiles))}, '
+                f'{" ".join(map(_format_seconds, run_quantiles))}, {busy:.2f}'
+            )
+
+            if task['exceptions']:
+                exceptions = ', '.join(
+                    f'{exception} {count}' for exception, count in task['exceptions'].items()
+                )
+                self.stdout.write(f'    exceptions: {exceptions}')
+
+    def handle(self, *args, **options):
+        """
+        Handle Method
+
+        Merge the metrics files of the worker processes, and print them.
+
+        Args:
+            args: Positional arguments.
+            options: Keyword arguments.
+
+        """
+        directory = settings.TASK_METRICS_DIR
+        if not directory:
+            raise CommandError('Set TASK_METRICS_DIR to collect the metrics of the workers.')
+
+        if options['reset']:
+            shutil.rmtree(directory, ignore_errors=True)
+            self.stdout.write(f'Deleted the metrics files of {directory}')
+            return
+
+        if not os.path.isdir(directory):
+            self.stdout.write(f'No metrics in {directory} yet')
+            return
+
+        metrics = load_metrics(directory)
+
+        if options['prometheus']:
+            self.stdout.write('\n'.join(metrics.render()))
+        else:
+            self.report(metrics)
@@ -0,0 +1,311 @@
+"""
+Module: import_users.py
+
+This module defines a custom Django management command importing users in bulk from a
+CSV or NDJSON file, with the columns or keys `username`, `password`, `email`,
+`first_name` and `last_name` (only `username` is required).
+
+Creating users one by one is dominated by password hashing (PBKDF2 is slow by design)
+and by one INSERT per user. Instead, the records are read in batches; each batch is
+validated and hashed across a pool of processes, then written by one `bulk_create` in
+its own transaction. Usernames already taken are skipped, after a check against the
+username index (see `src.usernames`), which is then updated with the new usernames;
+users signing up meanwhile are skipped too, as conflicts of the insert.
+
+After each batch, the number of records done is written to a checkpoint file, so an
+interrupted import resumes after the last batch written. The checkpoint is removed once
+the import completes.
+
+Custom Management Command:
+    - Command: Import users from a CSV or NDJSON file.
+
+"""
+
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+import django
+import orjson
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from src.bulk import batched
+from src.passwords import get_password_pipeline
+from src.usernames import username_index
+from src.utils import validate_username
+
+USER_FIELDS = ('username', 'email', 'first_name', 'last_name')
+
+
+def read_records(path, file_format):
+    """
+    Read the records of a CSV or NDJSON file, one at a time.
+
+    Args:
+        path (str): The path of the file.
+        file_format (str): 'csv' or 'ndjson'.
+
+    Yields:
+        tuple: The number of the record (from 1), and the record as a dict, or the
+        `JSONDecodeError` of a malformed NDJSON line, reported by `prepare_user`.
+
+    """
+    with open(path, encoding='utf-8', newline='') as file:
+        if file_format == 'csv':
+            yield from enumerate(csv.DictReader(file), start=1)
+            return
+
+        lines = (line for line in file if line.strip())
+        for number, line in enumerate(lines, start=1):
+            try:
+                yield number, orjson.loads(line)
+            except orjson.JSONDecodeError as error:
+                yield number, error
+
+
+def prepare_user(numbered_record):
+    """
+    Validate a record, and hash its password. Run in the processes of the pool.
+
+    Args:
+        numbered_record (tuple): The number of the record, and the record.
+
+    Returns:
+        tuple: The number of the record, the fields of the user (with the hashed
+        password) or None, and the validation error messages.
+
+    """
+    number, record = numbered_record
+    if isinstance(record, ValueError):
+        return number, None, [f'record: Invalid JSON: {record}']
+
+    if not isinstance(record, dict):
+        return number, None, ['record: Not an object.']
+
+    # NDJSON values may be of any type: only strings (or nothing) are accepted
+    errors = [
+        f'{field}: Not a string.'
+        for field in (*USER_FIELDS, 'password')
+        if not isinstance(record.get(field) or '', str)
+    ]
+    if errors:
+        return number, None, errors
+
+    fields = {field: (record.get(field) or '').strip() for field in USER_FIELDS}
+    fields['email'] = User.objects.normalize_email(fields['email'])
+    password = record.get('password') or None
+
+    try:
+        validate_username(fields['username'])
+    except ValidationError as error:
+        errors.extend(f'username: {message}' for message in error.messages)
+
+    if password is not None:
+        password_errors, _timings = get_password_pipeline().run(password, User(**fields))
+        errors.extend(
+            f'password: {message}' for error in password_errors for message in error.messages
+        )
+
+    if errors:
+        return number, None, errors
+
+    # Users without a password get an unusable one, and must reset it
+    fields['password'] = make_password(password)
+
+    return number, fields, []
+
+
+class Command(BaseCommand):
+    """
+    Command Class
+
+    Custom management command importing users in bulk from a CSV or NDJSON file.
+
+    Attributes:
+        help (str): A brief description of the command for the user.
+
+    """
+
+    help = 'Import users from a CSV or NDJSON file, hashing passwords in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='The CSV or NDJSON file of users.')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'ndjson'],
+            help='The format of the file (default: from its extension).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='The number of users written per transaction (default: 1000).',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='The number of processes hashing passwords (default: the CPU count).',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='The checkpoint file (default: the file of users, suffixed .checkpoint).',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore the checkpoint, and import from the first record.',
+        )
+
+    @staticmethod
+    def load_checkpoint(path):
+        """
+        Read the checkpoint of a previous, interrupted import.
+
+        Args:
+            path (str): The checkpoint file.
+
+        Returns:
+            dict: The numbers of records `done`, users `created` and records `skipped`.
+
+        """
+        if not os.path.exists(path):
+            return {'done': 0, 'created': 0, 'skipped': 0}
+
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+
+    @staticmethod
+    def save_checkpoint(path, checkpoint):
+        """
+        Replace the checkpoint file atomically.
+
+        Args:
+            path (str): The checkpoint file.
+            checkpoint (dict): The numbers of records done, users created and skipped.
+
+        """
+        with open(f'{path}.partial', 'w', encoding='utf-8') as file:
+            json.dump(checkpoint, file)
+
+        os.replace(f'{path}.partial', path)
+
+    def write_batch(self, prepared):
+        """
+        Create the valid, untaken users of a batch, in one transaction.
+
+        Args:
+            prepared (list): The results of `prepare_user` for the batch.
+
+        Returns:
+            tuple: The numbers of users created and records skipped.
+
+        """
+        users, skipped = {}, 0
+        for number, fields, errors in prepared:
+            if fields is not None and fields['username'] in users:
+                errors = ['username: Duplicated in the file.']
+
+            if errors:
+                skipped += 1
+                self.stderr.write(f'Record {number} skipped: {"; ".join(errors)}')
+                continue
+
+            users[fields['username']] = (number, fields)
+
+        for username in username_index.taken(users):
+            number, _fields = users.pop(username)
+            skipped += 1
+            self.stderr.write(f'Record {number} skipped: username: Already taken.')
+
+        with transaction.atomic():
+            # A user signing up since the check above is a conflict, skipped: the rows
+            # inserted are those holding the (salted, so unique) password hash of the batch
+            User.objects.bulk_create(
+                (User(**fields) for _number, fields in users.values()), ignore_conflicts=True
+            )
+            passwords = dict(
+                User.objects.filter(username__in=users).values_list('username', 'password')
+            )
+
+        for username, (number, fields) in list(users.items()):
+            if passwords.get(username) != fields['password']:
+                del users[username]
+                skipped += 1
+                self.stderr.write(f'Record {number} skipped: username: Already taken.')
+
+        # bulk_create sends no post_save signal
+        username_index.add(users)
+
+        return len(users), skipped
+
+    def handle(self, *args, **options):
+        """
+        Handle Method
+
+        Import the records of the file after the checkpoint, batch by batch, and report
+        the progress after each batch.
+
+        Args:
+            args: Positional arguments.
+            options: Keyword arguments.
+
+        """
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'No such file: {path}')
+
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'ndjson')
+        checkpoint_path = options['checkpoint'] or f'{path}.checkpoint'
+
+        if options['restart']:
+            checkpoint = self.load_checkpoint(os.devnull)
+        else:
+            checkpoint = self.load_checkpoint(checkpoint_path)
+
+        if checkpoint['done']:
+            self.stdout.write(f'Resuming after record {checkpoint["done"]}')
+
+        records = (
+            record for record in read_records(path, file_format)
+            if record[0] > checkpoint['done']
+        )
+
+        # The forked workers must not share the connections of this process
+        connections.close_all()
+
+        start, imported = perf_counter(), 0
+        with ProcessPoolExecutor(options['workers'], initializer=django.setup) as executor:
+            for batch in batched(records, options['batch_size']):
+                chunksize = max(1, len(batch) // (options['workers'] * 4))
+                prepared = list(executor.map(prepare_user, batch, chunksize=chunksize))
+
+                created, skipped = self.write_batch(prepared)
+
+                checkpoint['done'] = batch[-1][0]
+                checkpoint['created'] += created
+                checkpoint['skipped'] += skipped
+                self.save_checkpoint(checkpoint_path, checkpoint)
+
+                imported += len(batch)
+                self.stdout.write(
+                    f'Record {checkpoint["done"]}: {checkpoint["created"]} created, '
+                    f'{checkpoint["skipped"]} skipped '
+                    f'({imported / (perf_counter() - start):.0f} records/s)'
+                )
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Imported {checkpoint["created"]} users, skipped {checkpoint["skipped"]} '
+                f'records in {perf_counter() - start:.1f}s'
+            )
+        )
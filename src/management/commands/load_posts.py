@@ -0,0 +1,87 @@
+"""
+Module: load_posts.py
+
+This module defines a custom Django management command loading posts in bulk from a
+JSON array of objects with a `title`, `content` and `pub_date`, plain or gzipped, such
+as `src/migrations/sample_posts.json`.
+
+The file is parsed incrementally and written in batches, with COPY on PostgreSQL (see
+`src.loaders`), so millions of posts can be seeded with bounded memory.
+
+Custom Management Command:
+    - Command: Load posts in bulk from a JSON file.
+
+"""
+
+import os
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from src.loaders import load_posts
+from src.models import Post
+
+
+class Command(BaseCommand):
+    """
+    Command Class
+
+    Custom management command loading posts in bulk from a JSON file.
+
+    Attributes:
+        help (str): A brief description of the command for the user.
+
+    """
+
+    help = 'Load posts in bulk from a JSON array, with COPY on PostgreSQL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='The JSON array of posts, plain or gzipped.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='The number of posts written per transaction (default: 5000).',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='The database to load the posts into (default: "default").',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Handle Method
+
+        Load the posts of the file batch by batch, and report the progress at most
+        once per second.
+
+        Args:
+            args: Positional arguments.
+            options: Keyword arguments.
+
+        """
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'No such file: {path}')
+
+        start = reported = perf_counter()
+        loaded = 0
+
+        try:
+            for loaded in load_posts(Post, path, options['batch_size'], options['database']):
+                if perf_counter() - reported >= 1:
+                    reported = perf_counter()
+                    self.stdout.write(
+                        f'{loaded} posts ({loaded / (reported - start):.0f} rows/s)'
+                    )
+        except (KeyError, ValueError) as error:
+            raise CommandError(f'Invalid posts after {loaded} loaded: {error!r}') from error
+
+        elapsed = perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Loaded {loaded} posts in {elapsed:.1f}s ({loaded / elapsed:.0f} rows/s)'
+            )
+        )
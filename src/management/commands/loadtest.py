@@ -0,0 +1,212 @@
+"""
+Module: loadtest.py
+
+This module defines a custom Django management command generating HTTP load against a
+running server, to compare deployments (e.g. gunicorn sync workers against ASGI
+workers, see the `bench-wsgi` and `bench-asgi` targets of the Makefile).
+
+The load is generated by asyncio connections, each sending GET requests one after the
+other over HTTP/1.1 keep-alive, so a single process can keep hundreds of requests in
+flight.
+
+Custom Management Command:
+    - Command: Measure requests per second and latency percentiles of a URL.
+
+"""
+
+import asyncio
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(latencies, fraction):
+    """
+    Return a percentile of sorted latencies (nearest rank).
+
+    Args:
+        latencies (list): The latencies, sorted.
+        fraction (float): The percentile, e.g. 0.99.
+
+    Returns:
+        float: The latency at the percentile, or 0.0 without latencies.
+
+    """
+    if not latencies:
+        return 0.0
+
+    index = min(len(latencies) - 1, max(0, int(round(fraction * len(latencies))) - 1))
+    return latencies[index]
+
+
+async def read_response(reader):
+    """
+    Read an HTTP/1.1 response with a `Content-Length` or chunked body.
+
+    Args:
+        reader (StreamReader): The connection.
+
+    Returns:
+        tuple: The status code of the response, and whether the connection stays open.
+
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed by the server')
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get('content-length', 0)))
+
+    keep_alive = headers.get('connection', '').lower() != 'close'
+    return int(status_line.split()[1]), keep_alive
+
+
+async def connection(url, deadline, latencies, errors):
+    """
+    Send requests over one keep-alive connection until the deadline.
+
+    Args:
+        url (SplitResult): The URL to request.
+        deadline (float): The `perf_counter` time to stop at.
+        latencies (list): Collects the latency of every successful request.
+        errors (dict): Counts the failed requests, by status code or exception name.
+
+    """
+    path = url.path or '/'
+    if url.query:
+        path = f'{path}?{url.query}'
+
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: {url.netloc}\r\n'
+        'Accept: application/json\r\nConnection: keep-alive\r\n\r\n'
+    ).encode('latin-1')
+    writer = None
+
+    while perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+
+            start = perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await read_response(reader)
+            elapsed = perf_counter() - start
+
+            # e.g. gunicorn sync workers close the connection after every response
+            if not keep_alive:
+                writer.close()
+                writer = None
+
+            if status < 400:
+                latencies.append(elapsed)
+            else:
+                errors[status] = errors.get(status, 0) + 1
+
+        except (ConnectionError, OSError, ValueError, asyncio.IncompleteReadError) as exc:
+            errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+            if writer is not None:
+                writer.close()
+            writer = None
+
+    if writer is not None:
+        writer.close()
+
+
+async def run(url, concurrency, duration):
+    """
+    Generate load on a URL from many connections at once.
+
+    Args:
+        url (SplitResult): The URL to request.
+        concurrency (int): The number of concurrent connections.
+        duration (float): The duration of the load, in seconds.
+
+    Returns:
+        tuple: The latencies of the successful requests, and the failures.
+
+    """
+    latencies = []
+    errors = {}
+    deadline = perf_counter() + duration
+
+    await asyncio.gather(*[
+        connection(url, deadline, latencies, errors) for _ in range(concurrency)
+    ])
+
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    """
+    Command Class
+
+    Custom management command measuring the throughput and latency of a URL.
+
+    Attributes:
+        help (str): A brief description of the command for the user.
+
+    """
+
+    help = 'Measure requests per second and latency percentiles of GET requests to a URL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='The URL to request, e.g. http://127.0.0.1:8000/api/posts/')
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=200,
+            help='The number of concurrent keep-alive connections (default: 200).',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=10.0,
+            help='The duration of the load, in seconds (default: 10).',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Handle Method
+
+        Generate the load and print the throughput, latency percentiles and failures.
+
+        Args:
+            args: Positional arguments.
+            options: Keyword arguments.
+
+        """
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError('Only plain http:// URLs are supported.')
+
+        start = perf_counter()
+        latencies, errors = asyncio.run(
+            run(url, options['concurrency'], options['duration'])
+        )
+        elapsed = perf_counter() - start
+        latencies.sort()
+
+        self.stdout.write(f'URL:         {options["url"]}')
+        self.stdout.write(f'Concurrency: {options["concurrency"]}')
+        self.stdout.write(f'Requests:    {len(latencies)} in {elapsed:.1f}s')
+        self.stdout.write(f'Throughput:  {len(latencies) / elapsed:.1f} req/s')
+        for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+            self.stdout.write(f'Latency {name}: {percentile(latencies, fraction) * 1000:.1f} ms')
+        if errors:
+            self.stdout.write(self.style.WARNING(f'Failures:    {errors}'))
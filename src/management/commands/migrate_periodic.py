@@ -4,13 +4,128 @@ Module: periodic_migrations.py
 This module defines a custom Django management command for running
 database migrations periodically.
 
+Most runs find nothing to apply, yet `migrate` loads (and imports) the whole migration
+graph to find out. Instead, the command first lists the migration files of every app,
+without importing them, and compares them with the migrations recorded as applied in
+the `django_migrations` table: when every file is recorded, it exits after one query.
+
+Otherwise, on PostgreSQL, it takes a session-level advisory lock, so that only one of
+the instances started at once applies the migrations; the others wait for the lock,
+find nothing pending any more, and exit. The time taken by each migration is logged.
+
 Custom Management Command:
     - Command: Run database migrations periodically.
 
+Functions:
+    - migration_files: List the migration files of every installed app.
+    - fingerprint: Return a short digest of a set of migrations.
+
+Attributes:
+    LOCK_KEY (int): The key of the PostgreSQL advisory lock of the migrations.
+
 """
 
-from django.core.management.base import BaseCommand
+import logging
+import os
+from hashlib import sha256
+from importlib.util import find_spec
+from time import monotonic
+from zlib import crc32
+
+from django.apps import apps
 from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.core.management.commands.migrate import Command as MigrateCommand
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.migrations.loader import MigrationLoader
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = crc32(b'src.migrate_periodic')
+
+
+def migration_files():
+    """
+    List the migration files of every installed app, without importing them.
+
+    Like the migration loader, modules whose name starts with '_' or '~' are ignored.
+
+    Returns:
+        set: The `(app_label, migration_name)` pair of every migration file.
+
+    """
+    migrations = set()
+
+    for app_config in apps.get_app_configs():
+        module_name, _explicit = MigrationLoader.migrations_module(app_config.label)
+        if module_name is None:
+            continue
+
+        try:
+            spec = find_spec(module_name)
+        except ImportError:
+            spec = None
+        if spec is None or not spec.submodule_search_locations:
+            continue
+
+        for directory in spec.submodule_search_locations:
+            for filename in os.listdir(directory):
+                name, extension = os.path.splitext(filename)
+                if extension == '.py' and name[0] not in '_~':
+                    migrations.add((app_config.label, name))
+
+    return migrations
+
+
+def fingerprint(migrations):
+    """
+    Return a short digest of a set of migrations, to log which state was seen.
+
+    Args:
+        migrations (set): The `(app_label, migration_name)` pairs.
+
+    Returns:
+        str: The first 12 hexadecimal digits of their SHA-256 digest.
+
+    """
+    digest = sha256()
+    for app_label, name in sorted(migrations):
+        digest.update(f'{app_label}.{name}\n'.encode('utf-8'))
+
+    return digest.hexdigest()[:12]
+
+
+class TimedMigrateCommand(MigrateCommand):
+    """
+    TimedMigrateCommand Class
+
+    The `migrate` command, logging the time taken by each migration.
+
+    Attributes:
+        timings (list): The `(migration, seconds)` pair of each migration applied.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = []
+        self.started = None
+
+    def migration_progress_callback(self, action, migration=None, fake=False):
+        if action in ('apply_start', 'unapply_start'):
+            self.started = monotonic()
+        elif action in ('apply_success', 'unapply_success'):
+            elapsed = monotonic() - self.started
+            self.timings.append((str(migration), elapsed))
+            logger.info(
+                '%s %s in %.3fs%s',
+                'Applied' if action == 'apply_success' else 'Unapplied',
+                migration,
+                elapsed,
+                ' (faked)' if fake else '',
+            )
+
+        super().migration_progress_callback(action, migration, fake)
 
 
 class Command(BaseCommand):
@@ -26,16 +141,126 @@ class Command(BaseCommand):
 
     help = 'Run database migrations periodically'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='The database to migrate (default: "default").',
+        )
+        parser.add_argument(
+            '--no-wait',
+            action='store_true',
+            help='Exit at once if another instance is applying the migrations.',
+        )
+
+    @staticmethod
+    def pending(connection, files):
+        """
+        Return the migration files not recorded as applied.
+
+        Args:
+            connection: The connection of the database.
+            files (set): The migration files, from `migration_files`.
+
+        Returns:
+            set: The `(app_label, migration_name)` pairs of the pending migrations;
+            every migration file if the migrations table does not exist yet.
+
+        """
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT app, name FROM django_migrations')
+                applied = set(cursor.fetchall())
+        except DatabaseError:
+            return files
+
+        return files - applied
+
+    @staticmethod
+    def lock(connection, wait):
+        """
+        Take the advisory lock of the migrations, on PostgreSQL.
+
+        Args:
+            connection: The connection of the database.
+            wait (bool): Whether to wait for another instance to release the lock.
+
+        Returns:
+            bool: True if the lock was taken (always on other databases).
+
+        """
+        if connection.vendor != 'postgresql':
+            return True
+
+        function = 'pg_advisory_lock' if wait else 'pg_try_advisory_lock'
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT {function}(%s)', [LOCK_KEY])
+            taken = cursor.fetchone()[0]
+
+        return taken is not False
+
+    @staticmethod
+    def unlock(connection):
+        """
+        Release the advisory lock of the migrations, on PostgreSQL.
+
+        Args:
+            connection: The connection of the database.
+
+        """
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [LOCK_KEY])
+
     def handle(self, *args, **options):
         """
         Handle Method
 
-        The main logic of the management command. Calls the 'migrate' management
-        command to run database migrations.
+        The main logic of the management command. Exits at once when every migration
+        file is applied; otherwise calls the 'migrate' management command under the
+        advisory lock, once the pending migrations are checked again.
 
         Args:
             args: Positional arguments.
             options: Keyword arguments.
 
         """
-        call_command('migrate')
+        database = options['database']
+        connection = connections[database]
+        start, files = monotonic(), migration_files()
+
+        pending = self.pending(connection, files)
+        if not pending:
+            logger.info('No pending migrations (%s)', fingerprint(files))
+            if options['verbosity'] > 1:
+                self.stdout.write(f'No pending migrations ({monotonic() - start:.3f}s)')
+            return
+
+        if not self.lock(connection, wait=not options['no_wait']):
+            self.stdout.write('Another instance is applying the migrations')
+            return
+
+        try:
+            # Another instance may have applied them while this one waited for the lock
+            pending = self.pending(connection, files)
+            if not pending:
+                self.stdout.write('No pending migrations')
+                return
+
+            logger.info('Applying %d pending migrations', len(pending))
+            command = TimedMigrateCommand(stdout=self.stdout, stderr=self.stderr)
+            call_command(command, database=database, verbosity=options['verbosity'])
+        finally:
+            self.unlock(connection)
+
+        logger.info(
+            'Applied %d migrations in %.3fs (%s)',
+            len(command.timings),
+            monotonic() - start,
+            fingerprint(files),
+        )
+
+        if command.timings:
+            self.stdout.write('Slowest migrations:')
+        for migration, elapsed in sorted(command.timings, key=lambda timing: -timing[1])[:5]:
+            self.stdout.write(f'  {migration}: {elapsed:.3f}s')
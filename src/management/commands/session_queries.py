@@ -0,0 +1,113 @@
+"""
+Module: session_queries.py
+
+This module defines a custom Django management command measuring the database queries
+of authenticated requests, per session engine, e.g. before (`backends.db`) and after
+(`src.sessions`) caching sessions.
+
+The requests are sent through Django's test client, as a temporary user, within a
+transaction rolled back at the end, so the database is left unchanged.
+
+Custom Management Command:
+    - Command: Count the database queries of authenticated requests, per session engine.
+
+"""
+
+from statistics import mean
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+DB_ENGINE = 'django.contrib.sessions.backends.db'
+
+
+class Command(BaseCommand):
+    """
+    Command Class
+
+    Custom management command counting the database queries of authenticated requests.
+
+    Attributes:
+        help (str): A brief description of the command for the user.
+
+    """
+
+    help = 'Count the database queries of authenticated requests, per session engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--paths',
+            nargs='+',
+            default=['/api/profile/', '/api/users/'],
+            help='The paths to request (default: /api/profile/ /api/users/).',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=5,
+            help='The number of requests per path (default: 5).',
+        )
+        parser.add_argument(
+            '--engines',
+            nargs='+',
+            default=[DB_ENGINE, settings.SESSION_ENGINE],
+            help='The session engines to compare (default: the database and the setting).',
+        )
+
+    def measure(self, user, engine, paths, count):
+        """
+        Send authenticated requests with a session engine, and print their queries.
+
+        Args:
+            user (User): The user to log in.
+            engine (str): The session engine.
+            paths (list): The paths to request.
+            count (int): The number of requests per path.
+
+        """
+        hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+
+        with override_settings(SESSION_ENGINE=engine, ALLOWED_HOSTS=hosts):
+            client = Client()
+            client.force_login(user)
+
+            for path in paths:
+                totals, sessions = [], []
+                for _ in range(count):
+                    with CaptureQueriesContext(connection) as queries:
+                        client.get(path, HTTP_ACCEPT='application/json')
+
+                    totals.append(len(queries))
+                    sessions.append(
+                        sum('django_session' in query['sql'] for query in queries)
+                    )
+
+                self.stdout.write(
+                    f'{engine:<40} {path:<20} first: {totals[0]:>3} queries '
+                    f'({sessions[0]} session)  then: {mean(totals[1:] or totals):>5.1f} '
+                    f'queries ({mean(sessions[1:] or sessions):.1f} session)'
+                )
+
+    def handle(self, *args, **options):
+        """
+        Handle Method
+
+        Measure the queries of each path with each session engine.
+
+        Args:
+            args: Positional arguments.
+            options: Keyword arguments.
+
+        """
+        with transaction.atomic():
+            user = User.objects.create_user(username=f'session-queries-{uuid4().hex[:8]}')
+
+            for engine in options['engines']:
+                self.measure(user, engine, options['paths'], options['requests'])
+
+            transaction.set_rollback(True)
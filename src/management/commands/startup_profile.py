@@ -0,0 +1,142 @@
+"""
+Module: startup_profile.py
+
+This module defines a custom Django management command profiling the cold start of the
+project: the import time of each module (`python -X importtime`) and the time taken by
+`django.setup()`, then by the import of the URL configuration (loaded by web workers on
+their first request) and of any other module given.
+
+The profile runs in a new interpreter, since every module is already imported in the
+process running the command.
+
+Custom Management Command:
+    - Command: Report the import time per module and the `django.setup()` time.
+
+Functions:
+    - parse_importtime: Parse the output of `python -X importtime`.
+
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PROFILE_SCRIPT = '''
+import json
+import sys
+from importlib import import_module
+from time import perf_counter
+
+start = perf_counter()
+import django
+django.setup()
+timings = [['django.setup()', perf_counter() - start]]
+
+for module in sys.argv[1:]:
+    start = perf_counter()
+    import_module(module)
+    timings.append([f'import {module}', perf_counter() - start])
+
+print(json.dumps(timings))
+'''
+
+
+def parse_importtime(output):
+    """
+    Parse the output of `python -X importtime`.
+
+    Args:
+        output (str): The standard error of the interpreter.
+
+    Returns:
+        list: The `(module, self_us, cumulative_us)` of each module imported, in
+        microseconds, in the order their import completed.
+
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        self_us, cumulative_us, module = line[len('import time:'):].split('|', 2)
+        if self_us.strip().isdigit():
+            imports.append((module.strip(), int(self_us), int(cumulative_us)))
+
+    return imports
+
+
+class Command(BaseCommand):
+    """
+    Command Class
+
+    Custom management command profiling the cold start of the project.
+
+    Attributes:
+        help (str): A brief description of the command for the user.
+
+    """
+
+    help = 'Report the import time per module and the django.setup() time of a cold start'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--import',
+            dest='modules',
+            action='append',
+            help='A module imported after django.setup(), e.g. src.celery (repeatable; '
+            'default: the ROOT_URLCONF setting).',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=25,
+            help='The number of slowest modules reported (default: 25).',
+        )
+        parser.add_argument(
+            '--sort',
+            choices=['self', 'cumulative'],
+            default='cumulative',
+            help='Rank modules by their own import time, or with their imports included.',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Handle Method
+
+        Start a new interpreter importing the settings, running `django.setup()` and
+        importing the modules given, then report its timings and slowest imports.
+
+        Args:
+            args: Positional arguments.
+            options: Keyword arguments.
+
+        """
+        modules = options['modules'] or [settings.ROOT_URLCONF]
+        environment = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROFILE_SCRIPT, *modules],
+            capture_output=True,
+            text=True,
+            env=environment,
+            check=False,
+        )
+        if process.returncode:
+            raise CommandError(f'The profiled interpreter failed:\n{process.stderr}')
+
+        imports = parse_importtime(process.stderr)
+        total = sum(self_us for _module, self_us, _cumulative_us in imports)
+
+        for step, seconds in json.loads(process.stdout.splitlines()[-1]):
+            self.stdout.write(f'{step}: {seconds * 1000:.1f}ms')
+        self.stdout.write(f'{len(imports)} modules imported in {total / 1000:.1f}ms')
+
+        column = 1 if options['sort'] == 'self' else 2
+        slowest = sorted(imports, key=lambda item: item[column], reverse=True)
+        self.stdout.write(f'\n{"self":>9} {"cumulative":>11}  module')
+        for module, self_us, cumulative_us in slowest[:options['limit']]:
+            self.stdout.write(f'{self_us / 1000:7.1f}ms {cumulative_us / 1000:9.1f}ms  {module}')
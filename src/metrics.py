@@ -0,0 +1,857 @@
+"""
+Module: metrics.py
+
+This module records the latency and outcome of Celery tasks, per task name, and of
+requests, per view name, in fixed-bucket histograms: recording a value costs a bisection
+and two additions.
+
+For each task name, it records:
+
+- the queue wait, from the publication of the task to the start of its run (from a
+  `published_at` header added by `before_task_publish`),
+- the run time, from `task_prerun` to `task_postrun`,
+- the outcome (final state) of each run, and the exceptions raised (`task_failure`),
+- the time of the first and last run, to derive the throughput.
+
+Each worker process keeps its own metrics, and writes them every
+`TASK_METRICS_FLUSH_INTERVAL` seconds (after a task) to a JSON file of its own in
+`TASK_METRICS_DIR`, and once more when it exits. `manage.py celery_metrics` merges the
+files of every process, and reports them as a table or in the Prometheus text format.
+
+Requests are recorded by `RequestTimingMiddleware` (see `src.middleware`): for each view
+name, the total time and the time spent in database queries, cache calls and template
+rendering (see `src.timing`), the status codes, and the number of queries and cache
+calls. Each web worker writes them the same way, to `REQUEST_METRICS_DIR`, with the
+counters of its response and resolver caches; the `/metrics` endpoint merges the files
+of every worker.
+
+The files are named by host, process id and process start time, so a reused process id
+never overwrites the file of an exited process. When the files are merged, those of the
+exited processes of this host are folded into a `retired.json` file, and removed: their
+counters keep counting, so merged counters never go backwards, but the directory does
+not grow with every restart.
+
+Classes:
+    - Histogram: A histogram of durations over fixed buckets.
+    - ProcessMetrics: Metrics of a process, written to a file of their own.
+    - TaskMetrics: The histograms and counters of the tasks of a process.
+    - RequestMetrics: The histograms and counters of the requests of a process.
+
+Functions:
+    - render_histogram: Render a histogram in the Prometheus text format.
+    - process_file_name: Return the name of the metrics file of this process.
+    - retire_metrics: Fold the files of the exited processes into the retired file.
+    - load_metrics: Merge the metrics files of every worker process.
+
+Attributes:
+    BUCKETS (tuple): The upper bounds of the buckets, in seconds.
+    RETIRED_FILE (str): The file of the metrics of the exited processes, in each
+        metrics directory.
+    task_metrics (TaskMetrics): The metrics of the tasks of this process.
+    request_metrics (RequestMetrics): The metrics of the requests of this process.
+
+"""
+
+import fcntl
+import json
+from abc import ABC, abstractmethod
+import logging
+import os
+import tempfile
+from bisect import bisect_left
+from glob import glob
+from socket import gethostname
+from threading import Lock
+from time import monotonic, perf_counter, time
+
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_process_shutdown,
+)
+from django.conf import settings
+
+BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, float('inf'),
+)
+
+RETIRED_FILE = 'retired.json'
+
+logger = logging.getLogger(__name__)
+
+_process_files = {}
+
+
+class Histogram:
+    """
+    Histogram Class
+
+    A histogram of durations over the fixed `BUCKETS`, with their count and sum.
+
+    Attributes:
+        counts (list): The number of values per bucket (not cumulative).
+        count (int): The number of values.
+        sum (float): The sum of the values.
+
+    """
+
+    def __init__(self, counts=None, count=0, total=0.0):
+        self.counts = list(counts) if counts is not None else [0] * len(BUCKETS)
+        self.count = count
+        self.sum = total
+
+    def observe(self, value):
+        """
+        Record a value.
+
+        Args:
+            value (float): The duration, in seconds.
+
+        """
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other):
+        """
+        Add the values of another histogram.
+
+        Args:
+            other (Histogram): The histogram to add.
+
+        """
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, fraction):
+        """
+        Estimate a quantile, as the upper bound of the bucket holding it.
+
+        Args:
+            fraction (float): The quantile, e.g. 0.99.
+
+        Returns:
+            float or None: The estimate, in seconds, or None without values.
+
+        """
+        if not self.count:
+            return None
+
+        rank, seen = fraction * self.count, 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return BUCKETS[-1]
+
+    def to_dict(self):
+        """
+        Return the histogram as JSON-serializable data.
+
+        Returns:
+            dict: The `counts`, `count` and `sum` of the histogram.
+
+        """
+        return {'counts': self.counts, 'count': self.count, 'sum': self.sum}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a histogram from the data of `to_dict`.
+
+        Args:
+            data (dict): The data of the histogram.
+
+        Returns:
+            Histogram: The histogram.
+
+        """
+        return cls(data['counts'], data['count'], data['sum'])
+
+
+def render_histogram(name, labels, histogram):
+    """
+    Render a histogram in the Prometheus text format.
+
+    Args:
+        name (str): The name of the metric.
+        labels (str): The labels of the series, e.g. `task="src.tasks.my_task"`.
+        histogram (Histogram): The histogram.
+
+    Returns:
+        list: The lines of the cumulative buckets, the sum and the count.
+
+    """
+    lines, cumulative = [], 0
+
+    for bound, count in zip(BUCKETS, histogram.counts):
+        cumulative += count
+        upper = '+Inf' if bound == float('inf') else repr(bound)
+        lines.append(f'{name}_bucket{{{labels},le="{upper}"}} {cumulative}')
+
+    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+    return lines
+
+
+class ProcessMetrics(ABC):
+    """
+    ProcessMetrics Class
+
+    Metrics of a process, written to a JSON file of its own, and merged with those of
+    the other processes by `load_metrics`. Subclasses define `merge`, `to_dict` and
+    `from_dict`.
+
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._flushed_at = monotonic()
+
+    def flush(self, directory, interval=0):
+        """
+        Write the metrics to the file of this process, at most every `interval` seconds.
+
+        The threads of the process flush one at a time, each through a temporary file of
+        its own, moved in place once written. A failed write is logged, not raised: it
+        must not fail the request or task which triggered it.
+
+        Args:
+            directory (str): The directory of the metrics files.
+            interval (float): The minimum number of seconds between two writes.
+
+        """
+        with self._flush_lock:
+            if monotonic() - self._flushed_at < interval:
+                return
+
+            self._flushed_at = monotonic()
+            path = os.path.join(directory, process_file_name())
+            partial = None
+            try:
+                os.makedirs(directory, exist_ok=True)
+                descriptor, partial = tempfile.mkstemp(
+                    dir=directory, prefix=f'{process_file_name()}.', suffix='.partial'
+                )
+                with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                    json.dump(self.to_dict(), file)
+
+                os.replace(partial, path)
+            except OSError:
+                logger.warning('Could not write the metrics to %s', path, exc_info=True)
+                if partial is not None and os.path.exists(partial):
+                    os.remove(partial)
+
+    @abstractmethod
+    def merge(self, other):
+        """
+        Add the metrics of another process.
+
+        Args:
+            other (ProcessMetrics): The metrics to add, of the same class.
+
+        """
+
+    @abstractmethod
+    def to_dict(self):
+        """
+        Return the metrics as JSON-serializable data.
+
+        Returns:
+            dict: The metrics.
+
+        """
+
+    @classmethod
+    @abstractmethod
+    def from_dict(cls, data):
+        """
+        Create metrics from the data of `to_dict`.
+
+        Args:
+            data (dict): The metrics.
+
+        Returns:
+            ProcessMetrics: The metrics.
+
+        """
+
+    def retire(self):
+        """
+        Return the metrics kept once the process exited: its counters and histograms.
+
+        Returns:
+            ProcessMetrics: The metrics kept.
+
+        """
+        return self
+
+
+class TaskMetrics(ProcessMetrics):
+    """
+    TaskMetrics Class
+
+    The histograms and counters of the tasks run by a process, by task name.
+
+    Attributes:
+        tasks (dict): By task name, the `queue_wait` and `run_time` histograms, the
+            `outcomes` and `exceptions` counters, and the `first` and `last` run times.
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tasks = {}
+        self._started = {}
+
+    def _task(self, name):
+        task = self.tasks.get(name)
+        if task is None:
+            task = self.tasks[name] = {
+                'queue_wait': Histogram(),
+                'run_time': Histogram(),
+                'outcomes': {},
+                'exceptions': {},
+                'first': None,
+                'last': None,
+            }
+
+        return task
+
+    def start(self, task_id, name, published_at):
+        """
+        Record the start of a task run, and its queue wait.
+
+        Args:
+            task_id (str): The id of the task.
+            name (str): The name of the task.
+            published_at (float): The UNIX time the task was published, if known.
+
+        """
+        now = time()
+        with self._lock:
+            task = self._task(name)
+            if published_at is not None:
+                task['queue_wait'].observe(max(0.0, now - published_at))
+
+            task['first'] = task['first'] or now
+            self._started[task_id] = perf_counter()
+
+    def finish(self, task_id, name, state):
+        """
+        Record the end of a task run, its run time and its outcome.
+
+        Args:
+            task_id (str): The id of the task.
+            name (str): The name of the task.
+            state (str): The final state of the run, e.g. SUCCESS or FAILURE.
+
+        """
+        with self._lock:
+            started = self._started.pop(task_id, None)
+            task = self._task(name)
+            if started is not None:
+                task['run_time'].observe(perf_counter() - started)
+
+            task['outcomes'][state] = task['outcomes'].get(state, 0) + 1
+            task['last'] = time()
+
+    def fail(self, name, exception):
+        """
+        Record an exception raised by a task.
+
+        Args:
+            name (str): The name of the task.
+            exception (Exception): The exception.
+
+        """
+        with self._lock:
+            exceptions = self._task(name)['exceptions']
+            key = type(exception).__name__
+            exceptions[key] = exceptions.get(key, 0) + 1
+
+    def merge(self, other):
+        """
+        Add the metrics of another process.
+
+        Args:
+            other (TaskMetrics): The metrics to add.
+
+        """
+        for name, theirs in other.tasks.items():
+            mine = self._task(name)
+            mine['queue_wait'].merge(theirs['queue_wait'])
+            mine['run_time'].merge(theirs['run_time'])
+
+            for counter in ('outcomes', 'exceptions'):
+                for key, count in theirs[counter].items():
+                    mine[counter][key] = mine[counter].get(key, 0) + count
+
+            firsts = [value for value in (mine['first'], theirs['first']) if value]
+            lasts = [value for value in (mine['last'], theirs['last']) if value]
+            mine['first'] = min(firsts, default=None)
+            mine['last'] = max(lasts, default=None)
+
+    def to_dict(self):
+        """
+        Return the metrics as JSON-serializable data.
+
+        Returns:
+            dict: The metrics, by task name.
+
+        """
+        with self._lock:
+            return {
+                name: {
+                    **task,
+                    'queue_wait': task['queue_wait'].to_dict(),
+                    'run_time': task['run_time'].to_dict(),
+                    'outcomes': dict(task['outcomes']),
+                    'exceptions': dict(task['exceptions']),
+                }
+                for name, task in self.tasks.items()
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create metrics from the data of `to_dict`.
+
+        Args:
+            data (dict): The metrics, by task name.
+
+        Returns:
+            TaskMetrics: The metrics.
+
+        """
+        metrics = cls()
+        for name, task in data.items():
+            metrics.tasks[name] = {
+                **task,
+                'queue_wait': Histogram.from_dict(task['queue_wait']),
+                'run_time': Histogram.from_dict(task['run_time']),
+            }
+
+        return metrics
+
+    def render(self):
+        """
+        Render the metrics in the Prometheus text format, one metric family at a time.
+
+        Returns:
+            list: The lines of every metric.
+
+        """
+        tasks = sorted(self.tasks.items())
+        lines = []
+
+        for histogram in ('queue_wait', 'run_time'):
+            name = f'celery_task_{histogram}_seconds'
+            lines.append(f'# TYPE {name} histogram')
+            for task_name, task in tasks:
+                lines += render_histogram(name, f'task="{task_name}"', task[histogram])
+
+        for counter, label in (('outcomes', 'state'), ('exceptions', 'exception')):
+            name = f'celery_task_{counter}_total'
+            lines.append(f'# TYPE {name} counter')
+            for task_name, task in tasks:
+                for key, count in sorted(task[counter].items()):
+                    lines.append(f'{name}{{task="{task_name}",{label}="{key}"}} {count}')
+
+        return lines
+
+
+class RequestMetrics(ProcessMetrics):
+    """
+    RequestMetrics Class
+
+    The histograms and counters of the requests served by a process, by view name, and
+    the counters of its caches.
+
+    Attributes:
+        views (dict): By view name, the `duration`, `db`, `cache` and `template`
+            histograms, the `statuses` counter, and the numbers of `queries` and
+            `cache_calls`.
+        caches (dict): By cache name, its counters (e.g. hits and misses).
+
+    """
+
+    TIMINGS = ('duration', 'db', 'cache', 'template')
+
+    def __init__(self):
+        super().__init__()
+        self.views = {}
+        self.caches = {}
+
+    def _view(self, name):
+        view = self.views.get(name)
+        if view is None:
+            view = self.views[name] = {
+                **{timing: Histogram() for timing in self.TIMINGS},
+                'statuses': {},
+                'queries': 0,
+                'cache_calls': 0,
+            }
+
+        return view
+
+    def record(self, name, status, duration, durations, counts):
+        """
+        Record a request.
+
+        Args:
+            name (str): The name of the view.
+            status (int): The status code of the response.
+            duration (float): The total time of the request, in seconds.
+            durations (dict): The seconds spent in 'db', 'cache' and 'template' calls.
+            counts (dict): The numbers of 'db' and 'cache' calls.
+
+        """
+        with self._lock:
+            view = self._view(name)
+            view['duration'].observe(duration)
+            for timing in self.TIMINGS[1:]:
+                view[timing].observe(durations.get(timing, 0.0))
+
+            view['statuses'][str(status)] = view['statuses'].get(str(status), 0) + 1
+            view['queries'] += counts.get('db', 0)
+            view['cache_calls'] += counts.get('cache', 0)
+
+    def set_cache_stats(self, name, stats):
+        """
+        Set the counters of a cache of this process.
+
+        Args:
+            name (str): The name of the cache.
+            stats (dict): Its counters; only the integers are kept, since ratios cannot
+                be merged across processes.
+
+        """
+        with self._lock:
+            self.caches[name] = {
+                key: value for key, value in stats.items() if isinstance(value, int)
+            }
+
+    def retire(self):
+        # The sizes of the caches are gauges, gone with the process
+        for counters in self.caches.values():
+            for key in [key for key in counters if key.endswith('size')]:
+                del counters[key]
+
+        return self
+
+    def merge(self, other):
+        """
+        Add the metrics of another process.
+
+        Args:
+            other (RequestMetrics): The metrics to add.
+
+        """
+        for name, theirs in other.views.items():
+            mine = self._view(name)
+            for timing in self.TIMINGS:
+                mine[timing].merge(theirs[timing])
+
+            for status, count in theirs['statuses'].items():
+                mine['statuses'][status] = mine['statuses'].get(status, 0) + count
+
+            mine['queries'] += theirs['queries']
+            mine['cache_calls'] += theirs['cache_calls']
+
+        for name, theirs in other.caches.items():
+            mine = self.caches.setdefault(name, {})
+            for key, value in theirs.items():
+                mine[key] = mine.get(key, 0) + value
+
+    def to_dict(self):
+        """
+        Return the metrics as JSON-serializable data.
+
+        Returns:
+            dict: The metrics by view name, and the counters by cache name.
+
+        """
+        with self._lock:
+            views = {
+                name: {
+                    **view,
+                    **{timing: view[timing].to_dict() for timing in self.TIMINGS},
+                    'statuses': dict(view['statuses']),
+                }
+                for name, view in self.views.items()
+            }
+
+            return {'views': views, 'caches': {**self.caches}}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create metrics from the data of `to_dict`.
+
+        Args:
+            data (dict): The metrics by view name, and the counters by cache name.
+
+        Returns:
+            RequestMetrics: The metrics.
+
+        """
+        metrics = cls()
+        for name, view in data['views'].items():
+            metrics.views[name] = {
+                **view,
+                **{timing: Histogram.from_dict(view[timing]) for timing in cls.TIMINGS},
+            }
+        metrics.caches = data['caches']
+
+        return metrics
+
+    def render(self):
+        """
+        Render the metrics in the Prometheus text format, one metric family at a time.
+
+        Returns:
+            list: The lines of every metric.
+
+        """
+        views = sorted(self.views.items())
+        lines = []
+
+        for timing in self.TIMINGS:
+            name = f'http_request_{timing}_seconds'
+            lines.append(f'# TYPE {name} histogram')
+            for view_name, view in views:
+                lines += render_histogram(name, f'view="{view_name}"', view[timing])
+
+        lines.append('# TYPE http_requests_total counter')
+        for view_name, view in views:
+            for status, count in sorted(view['statuses'].items()):
+                lines.append(f'http_requests_total{{view="{view_name}",status="{status}"}} {count}')
+
+        for counter in ('queries', 'cache_calls'):
+            name = f'http_request_{counter}_total'
+            lines.append(f'# TYPE {name} counter')
+            for view_name, view in views:
+                lines.append(f'{name}{{view="{view_name}"}} {view[counter]}')
+
+        keys = sorted({key for counters in self.caches.values() for key in counters})
+        for key in keys:
+            gauge = key.endswith('size')
+            name = f'app_cache_{key}' if gauge else f'app_cache_{key}_total'
+            lines.append(f'# TYPE {name} {"gauge" if gauge else "counter"}')
+            for cache_name, counters in sorted(self.caches.items()):
+                if key in counters:
+                    lines.append(f'{name}{{cache="{cache_name}"}} {counters[key]}')
+
+        return lines
+
+
+def process_file_name():
+    """
+    Return the name of the metrics file of this process.
+
+    Returns:
+        str: `<host>-<process id>-<start time in ms>.json`, the start time being that of
+        the first call in the process (e.g. after a fork).
+
+    """
+    pid = os.getpid()
+    name = _process_files.get(pid)
+    if name is None:
+        name = _process_files[pid] = f'{gethostname()}-{pid}-{int(time() * 1000)}.json'
+
+    return name
+
+
+def _has_exited(name, hostname):
+    # Files named by process id only (from older versions) belong to this host
+    parts = name[:-len('.json')].rsplit('-', 2)
+    if len(parts) == 3:
+        host, pid = parts[0], parts[1]
+    elif len(parts) == 1:
+        host, pid = hostname, parts[0]
+    else:
+        return False
+
+    if host != hostname or not pid.isdigit():
+        return False
+
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+
+    return False
+
+
+def retire_metrics(directory, metrics_class=TaskMetrics):
+    """
+    Fold the files of the exited processes of this host into the retired file, and
+    remove them. The call must hold the lock of the directory.
+
+    The retired file lists the files it includes, so that a file left behind (e.g. by
+    an interruption) is never counted twice.
+
+    Args:
+        directory (str): The directory of the metrics files.
+        metrics_class (type): The class of the metrics, TaskMetrics or RequestMetrics.
+
+    Returns:
+        int: The number of files retired.
+
+    """
+    hostname = gethostname()
+    exited = sorted(
+        name for name in os.listdir(directory)
+        if name.endswith('.json') and name != RETIRED_FILE and _has_exited(name, hostname)
+    )
+    if not exited:
+        return 0
+
+    path = os.path.join(directory, RETIRED_FILE)
+    retired = metrics_class()
+    included = set()
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        retired = metrics_class.from_dict(data['metrics'])
+        included = set(data['files'])
+
+    for name in exited:
+        if name not in included:
+            with open(os.path.join(directory, name), encoding='utf-8') as file:
+                retired.merge(metrics_class.from_dict(json.load(file)).retire())
+
+    with open(f'{path}.partial', 'w', encoding='utf-8') as file:
+        json.dump({'files': exited, 'metrics': retired.to_dict()}, file)
+    os.replace(f'{path}.partial', path)
+
+    for name in exited:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+
+    return len(exited)
+
+
+def load_metrics(directory, metrics_class=TaskMetrics):
+    """
+    Merge the metrics files of every worker process, and of the exited ones, after
+    retiring the files of the processes exited since.
+
+    Args:
+        directory (str): The directory of the metrics files.
+        metrics_class (type): The class of the metrics, TaskMetrics or RequestMetrics.
+
+    Returns:
+        ProcessMetrics: The merged metrics.
+
+    """
+    metrics = metrics_class()
+    if not os.path.isdir(directory):
+        return metrics
+
+    with open(os.path.join(directory, '.lock'), 'a', encoding='utf-8') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        retire_metrics(directory, metrics_class)
+
+        for path in glob(os.path.join(directory, '*.json')):
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+            if os.path.basename(path) == RETIRED_FILE:
+                data = data['metrics']
+            metrics.merge(metrics_class.from_dict(data))
+
+    return metrics
+
+
+task_metrics = TaskMetrics()
+request_metrics = RequestMetrics()
+
+
+# pylint: disable=unused-argument
+@before_task_publish.connect(dispatch_uid='metrics_before_task_publish')
+def stamp_published_at(headers=None, **kwargs):
+    """
+    Add the time of publication to the headers of a task message.
+
+    Args:
+        headers (dict): The headers of the message.
+        kwargs: The other arguments of the signal.
+
+    """
+    if headers is not None:
+        headers.setdefault('published_at', time())
+
+
+# pylint: disable=unused-argument
+@task_prerun.connect(dispatch_uid='metrics_task_prerun')
+def record_task_start(task_id=None, task=None, **kwargs):
+    """
+    Record the start of a task run.
+
+    Args:
+        task_id (str): The id of the task.
+        task (Task): The task.
+        kwargs: The other arguments of the signal.
+
+    """
+    task_metrics.start(task_id, task.name, getattr(task.request, 'published_at', None))
+
+
+# pylint: disable=unused-argument
+@task_postrun.connect(dispatch_uid='metrics_task_postrun')
+def record_task_end(task_id=None, task=None, state=None, **kwargs):
+    """
+    Record the end of a task run, and write the metrics of the process if due.
+
+    Args:
+        task_id (str): The id of the task.
+        task (Task): The task.
+        state (str): The final state of the run.
+        kwargs: The other arguments of the signal.
+
+    """
+    task_metrics.finish(task_id, task.name, state or 'UNKNOWN')
+
+    if settings.TASK_METRICS_DIR:
+        task_metrics.flush(settings.TASK_METRICS_DIR, settings.TASK_METRICS_FLUSH_INTERVAL)
+
+
+# pylint: disable=unused-argument
+@task_failure.connect(dispatch_uid='metrics_task_failure')
+def record_task_failure(sender=None, exception=None, **kwargs):
+    """
+    Record the exception raised by a task.
+
+    Args:
+        sender (Task): The task.
+        exception (Exception): The exception.
+        kwargs: The other arguments of the signal.
+
+    """
+    task_metrics.fail(sender.name, exception)
+
+
+# pylint: disable=unused-argument
+@worker_process_shutdown.connect(dispatch_uid='metrics_worker_process_shutdown')
+def flush_task_metrics(**kwargs):
+    """
+    Write the metrics of the process as it exits.
+
+    Args:
+        kwargs: The arguments of the signal.
+
+    """
+    if settings.TASK_METRICS_DIR and task_metrics.tasks:
+        task_metrics.flush(settings.TASK_METRICS_DIR)
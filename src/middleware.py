@@ -5,14 +5,37 @@ Module: middleware.py
 This module defines a custom middleware class, RedirectMiddleware, for handling invalid URLs
 by redirecting to a default or specific URL.
 
+Paths are checked through the resolver cache of `src.resolvers`. The middleware is not
+in `MIDDLEWARE` by default; the handlers of `src.handlers` resolve every request through
+the same cache either way. It runs natively in both sync (WSGI) and async (ASGI) chains,
+so async views never hop through a thread.
+
+`RequestTimingMiddleware` times each request, and the database, cache and template calls
+made during it (see `src.timing`): it sends the timings in a `Server-Timing` header, and
+records them per view name (see `src.metrics`), for the `/metrics` endpoint.
+
 Classes:
     - RedirectMiddleware: Middleware class for URL resolution and redirection.
+    - RequestTimingMiddleware: Middleware class timing requests per view.
+
+Functions:
+    - flush_request_metrics: Write the request metrics of this process to its file.
+    - server_timing: Format the timings of a request as a `Server-Timing` header.
 
 """
 
-from django.urls import resolve, Resolver404
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.urls import Resolver404
 from django.http import HttpResponseRedirect
 
+from .caching import post_cache
+from .metrics import request_metrics
+from .resolvers import resolver_cache
+from .timing import RequestTimer
+
 
 class RedirectMiddleware:
     """
@@ -26,9 +49,13 @@ class RedirectMiddleware:
     Methods:
         __init__: Initializes the middleware with the get_response function.
         __call__: Handles the middleware logic to check and redirect invalid URLs.
+        __acall__: The same logic, when the chain is async.
 
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response, redirect_url='/api/'):
         """
         Initialize the middleware.
@@ -41,16 +68,19 @@ class RedirectMiddleware:
         self.get_response = get_response
         self.redirect_url = redirect_url
 
-    def __call__(self, request):
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def check(self, request):
         """
-        Handle the middleware logic to check and redirect invalid URLs.
+        Check that the URL of a request resolves.
 
         Args:
             request (HttpRequest): The incoming HTTP request.
 
         Returns:
-            HttpResponseRedirect: Redirects to a default or specific URL if the requested URL
-            cannot be resolved.
+            HttpResponseRedirect or None: Redirects to a default or specific URL if the
+            requested URL cannot be resolved.
 
         """
 
@@ -59,7 +89,7 @@ class RedirectMiddleware:
             path = request.path_info
 
             # Attempt to resolve the URL
-            resolve(path)
+            resolver_cache.resolve(path, getattr(request, 'urlconf', None))
 
         # pylint: disable=W0718
         except Resolver404:
@@ -67,7 +97,191 @@ class RedirectMiddleware:
             # Redirect to a default URL or a specific URL of your choice
             return HttpResponseRedirect(self.redirect_url)
 
+        return None
+
+    def __call__(self, request):
+        """
+        Handle the middleware logic to check and redirect invalid URLs.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            HttpResponseRedirect: Redirects to a default or specific URL if the requested URL
+            cannot be resolved.
+
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        response = self.check(request)
+        if response is not None:
+            return response
+
+        # Continue processing the request/response chain
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        """
+        Handle the middleware logic to check and redirect invalid URLs, asynchronously.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            HttpResponseRedirect: Redirects to a default or specific URL if the requested URL
+            cannot be resolved.
+
+        """
+        response = self.check(request)
+        if response is not None:
+            return response
+
         # Continue processing the request/response chain
-        response = self.get_response(request)
+        return await self.get_response(request)
+
+
+def flush_request_metrics(interval=0):
+    """
+    Write the request metrics of this process, with the counters of its caches, to its
+    file in `REQUEST_METRICS_DIR`, at most every `interval` seconds.
+
+    Args:
+        interval (float): The minimum number of seconds between two writes.
+
+    """
+    if not settings.REQUEST_METRICS_DIR:
+        return
+
+    request_metrics.set_cache_stats('posts', post_cache.stats())
+    request_metrics.set_cache_stats('resolver', resolver_cache.stats())
+    request_metrics.flush(settings.REQUEST_METRICS_DIR, interval)
+
+
+def server_timing(duration, timer):
+    """
+    Format the timings of a request as a `Server-Timing` header.
+
+    Args:
+        duration (float): The total time of the request, in seconds.
+        timer (RequestTimer): The timer of the request.
+
+    Returns:
+        str: The total time, and the time spent per kind of call, in milliseconds.
+
+    """
+    metrics = [f'total;dur={duration * 1000:.1f}']
+
+    for kind, label in (('db', 'queries'), ('cache', 'calls'), ('template', 'renders')):
+        if kind in timer.durations:
+            metrics.append(
+                f'{kind};dur={timer.durations[kind] * 1000:.1f};'
+                f'desc="{timer.counts[kind]} {label}"'
+            )
+
+    return ', '.join(metrics)
+
+
+class RequestTimingMiddleware:
+    """
+    RequestTimingMiddleware Class
+
+    Middleware class timing each request, and the database, cache and template calls
+    made during it. It should come first in `MIDDLEWARE`, so that the other middleware
+    are timed too. The time of a streaming response only covers the start of the stream.
+
+    Attributes:
+        get_response (callable): The next middleware or view function in the request/response chain.
+
+    Methods:
+        __init__: Initializes the middleware with the get_response function.
+        __call__: Times the request, and records its timings.
+        __acall__: The same logic, when the chain is async.
+
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Args:
+            get_response (callable): The next middleware or view function in the
+            request/response chain.
+
+        """
+        self.get_response = get_response
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def record(request, response, timer, duration):
+        """
+        Record the timings of a request, and send them in a `Server-Timing` header.
+
+        Args:
+            request (HttpRequest): The request.
+            response (HttpResponse): The response.
+            timer (RequestTimer): The timer of the request.
+            duration (float): The total time of the request, in seconds.
+
+        Returns:
+            HttpResponse: The response, with its `Server-Timing` header.
+
+        """
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match is not None else '<unresolved>'
+
+        request_metrics.record(
+            view_name, response.status_code, duration, timer.durations, timer.counts
+        )
+        response['Server-Timing'] = server_timing(duration, timer)
+        flush_request_metrics(settings.REQUEST_METRICS_FLUSH_INTERVAL)
 
         return response
+
+    def __call__(self, request):
+        """
+        Time the request, and record its timings.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            HttpResponse: The response, with its `Server-Timing` header.
+
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timer = RequestTimer()
+        token, start = timer.start(), perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            RequestTimer.stop(token)
+
+        return self.record(request, response, timer, perf_counter() - start)
+
+    async def __acall__(self, request):
+        """
+        Time the request, and record its timings, asynchronously.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            HttpResponse: The response, with its `Server-Timing` header.
+
+        """
+        timer = RequestTimer()
+        token, start = timer.start(), perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            RequestTimer.stop(token)
+
+        return self.record(request, response, timer, perf_counter() - start)
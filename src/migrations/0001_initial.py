@@ -12,8 +12,9 @@ Migration Details:
 # pylint: disable=invalid-name
 
 from json import load
+from os.path import dirname, join
 
-from django.db.migrations import Migration, CreateModel
+from django.db.migrations import Migration as BaseMigration, CreateModel
 from django.db.models import BigAutoField, CharField, TextField, DateTimeField
 from django.db.migrations import RunPython
 
@@ -47,7 +48,8 @@ def insert_posts(apps, schema_editor):
     """
     Insert Initial Data
 
-    This function inserts sample data into the 'Post' model.
+    This function inserts sample data into the 'Post' model, in batched INSERT queries.
+    It uses no application code, so that the migration stays as it was written.
 
     Args:
         apps: A registry of applications.
@@ -57,14 +59,16 @@ def insert_posts(apps, schema_editor):
     post_model = apps.get_model('src', 'Post')
 
     # Load sample data from a JSON file
-    with open('./sample_posts.json', encoding='utf-8') as json_file:
+    sample_path = join(dirname(__file__), 'sample_posts.json')
+    with open(sample_path, encoding='utf-8') as json_file:
         sample_data = load(json_file)
 
     # Insert the data into the 'Post' model
-    for data in sample_data:
-        post_model.objects.create(
-            title=data['title'], content=data['content'], pub_date=data['pub_date']
-        )
+    posts = [
+        post_model(title=data['title'], content=data['content'], pub_date=data['pub_date'])
+        for data in sample_data
+    ]
+    post_model.objects.using(schema_editor.connection.alias).bulk_create(posts, batch_size=1000)
 
 
 # pylint: disable=unused-argument
@@ -86,7 +90,7 @@ def reverse_insert_posts(apps, schema_editor):
 
 
 # Available migrations
-class Migrations(Migration):
+class Migration(BaseMigration):
     """
     Migration Class
 
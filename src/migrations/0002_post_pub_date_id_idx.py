@@ -0,0 +1,39 @@
+"""
+Migration File: 0002_post_pub_date_id_idx.py
+
+This migration adds the composite `(pub_date DESC, id DESC)` index used by the keyset
+pagination of the post list.
+
+Migration Details:
+- Creation of the 'post_pub_date_id_idx' index on the 'Post' model.
+
+"""
+# pylint: disable=invalid-name
+
+from django.db.migrations import Migration as BaseMigration, AddIndex
+from django.db.models import Index
+
+
+class Migration(BaseMigration):
+    """
+    Migration Class
+
+    Django migration class for the 'src' app. It adds the composite index on
+    `(pub_date DESC, id DESC)` to the 'Post' model.
+
+    Attributes:
+        dependencies (list): List of dependencies for this migration.
+        operations (list): List of migration operations.
+
+    """
+
+    dependencies = [
+        ('src', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndex(
+            model_name='post',
+            index=Index(fields=['-pub_date', '-id'], name='post_pub_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+"""
+Migration File: 0003_post_search_vector.py
+
+This migration adds the full-text search index of posts.
+
+Migration Details:
+- Addition of the 'search_vector' field to the 'Post' model.
+- Creation of the vendor-specific search index and the triggers keeping it up to date
+  (a GIN-indexed tsvector on PostgreSQL, an FTS5 table on SQLite).
+
+"""
+# pylint: disable=invalid-name
+
+from django.contrib.postgres.search import SearchVectorField
+from django.db.migrations import Migration as BaseMigration, AddField, RunPython
+
+from src.search import install_search_index, uninstall_search_index
+
+
+class Migration(BaseMigration):
+    """
+    Migration Class
+
+    Django migration class for the 'src' app. It adds the 'search_vector' field to the
+    'Post' model and installs the search index.
+
+    Attributes:
+        dependencies (list): List of dependencies for this migration.
+        operations (list): List of migration operations.
+
+    """
+
+    dependencies = [
+        ('src', '0002_post_pub_date_id_idx'),
+    ]
+
+    operations = [
+        AddField(
+            model_name='post',
+            name='search_vector',
+            field=SearchVectorField(editable=False, null=True),
+        ),
+        RunPython(install_search_index, reverse_code=uninstall_search_index),
+    ]
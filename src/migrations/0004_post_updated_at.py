@@ -0,0 +1,49 @@
+"""
+Migration File: 0004_post_updated_at.py
+
+This migration adds the date of the last update of posts, used to validate conditional
+GETs on the post list and detail.
+
+Migration Details:
+- Addition of the indexed 'updated_at' field to the 'Post' model, set to the migration
+  time on existing rows.
+- Restoration of the SQLite search triggers, dropped when SQLite remakes the table
+  (both when applying and when reverting the migration).
+
+"""
+# pylint: disable=invalid-name
+
+from django.db.migrations import Migration as BaseMigration, AddField, RunPython
+from django.db.models import DateTimeField
+from django.utils.timezone import now
+
+from src.search import restore_search_triggers
+
+
+class Migration(BaseMigration):
+    """
+    Migration Class
+
+    Django migration class for the 'src' app. It adds the 'updated_at' field to the
+    'Post' model.
+
+    Attributes:
+        dependencies (list): List of dependencies for this migration.
+        operations (list): List of migration operations.
+
+    """
+
+    dependencies = [
+        ('src', '0003_post_search_vector'),
+    ]
+
+    operations = [
+        RunPython(RunPython.noop, reverse_code=restore_search_triggers),
+        AddField(
+            model_name='post',
+            name='updated_at',
+            field=DateTimeField(auto_now=True, db_index=True, default=now),
+            preserve_default=False,
+        ),
+        RunPython(restore_search_triggers, reverse_code=RunPython.noop),
+    ]
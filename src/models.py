@@ -3,13 +3,16 @@ Module: models.py
 
 This module defines the Post model for storing blog posts in the Django application.
 
-The Post model includes fields for the title of the post, its content, and the publication date.
+The Post model includes fields for the title of the post, its content, the publication date and
+the date of its last update, plus the search vector maintained by the database for full-text
+search (see `src.search`).
 
 Classes:
     - Post: Represents a blog post with title, content, and publication date.
 
 """
-from django.db.models import Model
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models import Model, Index
 from django.db.models import CharField, TextField, DateTimeField
 
 
@@ -23,6 +26,16 @@ class Post(Model):
         title (CharField): The title of the blog post, limited to 200 characters.
         content (TextField): The content of the blog post, allowing for larger text.
         pub_date (DateTimeField): The date and time when the blog post was published.
+        updated_at (DateTimeField): The date and time of the last write to the blog post,
+            indexed to validate conditional GETs cheaply.
+        search_vector (SearchVectorField): The weighted tsvector of the title and content,
+            kept up to date by a database trigger on PostgreSQL and unused elsewhere.
+
+    Indexes:
+        post_pub_date_id_idx: Composite `(pub_date DESC, id DESC)` index backing the
+            keyset pagination of the post list.
+        post_search_vector_idx: GIN index on `search_vector`. It is vendor-specific, so it
+            is created by the search migration rather than declared here.
 
     Methods:
         __str__: Returns a string representation of the post, which is its title.
@@ -32,6 +45,18 @@ class Post(Model):
     title = CharField(max_length=200)
     content = TextField()
     pub_date = DateTimeField('date published')
+    updated_at = DateTimeField(auto_now=True, db_index=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        """
+        Meta:
+            indexes (list): The database indexes declared on the Post table.
+        """
+
+        indexes = [
+            Index(fields=['-pub_date', '-id'], name='post_pub_date_id_idx'),
+        ]
 
     def __str__(self):
         return str(self.title)
@@ -0,0 +1,299 @@
+"""
+Module: pagination.py
+
+This module defines keyset (a.k.a. "seek") pagination classes for the REST API.
+
+Unlike offset pagination, a keyset page is fetched by filtering on the ordering
+columns of the last row already seen, e.g. for an ordering of `('-pub_date', '-id')`:
+
+    WHERE pub_date < :pub_date OR (pub_date = :pub_date AND id < :id)
+    ORDER BY pub_date DESC, id DESC
+    LIMIT :page_size + 1
+
+Backed by a composite index on the ordering columns, every page is a single index
+range scan, so the cost of a page does not grow with its depth, and rows inserted
+concurrently never shift the pages a client is walking through.
+
+Classes:
+    - KeysetPagination: Cursor pagination over a unique, multi-column ordering.
+    - PostKeysetPagination: Keyset pagination for posts on `(pub_date DESC, id DESC)`.
+    - UserKeysetPagination: Keyset pagination for users on their primary key.
+
+"""
+
+from json import dumps, loads
+from datetime import datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+def _reverse_ordering(ordering):
+    """
+    Reverse every field of an ordering tuple.
+
+    Args:
+        ordering (tuple): Ordering such as `('-pub_date', '-id')`.
+
+    Returns:
+        tuple: The reversed ordering, e.g. `('pub_date', 'id')`.
+
+    """
+    return tuple(
+        field[1:] if field.startswith('-') else f'-{field}' for field in ordering
+    )
+
+
+def seek_filter(ordering, values):
+    """
+    Build the filter selecting the rows that come strictly after a position.
+
+    Args:
+        ordering (tuple): The ordering the rows are sorted by. Its last field must be
+            unique (typically the primary key).
+        values (list): The values of the ordering fields at the current position.
+
+    Returns:
+        Q: A lexicographic comparison on the ordering fields, e.g.
+        `Q(pub_date__lt=d) | Q(pub_date=d, id__lt=i)` for `('-pub_date', '-id')`.
+
+    """
+    condition = Q()
+    preceding = {}
+
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+
+        condition |= Q(**preceding, **{f'{name}__{lookup}': value})
+        preceding[name] = value
+
+    return condition
+
+
+class KeysetPagination(CursorPagination):
+    """
+    KeysetPagination Class
+
+    Cursor pagination seeking on every field of a unique, multi-column ordering.
+
+    DRF's `CursorPagination` only seeks on the first ordering field and falls back to
+    an offset to break ties. Here the cursor position stores the values of all the
+    ordering fields, so no offset is ever needed.
+
+    Attributes:
+        ordering (tuple): The ordering to paginate on, unless the queryset is explicitly
+            ordered. Its last field must be unique.
+        page_size (int): The default number of results per page.
+        page_size_query_param (str): The query parameter used to choose a page size.
+        max_page_size (int): The largest page size a client may request.
+
+    """
+
+    ordering = ('-id',)
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Paginate a queryset, fetching one extra row to know if a next page exists.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate.
+            request (Request): The incoming request.
+            view (APIView): The view paginating the queryset.
+
+        Returns:
+            list or None: The rows of the current page, or None if pagination is off.
+
+        """
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+
+        return self.set_page(list(queryset))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Build the sliced queryset fetching the current page.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate.
+            request (Request): The incoming request.
+            view (APIView): The view paginating the queryset.
+
+        Returns:
+            QuerySet or None: The queryset of the page plus one look-ahead row, or None
+            if pagination is off.
+
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if self.cursor is not None and self.cursor.reverse:
+            ordering = _reverse_ordering(ordering)
+
+        queryset = queryset.order_by(*ordering)
+
+        if self.cursor is not None and self.cursor.position is not None:
+            values = self.decode_position(self.cursor.position)
+            try:
+                queryset = queryset.filter(seek_filter(ordering, values))
+            except (DjangoValidationError, TypeError, ValueError) as exc:
+                raise NotFound(self.invalid_cursor_message) from exc
+
+        return queryset[:self.page_size + 1]
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the ordering to paginate on.
+
+        An explicit ordering of the queryset (e.g. search results ordered by rank) takes
+        precedence over the `ordering` attribute of the paginator.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate.
+            request (Request): The incoming request.
+            view (APIView): The view paginating the queryset.
+
+        Returns:
+            tuple: The ordering fields, the last of which must be unique.
+
+        """
+        ordering = queryset.query.order_by
+        if ordering and all(isinstance(field, str) for field in ordering):
+            return tuple(ordering)
+
+        return super().get_ordering(request, queryset, view)
+
+    def set_page(self, results):
+        """
+        Store the fetched rows as the current page.
+
+        Args:
+            results (list): The rows fetched by `get_page_queryset`.
+
+        Returns:
+            list: The rows of the current page, in the pagination ordering.
+
+        """
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if self.cursor is not None and self.cursor.reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        if self.page:
+            self.next_position = self.encode_position(self.page[-1])
+            self.previous_position = self.encode_position(self.page[0])
+        else:
+            self.next_position = self.previous_position = None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not (self.has_next and self.next_position):
+            return None
+
+        cursor = Cursor(offset=0, reverse=False, position=self.next_position)
+        return self.encode_cursor(cursor)
+
+    def get_previous_link(self):
+        if not (self.has_previous and self.previous_position):
+            return None
+
+        cursor = Cursor(offset=0, reverse=True, position=self.previous_position)
+        return self.encode_cursor(cursor)
+
+    def encode_position(self, item):
+        """
+        Encode the ordering values of a row as a cursor position.
+
+        Args:
+            item (Model or dict): A row of the current page.
+
+        Returns:
+            str: The JSON-encoded list of the row's ordering values.
+
+        """
+        values = []
+
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = item[name] if isinstance(item, dict) else getattr(item, name)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            values.append(value)
+
+        return dumps(values, separators=(',', ':'))
+
+    def decode_position(self, position):
+        """
+        Decode a cursor position back into ordering values.
+
+        Args:
+            position (str): The position stored in the cursor.
+
+        Returns:
+            list: The ordering values of the position.
+
+        Raises:
+            NotFound: If the position does not match the ordering.
+
+        """
+        try:
+            values = loads(position)
+        except ValueError as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return values
+
+
+class PostKeysetPagination(KeysetPagination):
+    """
+    PostKeysetPagination Class
+
+    Keyset pagination for posts, newest first. It is backed by the composite
+    `(pub_date DESC, id DESC)` index declared on the Post model.
+
+    Attributes:
+        ordering (tuple): The ordering to paginate on.
+
+    """
+
+    ordering = ('-pub_date', '-id')
+
+
+class UserKeysetPagination(KeysetPagination):
+    """
+    UserKeysetPagination Class
+
+    Keyset pagination for users, oldest first, on the primary key index.
+
+    Attributes:
+        ordering (tuple): The ordering to paginate on.
+
+    """
+
+    ordering = ('id',)
@@ -0,0 +1,80 @@
+"""
+Module: parsers.py
+
+This module defines the parsers of the REST API, chosen by the `Content-Type` header of
+the request.
+
+Classes:
+    - ORJSONParser: Parses JSON with orjson.
+    - MessagePackParser: Parses MessagePack.
+
+"""
+
+import msgpack
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .renderers import MessagePackRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    ORJSONParser Class
+
+    Parses `application/json` with orjson, which decodes in C. Like DRF's `JSONParser`,
+    it rejects the non-standard `NaN` and `Infinity` constants.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Parse a JSON request body.
+
+        Args:
+            stream: The request body.
+            media_type (str): The media type of the request.
+            parser_context (dict): The context of the view.
+
+        Returns:
+            The parsed data.
+
+        Raises:
+            ParseError: If the body is not valid UTF-8 encoded JSON.
+
+        """
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}') from exc
+
+
+class MessagePackParser(BaseParser):
+    """
+    MessagePackParser Class
+
+    Parses `application/msgpack` request bodies, e.g. bulk writes of posts.
+    """
+
+    media_type = MessagePackRenderer.media_type
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Parse a MessagePack request body.
+
+        Args:
+            stream: The request body.
+            media_type (str): The media type of the request.
+            parser_context (dict): The context of the view.
+
+        Returns:
+            The parsed data.
+
+        Raises:
+            ParseError: If the body is not valid MessagePack.
+
+        """
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (TypeError, ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}') from exc
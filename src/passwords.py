@@ -0,0 +1,356 @@
+"""
+Module: passwords.py
+
+This module checks passwords against a list of common (or breached) passwords, loaded
+once per process instead of once per validation.
+
+Two representations are supported:
+
+- Django's list of 20,000 common passwords, decompressed once into a frozenset.
+- A much larger list (millions of breached passwords), as a file of sorted, lowercased,
+  newline-separated passwords built by `manage.py build_common_passwords` and named by
+  the `COMMON_PASSWORDS_FILE` setting. The file is memory-mapped read-only and searched
+  by binary search, so it costs no startup time, and every worker shares the same pages
+  of the OS page cache instead of holding its own copy.
+
+Passwords are compared lowercased and stripped, like Django's `CommonPasswordValidator`.
+
+It also defines the password validation pipeline, running each of the
+`AUTH_PASSWORD_VALIDATORS` once, cheapest first, and timing each of them.
+
+Classes:
+    - SortedPasswordFile: A memory-mapped file of sorted passwords, searched by bisection.
+    - SharedCommonPasswordValidator: `CommonPasswordValidator` using the shared list.
+    - PasswordPipeline: Runs password validators once each, cheapest first, timed.
+
+Functions:
+    - normalize: Normalize a password the way the lists are.
+    - load_django_passwords: Load Django's list of common passwords.
+    - get_common_passwords: Return the common passwords of the process, loading them once.
+    - is_common_password: Return whether a password is common.
+    - get_password_pipeline: Return the pipeline of the `AUTH_PASSWORD_VALIDATORS`.
+    - clear_password_caches: Forget the loaded list and pipeline when settings change.
+
+Attributes:
+    RULE_COSTS (dict): The relative cost of the known validators, by class name.
+
+"""
+
+import gzip
+import logging
+import mmap
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import password_validation
+from django.contrib.auth.password_validation import CommonPasswordValidator
+from django.core.exceptions import ValidationError
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext as _
+
+logger = logging.getLogger(__name__)
+
+DJANGO_PASSWORD_LIST_PATH = (
+    Path(password_validation.__file__).resolve().parent / 'common-passwords.txt.gz'
+)
+
+# Checks of the length or characters first, set lookups next, similarity (difflib) last
+RULE_COSTS = {
+    'MinimumLengthValidator': 0,
+    'NumericPasswordValidator': 1,
+    'CommonPasswordValidator': 2,
+    'SharedCommonPasswordValidator': 2,
+    'UserAttributeSimilarityValidator': 3,
+}
+DEFAULT_RULE_COST = 10
+
+
+def normalize(password):
+    """
+    Normalize a password the way the lists are.
+
+    Args:
+        password (str): The password.
+
+    Returns:
+        str: The lowercased, stripped password.
+
+    """
+    return password.lower().strip()
+
+
+class SortedPasswordFile:
+    """
+    SortedPasswordFile Class
+
+    A file of unique, normalized passwords, one per line, sorted by their UTF-8 bytes,
+    memory-mapped read-only and searched by binary search over its lines: a lookup
+    touches O(log n) pages, and no index is built in memory.
+
+    Attributes:
+        path (Path): The path of the file.
+
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+        with open(self.path, 'rb') as file:
+            if self.path.stat().st_size:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._mmap = b''
+
+    def __contains__(self, password):
+        key = password.encode('utf-8')
+        data = self._mmap
+        low, high = 0, len(data)
+
+        # `low` and `high` always fall on line starts (or the end of the file)
+        while low < high:
+            middle = (low + high) // 2
+            start = data.rfind(b'\n', 0, middle) + 1
+            end = data.find(b'\n', start)
+            if end == -1:
+                end = len(data)
+
+            line = data[start:end]
+            if line == key:
+                return True
+
+            if line < key:
+                low = end + 1
+            else:
+                high = start
+
+        return False
+
+
+def load_django_passwords(path=DJANGO_PASSWORD_LIST_PATH):
+    """
+    Load Django's list of common passwords.
+
+    Args:
+        path (Path): The path of the gzipped list.
+
+    Returns:
+        frozenset: The common passwords.
+
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        return frozenset(line.strip() for line in file)
+
+
+@lru_cache(maxsize=None)
+def get_common_passwords():
+    """
+    Return the common passwords of the process, loading them on the first call.
+
+    The list is loaded by the first password validated in each worker process, and
+    kept for the life of the process.
+
+    Returns:
+        SortedPasswordFile or frozenset: The file of `COMMON_PASSWORDS_FILE` if set,
+        Django's list otherwise.
+
+    """
+    if settings.COMMON_PASSWORDS_FILE:
+        return SortedPasswordFile(settings.COMMON_PASSWORDS_FILE)
+
+    return load_django_passwords()
+
+
+def is_common_password(password):
+    """
+    Return whether a password is common.
+
+    Args:
+        password (str): The password.
+
+    Returns:
+        bool: True if the password is in the list of common passwords.
+
+    """
+    return normalize(password) in get_common_passwords()
+
+
+class SharedCommonPasswordValidator(CommonPasswordValidator):
+    """
+    SharedCommonPasswordValidator Class
+
+    `CommonPasswordValidator` checking passwords against the list of the process
+    (see `get_common_passwords`), instead of loading its own.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self):
+        self.passwords = get_common_passwords()
+
+    def validate(self, password, user=None):
+        """
+        Validate that a password is not common.
+
+        Args:
+            password (str): The password.
+            user (User): The user of the password, unused.
+
+        Raises:
+            ValidationError: If the password is common.
+
+        """
+        if normalize(password) in self.passwords:
+            raise ValidationError(
+                _('This password is too common.'),
+                code='password_too_common',
+            )
+
+
+class PasswordPipeline:
+    """
+    PasswordPipeline Class
+
+    Runs password validators once each, ordered by cost: a validator may declare its
+    own `cost` attribute, otherwise `RULE_COSTS` is used, and unknown validators run
+    last, in their configured order. The time taken by every rule is logged at DEBUG
+    level and summed in `stats()`.
+
+    Attributes:
+        rules (list): The validators, cheapest first.
+        fail_fast (bool): Whether to stop at the first failing rule, rather than
+            collecting the errors of every rule.
+
+    """
+
+    def __init__(self, validators, fail_fast=False):
+        self.rules = sorted(validators, key=self.cost)
+        self.fail_fast = fail_fast
+        self._stats = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def cost(validator):
+        """
+        Return the relative cost of a validator.
+
+        Args:
+            validator: The password validator.
+
+        Returns:
+            int: The cost of the validator.
+
+        """
+        name = type(validator).__name__
+        return getattr(validator, 'cost', RULE_COSTS.get(name, DEFAULT_RULE_COST))
+
+    def run(self, password, user=None, fail_fast=None):
+        """
+        Run the rules on a password.
+
+        Args:
+            password (str): The password.
+            user (User): The user of the password, for the similarity checks.
+            fail_fast (bool): Overrides `fail_fast` for this run.
+
+        Returns:
+            tuple: The list of `ValidationError`, and the list of `(rule, seconds)` of
+            the rules run.
+
+        """
+        if fail_fast is None:
+            fail_fast = self.fail_fast
+
+        errors, timings = [], []
+        for rule in self.rules:
+            name = type(rule).__name__
+            start = perf_counter()
+            try:
+                rule.validate(password, user)
+            except ValidationError as error:
+                errors.append(error)
+            finally:
+                elapsed = perf_counter() - start
+                timings.append((name, elapsed))
+                self._record(name, elapsed)
+
+            if errors and fail_fast:
+                break
+
+        logger.debug(
+            'Password validation: %s',
+            ', '.join(f'{name} {elapsed * 1000:.3f} ms' for name, elapsed in timings),
+        )
+
+        return errors, timings
+
+    def validate(self, password, user=None, fail_fast=None):
+        """
+        Validate a password, like `password_validation.validate_password`.
+
+        Args:
+            password (str): The password.
+            user (User): The user of the password, for the similarity checks.
+            fail_fast (bool): Overrides `fail_fast` for this run.
+
+        Raises:
+            ValidationError: The errors of the failing rules.
+
+        """
+        errors, _timings = self.run(password, user, fail_fast)
+        if errors:
+            raise ValidationError(errors)
+
+    def _record(self, name, elapsed):
+        with self._lock:
+            calls, seconds = self._stats.get(name, (0, 0.0))
+            self._stats[name] = (calls + 1, seconds + elapsed)
+
+    def stats(self):
+        """
+        Return the number of runs and the time spent per rule, since startup.
+
+        Returns:
+            dict: `{'calls': int, 'seconds': float}` by validator class name.
+
+        """
+        with self._lock:
+            return {
+                name: {'calls': calls, 'seconds': seconds}
+                for name, (calls, seconds) in self._stats.items()
+            }
+
+
+@lru_cache(maxsize=None)
+def get_password_pipeline():
+    """
+    Return the pipeline of the `AUTH_PASSWORD_VALIDATORS`, built on the first call.
+
+    Returns:
+        PasswordPipeline: The pipeline, failing fast if `PASSWORD_VALIDATION_FAIL_FAST`.
+
+    """
+    return PasswordPipeline(
+        password_validation.get_default_password_validators(),
+        fail_fast=settings.PASSWORD_VALIDATION_FAIL_FAST,
+    )
+
+
+# pylint: disable=unused-argument
+@receiver(setting_changed)
+def clear_password_caches(setting, **kwargs):
+    """
+    Forget the loaded list and pipeline when their settings change, e.g. in tests.
+
+    Args:
+        setting (str): The name of the changed setting.
+        kwargs: The other arguments of the signal.
+
+    """
+    if setting == 'COMMON_PASSWORDS_FILE':
+        get_common_passwords.cache_clear()
+
+    if setting in ('AUTH_PASSWORD_VALIDATORS', 'PASSWORD_VALIDATION_FAIL_FAST'):
+        get_password_pipeline.cache_clear()
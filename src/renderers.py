@@ -0,0 +1,156 @@
+"""
+Module: renderers.py
+
+This module defines the renderers of the REST API, chosen by content negotiation on
+the `Accept` header (or the `?format=` query parameter).
+
+Classes:
+    - ORJSONRenderer: Renders JSON with orjson, natively handling datetimes and Decimals.
+    - MessagePackRenderer: Renders MessagePack, a compact binary equivalent of JSON.
+    - EventStreamRenderer: Selects server-sent events, for views streaming them.
+
+Functions:
+    - encode_default: Encode the values orjson and msgpack do not handle natively.
+
+"""
+
+from decimal import Decimal
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_encoder = JSONEncoder()
+
+
+def encode_default(value):
+    """
+    Encode the values orjson and msgpack do not handle natively.
+
+    Decimals are encoded as strings, or as floats if `COERCE_DECIMAL_TO_STRING` is off,
+    and other values (lazy translations, timedeltas, querysets, generators...) as DRF's
+    JSON encoder does.
+
+    Args:
+        value: The value to encode.
+
+    Returns:
+        The primitive encoding of the value.
+
+    Raises:
+        TypeError: If the value cannot be encoded.
+
+    """
+    if isinstance(value, Decimal):
+        return str(value) if api_settings.COERCE_DECIMAL_TO_STRING else float(value)
+
+    return _encoder.default(value)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ORJSONRenderer Class
+
+    Renders `application/json` with orjson, which encodes in C and natively handles
+    datetimes (with a `Z` suffix in UTC), dates, times and UUIDs, the output being the
+    same as DRF's `JSONRenderer` for the primitives returned by serializers.
+    An `indent` parameter of the accepted media type pretty-prints with 2 spaces.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render data into JSON.
+
+        Args:
+            data: The data to render.
+            accepted_media_type (str): The media type accepted by the client.
+            renderer_context (dict): The context of the view.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON.
+
+        """
+        if data is None:
+            return b''
+
+        options = ORJSON_OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        content = orjson.dumps(data, default=encode_default, option=options)
+
+        # Like DRF, escape the line separators that are invalid in JavaScript strings
+        if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+            content = content.replace(b'\xe2\x80\xa8', b'\\u2028')
+            content = content.replace(b'\xe2\x80\xa9', b'\\u2029')
+
+        return content
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePackRenderer Class
+
+    Renders `application/msgpack`, for service-to-service consumers: the payloads are
+    smaller and cheaper to decode than JSON, with the same structure.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render data into MessagePack.
+
+        Args:
+            data: The data to render.
+            accepted_media_type (str): The media type accepted by the client.
+            renderer_context (dict): The context of the view.
+
+        Returns:
+            bytes: The MessagePack encoded data.
+
+        """
+        if data is None:
+            return b''
+
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    EventStreamRenderer Class
+
+    Selects `text/event-stream` for views streaming server-sent events themselves (with
+    a `StreamingHttpResponse`). Only the responses of the API itself, such as errors,
+    are rendered, as a single `error` event.
+    """
+
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render data into an `error` event.
+
+        Args:
+            data: The data to render.
+            accepted_media_type (str): The media type accepted by the client.
+            renderer_context (dict): The context of the view.
+
+        Returns:
+            bytes: The event.
+
+        """
+        if data is None:
+            return b''
+
+        return b'event: error\ndata: ' + orjson.dumps(data, default=encode_default) + b'\n\n'
@@ -0,0 +1,185 @@
+"""
+Module: resolvers.py
+
+This module caches the resolution of URL paths to views.
+
+Resolving a path walks the URL patterns in order, matching regular expressions until
+one matches, on every request. Results are now kept in a bounded LRU cache, keyed by
+URLconf and path, used by the handlers of `src.handlers` (and by `RedirectMiddleware`,
+when installed, to check paths).
+
+The matches are kept in a segmented LRU: a path is first admitted into a small
+probationary segment, and only promoted to the protected segment when requested again.
+A flood of valid but unique paths (e.g. `/api/posts/<random id>/`) thus only ever
+evicts other new paths, never the hot ones. Paths that do not resolve are kept in a
+separate, smaller LRU cache, so that random 404 probes never evict real traffic either.
+
+Classes:
+    - ResolverCache: A bounded LRU cache of URL resolutions, with hit/eviction counters.
+
+Attributes:
+    resolver_cache (ResolverCache): The resolver cache of the process, sized by the
+        `RESOLVER_CACHE_SIZE` and `RESOLVER_NEGATIVE_CACHE_SIZE` settings.
+
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import Resolver404, get_resolver, get_urlconf
+
+
+class ResolverCache:
+    """
+    ResolverCache Class
+
+    A bounded, segmented LRU cache of URL resolutions, keyed by `(urlconf, path)`.
+
+    New matches enter a probationary LRU segment of `probation_size` entries, and move
+    to the protected segment when hit; the least recently used protected matches are
+    demoted back to probation. Matches are shared by every request resolving the same
+    path, so they must not be mutated (Django passes views a copy of their `kwargs`).
+    Paths raising `Resolver404` are kept in a separate LRU cache of `negative_size`
+    entries.
+
+    Attributes:
+        size (int): The maximum number of matches kept, in both segments.
+        probation_size (int): The maximum number of matches kept on probation (by
+            default a quarter of `size`).
+        negative_size (int): The maximum number of unresolved paths kept.
+        hits (int): The number of resolutions served from the cache.
+        misses (int): The number of resolutions computed.
+        evictions (int): The number of matches evicted to make room for others.
+        negative_evictions (int): The number of unresolved paths evicted.
+
+    """
+
+    def __init__(self, size=1024, negative_size=256, probation_size=None):
+        self.size = size
+        self.probation_size = probation_size or max(1, size // 4)
+        self.negative_size = negative_size
+        self._matches = OrderedDict()
+        self._probation = OrderedDict()
+        self._not_found = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.negative_evictions = 0
+
+    def resolve(self, path, urlconf=None):
+        """
+        Resolve a path to a view, from the cache if possible.
+
+        Args:
+            path (str): The path to resolve, e.g. `request.path_info`.
+            urlconf (str): The URLconf to resolve against, by default that of the
+                current thread (the `ROOT_URLCONF` setting).
+
+        Returns:
+            ResolverMatch: The match of the path.
+
+        Raises:
+            Resolver404: If the path does not resolve.
+
+        """
+        urlconf = urlconf or get_urlconf() or settings.ROOT_URLCONF
+        key = (urlconf, path)
+
+        with self._lock:
+            match = self._matches.get(key)
+            if match is not None:
+                self._matches.move_to_end(key)
+                self.hits += 1
+                return match
+
+            match = self._probation.pop(key, None)
+            if match is not None:
+                self._promote(key, match)
+                self.hits += 1
+                return match
+
+            if key in self._not_found:
+                self._not_found.move_to_end(key)
+                self.hits += 1
+                raise Resolver404({'path': path})
+
+            self.misses += 1
+
+        try:
+            match = get_resolver(urlconf).resolve(path)
+        except Resolver404:
+            with self._lock:
+                self._not_found[key] = True
+                if len(self._not_found) > self.negative_size:
+                    self._not_found.popitem(last=False)
+                    self.negative_evictions += 1
+            raise
+
+        with self._lock:
+            self._admit(key, match)
+
+        return match
+
+    def _admit(self, key, match):
+        self._probation[key] = match
+        if len(self._probation) > self.probation_size:
+            self._probation.popitem(last=False)
+            self.evictions += 1
+
+    def _promote(self, key, match):
+        self._matches[key] = match
+        if len(self._matches) > max(1, self.size - self.probation_size):
+            self._admit(*self._matches.popitem(last=False))
+
+    def clear(self):
+        """
+        Forget every cached resolution, e.g. when the URL patterns change.
+        """
+        with self._lock:
+            self._matches.clear()
+            self._probation.clear()
+            self._not_found.clear()
+
+    def stats(self):
+        """
+        Return the counters of the cache.
+
+        Returns:
+            dict: The numbers of hits, misses and evictions, and the number of entries.
+
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'negative_evictions': self.negative_evictions,
+                'size': len(self._matches) + len(self._probation),
+                'probation_size': len(self._probation),
+                'negative_size': len(self._not_found),
+            }
+
+
+resolver_cache = ResolverCache(
+    size=settings.RESOLVER_CACHE_SIZE,
+    negative_size=settings.RESOLVER_NEGATIVE_CACHE_SIZE,
+)
+
+
+# pylint: disable=unused-argument
+@receiver(setting_changed)
+def clear_resolver_cache(setting, **kwargs):
+    """
+    Forget the cached resolutions when the URLconf changes, e.g. in tests.
+
+    Args:
+        setting (str): The name of the changed setting.
+        kwargs: The other arguments of the signal.
+
+    """
+    if setting == 'ROOT_URLCONF':
+        resolver_cache.clear()
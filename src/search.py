@@ -0,0 +1,232 @@
+"""
+Module: search.py
+
+This module implements the full-text search on the title and content of posts.
+
+On PostgreSQL, posts carry a stored `search_vector` tsvector column, weighted 'A' for
+the title and 'B' for the content. A trigger keeps it up to date on every write, so
+bulk inserts and `COPY` are covered too, and a GIN index serves the `@@` matches.
+
+On SQLite (e.g. the database of the tests), an external-content FTS5 table mirrors the
+title and content of posts, kept in sync by triggers, and `bm25` ranks the matches.
+
+Functions:
+    - search_posts: Filter a post queryset by a search query, best matches first.
+    - fts5_query: Turn free text into a safe FTS5 query.
+    - install_search_index: Create the search index, its triggers and backfill it.
+    - uninstall_search_index: Drop the search index and its triggers.
+    - restore_search_triggers: Recreate the SQLite triggers after the post table is remade.
+
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'english'
+POST_TABLE = 'src_post'
+FTS_TABLE = 'src_post_fts'
+
+POSTGRESQL_INSTALL = [
+    f"""
+    CREATE OR REPLACE FUNCTION {POST_TABLE}_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.content, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    f'DROP TRIGGER IF EXISTS {POST_TABLE}_search_vector_trigger ON {POST_TABLE}',
+    f"""
+    CREATE TRIGGER {POST_TABLE}_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content ON {POST_TABLE}
+    FOR EACH ROW EXECUTE PROCEDURE {POST_TABLE}_search_vector_update()
+    """,
+    f'UPDATE {POST_TABLE} SET title = title',
+    f"""
+    CREATE INDEX IF NOT EXISTS post_search_vector_idx
+    ON {POST_TABLE} USING gin (search_vector)
+    """,
+]
+
+POSTGRESQL_UNINSTALL = [
+    'DROP INDEX IF EXISTS post_search_vector_idx',
+    f'DROP TRIGGER IF EXISTS {POST_TABLE}_search_vector_trigger ON {POST_TABLE}',
+    f'DROP FUNCTION IF EXISTS {POST_TABLE}_search_vector_update()',
+]
+
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {POST_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {POST_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF title, content ON {POST_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE} (rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+    USING fts5(title, content, content='{POST_TABLE}', content_rowid='id')
+    """,
+    *SQLITE_TRIGGERS,
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+INSTALL_STATEMENTS = {
+    'postgresql': POSTGRESQL_INSTALL,
+    'sqlite': SQLITE_INSTALL,
+}
+
+UNINSTALL_STATEMENTS = {
+    'postgresql': POSTGRESQL_UNINSTALL,
+    'sqlite': SQLITE_UNINSTALL,
+}
+
+
+def fts5_query(text):
+    """
+    Turn free text into a safe FTS5 query.
+
+    Every whitespace-separated term is quoted, so that FTS5 operators and column
+    filters typed by users are matched literally instead of raising syntax errors.
+
+    Args:
+        text (str): The text typed by the user.
+
+    Returns:
+        str: An FTS5 query matching rows containing all the terms.
+
+    """
+    terms = text.split()
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_posts(queryset, text):
+    """
+    Filter a post queryset by a search query, best matches first.
+
+    The returned queryset is annotated with a `rank` (higher is better) and ordered
+    by `('-rank', '-id')`, so it can be keyset-paginated like the post list.
+
+    Args:
+        queryset (QuerySet): The post queryset to search in.
+        text (str): The text typed by the user.
+
+    Returns:
+        QuerySet: The matching posts, annotated with their rank.
+
+    """
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'postgresql':
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+        rank = Cast(SearchRank(F('search_vector'), query), FloatField())
+        queryset = queryset.filter(search_vector=query).annotate(rank=rank)
+
+    elif vendor == 'sqlite':
+        match = fts5_query(text)
+        matches = RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,)
+        )
+        rank = RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, 2.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {POST_TABLE}.id',
+            (match,),
+            output_field=FloatField(),
+        )
+        queryset = queryset.filter(id__in=matches).annotate(rank=rank)
+
+    else:
+        condition = Q(title__icontains=text) | Q(content__icontains=text)
+        queryset = queryset.filter(condition).annotate(
+            rank=Value(0.0, output_field=FloatField())
+        )
+
+    return queryset.order_by('-rank', '-id')
+
+
+def _execute(schema_editor, statements):
+    """
+    Execute the statements of the schema editor's database vendor.
+
+    Args:
+        schema_editor (BaseDatabaseSchemaEditor): The schema editor of a migration.
+        statements (dict): Lists of SQL statements, keyed by database vendor.
+
+    """
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+# pylint: disable=unused-argument
+def install_search_index(apps, schema_editor):
+    """
+    Create the search index of posts, its triggers and backfill it.
+
+    Meant to be run through `RunPython`.
+
+    Args:
+        apps: A registry of applications.
+        schema_editor: The schema editor used for the migration.
+
+    """
+    _execute(schema_editor, INSTALL_STATEMENTS)
+
+
+# pylint: disable=unused-argument
+def uninstall_search_index(apps, schema_editor):
+    """
+    Drop the search index of posts and its triggers.
+
+    Args:
+        apps: A registry of applications.
+        schema_editor: The schema editor used for the migration.
+
+    """
+    _execute(schema_editor, UNINSTALL_STATEMENTS)
+
+
+# pylint: disable=unused-argument
+def restore_search_triggers(apps, schema_editor):
+    """
+    Recreate the SQLite triggers syncing the FTS5 table, and rebuild it.
+
+    SQLite cannot alter most columns in place, so Django remakes the post table, which
+    drops its triggers. Migrations doing so must run this function afterwards.
+
+    Args:
+        apps: A registry of applications.
+        schema_editor: The schema editor used for the migration.
+
+    """
+    _execute(
+        schema_editor,
+        {'sqlite': [*SQLITE_TRIGGERS, f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')"]},
+    )
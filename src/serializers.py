@@ -5,25 +5,91 @@ This module defines serializers for the Django application, including serializer
 User and Post models.
 
 Classes:
+    - PrefixHyperlinkedIdentityField: Hyperlinks rows from a URL prefix reversed once.
     - CustomUserSerializer: Serializes User model data for API representation.
+    - SparseFieldsMixin: Trims the fields of a serializer to those selected by the request.
+    - BulkPostListSerializer: Creates and updates lists of posts in batched queries.
     - PostSerializer: Serializes Post model data for API representation.
+    - PubDateRangeSerializer: Validates a publication date range filter on posts.
+    - BulkDeleteSerializer: Validates the selection of posts to delete in bulk.
+    - UsernameAvailabilitySerializer: Validates a batch of usernames to check.
+    - TaskBatchSerializer: Validates a batch of argument sets of `my_task`.
+    - BatchResultsSerializer: Validates a long poll of the results of a batch.
 
 """
 # pylint: disable=R0903
 
+from urllib.parse import quote
+
+from django.conf import settings
 from django.contrib.auth.models import User
-from rest_framework.serializers import HyperlinkedModelSerializer, ModelSerializer
+from django.utils import timezone
+from django.utils.http import RFC3986_SUBDELIMS
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import (
+    CharField,
+    DateTimeField,
+    FloatField,
+    HyperlinkedIdentityField,
+    HyperlinkedModelSerializer,
+    IntegerField,
+    ListField,
+    ListSerializer,
+    ModelSerializer,
+    RegexField,
+    Serializer,
+    ValidationError,
+)
 
 from .models import Post
 
 
+class PrefixHyperlinkedIdentityField(HyperlinkedIdentityField):
+    """
+    PrefixHyperlinkedIdentityField Class
+
+    Hyperlink to the detail of each row, built by formatting the lookup value into a URL
+    reversed once per request, instead of calling `reverse()` for every row of a list.
+
+    The URL is reversed with a placeholder lookup value, which is then replaced by the
+    (quoted) lookup value of each row. Format suffixes fall back to a regular reverse.
+    """
+
+    placeholder = 'lookup-placeholder'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._affixes = (None, '', '')
+
+    def get_url(self, obj, view_name, request, format):
+        # pylint: disable=redefined-builtin
+        if format:
+            return super().get_url(obj, view_name, request, format)
+
+        if hasattr(obj, 'pk') and obj.pk in (None, ''):
+            return None
+
+        cached_request, prefix, suffix = self._affixes
+        if cached_request is not request:
+            kwargs = {self.lookup_url_kwarg: self.placeholder}
+            url = self.reverse(view_name, kwargs=kwargs, request=request, format=None)
+            prefix, _, suffix = url.partition(self.placeholder)
+            self._affixes = (request, prefix, suffix)
+
+        lookup_value = quote(str(getattr(obj, self.lookup_field)), safe=RFC3986_SUBDELIMS + '/~:@')
+        return f'{prefix}{lookup_value}{suffix}'
+
+
 class CustomUserSerializer(HyperlinkedModelSerializer):
     """
     CustomUserSerializer Class
 
-    Serializes User model data for API representation.
+    Serializes User model data for API representation. The `url` of each user is built
+    from a prefix reversed once per request (see `PrefixHyperlinkedIdentityField`).
     """
 
+    serializer_url_field = PrefixHyperlinkedIdentityField
+
     class Meta:
         """
         Meta:
@@ -41,20 +107,331 @@ class CustomUserSerializer(HyperlinkedModelSerializer):
         fields = ['url', 'username', 'email', 'is_staff']
 
 
-class PostSerializer(ModelSerializer):
+def _field_names(value):
+    """
+    Split a comma-separated list of field names.
+
+    Args:
+        value (str): The value of a query parameter, e.g. `'id,title'`.
+
+    Returns:
+        list: The field names, without blanks.
+
+    """
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class SparseFieldsMixin:
+    """
+    SparseFieldsMixin Class
+
+    Serializer mixin trimming the output to the fields selected by the request, with
+    `?fields=id,title` (only these fields) and/or `?omit=content` (all but these fields).
+
+    Only reads (GET, HEAD, OPTIONS) are trimmed, so that writes still validate every
+    field. Unknown field names are rejected with a 400 response.
+
+    Attributes:
+        fields_query_param (str): The query parameter listing the fields to keep.
+        omit_query_param (str): The query parameter listing the fields to drop.
+
+    """
+
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        if request is not None and request.method in SAFE_METHODS:
+            self.trim_fields(request.query_params)
+
+    @classmethod
+    def is_sparse(cls, query_params):
+        """
+        Return whether a request selects a subset of the fields.
+
+        Args:
+            query_params (QueryDict): The query parameters of the request.
+
+        Returns:
+            bool: True if `fields` or `omit` is given.
+
+        """
+        return bool(
+            _field_names(query_params.get(cls.fields_query_param, ''))
+            or _field_names(query_params.get(cls.omit_query_param, ''))
+        )
+
+    def trim_fields(self, query_params):
+        """
+        Drop the fields not selected by the query parameters.
+
+        Args:
+            query_params (QueryDict): The query parameters of the request.
+
+        Raises:
+            ValidationError: If a selected or omitted field does not exist.
+
+        """
+        selected = _field_names(query_params.get(self.fields_query_param, ''))
+        omitted = _field_names(query_params.get(self.omit_query_param, ''))
+        if not selected and not omitted:
+            return
+
+        errors = {}
+        for param, names in ((self.fields_query_param, selected),
+                             (self.omit_query_param, omitted)):
+            unknown = [name for name in names if name not in self.fields]
+            if unknown:
+                errors[param] = [f'Unknown field(s): {", ".join(unknown)}.']
+        if errors:
+            raise ValidationError(errors)
+
+        keep = set(selected or self.fields).difference(omitted)
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
+
+
+class BulkPostListSerializer(ListSerializer):
+    """
+    BulkPostListSerializer Class
+
+    List serializer writing posts through `bulk_create` and `bulk_update`, in batches of
+    `settings.BULK_BATCH_SIZE` rows, instead of one query per post.
+
+    When updating, `instance` is the list of posts to update and every item of the data
+    must carry the `id` of one of them.
+    """
+
+    @staticmethod
+    def get_item_id(item):
+        """
+        Return the id of the post an item updates.
+
+        Args:
+            item: The primitive data of one item.
+
+        Returns:
+            int or None: The `id` of the item, as an integer (e.g. from "5"), or None if
+            it has no valid id.
+
+        """
+        try:
+            return int(item['id'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def run_child_validation(self, data):
+        """
+        Validate one item, against the post it updates if any.
+
+        Args:
+            data (dict): The primitive data of one item.
+
+        Returns:
+            dict: The validated data of the item.
+
+        """
+        if self.instance is not None:
+            try:
+                self.child.instance = self.instances_by_id[self.get_item_id(data)]
+            except KeyError as exc:
+                raise ValidationError({'id': ['No post found with this id.']}) from exc
+
+        return super().run_child_validation(data)
+
+    def to_internal_value(self, data):
+        if self.instance is None:
+            return super().to_internal_value(data)
+
+        self.instances_by_id = {post.pk: post for post in self.instance}
+        validated_data = super().to_internal_value(data)
+
+        for attrs, item in zip(validated_data, data):
+            attrs['id'] = self.get_item_id(item)
+
+        return validated_data
+
+    def create(self, validated_data):
+        """
+        Create posts in batched INSERT queries.
+
+        Args:
+            validated_data (list): The validated data of every post.
+
+        Returns:
+            list: The created posts.
+
+        """
+        posts = [Post(**attrs) for attrs in validated_data]
+        return Post.objects.bulk_create(posts, batch_size=settings.BULK_BATCH_SIZE)
+
+    def update(self, instance, validated_data):
+        """
+        Update posts in batched UPDATE queries.
+
+        Args:
+            instance (list): The posts to update.
+            validated_data (list): The validated data of every post, with its `id`.
+
+        Returns:
+            list: The updated posts, in the order of the data.
+
+        """
+        instances_by_id = {post.pk: post for post in instance}
+        updated_at = timezone.now()
+        posts = []
+        fields = set()
+
+        for attrs in validated_data:
+            post = instances_by_id[attrs.pop('id')]
+            for name, value in attrs.items():
+                setattr(post, name, value)
+            # bulk_update() bypasses the auto_now of `updated_at`
+            post.updated_at = updated_at
+            fields.update(attrs, ['updated_at'])
+            posts.append(post)
+
+        if fields:
+            Post.objects.bulk_update(
+                posts, sorted(fields), batch_size=settings.BULK_BATCH_SIZE
+            )
+
+        return posts
+
+
+class PostSerializer(SparseFieldsMixin, ModelSerializer):
     """
     PostSerializer Class
 
-    Serializes Post model data for API representation.
+    Serializes Post model data for API representation. Reads can be trimmed with
+    `?fields=` and `?omit=`. With `many=True`, it writes through `BulkPostListSerializer`.
     """
 
     class Meta:
         """
         Meta:
         model (Post): The Post model to be serialized.
-        fields (str or list): Specifies which fields to include in the serialized representation.
-            - '__all__': Includes all fields from the Post model.
+        exclude (list): Specifies which fields to leave out of the serialized representation.
+            - 'search_vector': The full-text search index is internal to the database.
+        list_serializer_class (BulkPostListSerializer): The serializer used with `many=True`.
         """
 
         model = Post
-        fields = '__all__'
+        exclude = ['search_vector']
+        list_serializer_class = BulkPostListSerializer
+
+
+class PubDateRangeSerializer(Serializer):
+    """
+    PubDateRangeSerializer Class
+
+    Validates a filter on the publication date of posts, from `pub_date_after`
+    (inclusive) to `pub_date_before` (exclusive).
+    """
+
+    pub_date_after = DateTimeField(required=False)
+    pub_date_before = DateTimeField(required=False)
+
+    def filter_queryset(self, queryset):
+        """
+        Restrict a post queryset to the validated publication date range.
+
+        Args:
+            queryset (QuerySet): The posts to filter.
+
+        Returns:
+            QuerySet: The posts published within the range.
+
+        """
+        if 'pub_date_after' in self.validated_data:
+            queryset = queryset.filter(pub_date__gte=self.validated_data['pub_date_after'])
+
+        if 'pub_date_before' in self.validated_data:
+            queryset = queryset.filter(pub_date__lt=self.validated_data['pub_date_before'])
+
+        return queryset
+
+
+class BulkDeleteSerializer(PubDateRangeSerializer):
+    """
+    BulkDeleteSerializer Class
+
+    Validates the selection of posts to delete in bulk: a list of ids, a publication
+    date range, or both. An empty selection is rejected rather than deleting every post.
+    """
+
+    ids = ListField(child=IntegerField(), required=False, allow_empty=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise ValidationError('Provide a list of ids or a publication date range.')
+
+        return attrs
+
+    def filter_queryset(self, queryset):
+        """
+        Restrict a post queryset to the validated selection.
+
+        Args:
+            queryset (QuerySet): The posts to filter.
+
+        Returns:
+            QuerySet: The selected posts.
+
+        """
+        if 'ids' in self.validated_data:
+            queryset = queryset.filter(pk__in=self.validated_data['ids'])
+
+        return super().filter_queryset(queryset)
+
+
+class UsernameAvailabilitySerializer(Serializer):
+    """
+    UsernameAvailabilitySerializer Class
+
+    Validates a batch of up to `max_usernames` candidate usernames, given as repeated
+    `username` query parameters or as a JSON list.
+    """
+
+    max_usernames = 100
+
+    username = ListField(
+        child=CharField(max_length=150, trim_whitespace=False),
+        allow_empty=False,
+        max_length=max_usernames,
+    )
+
+
+class TaskBatchSerializer(Serializer):
+    """
+    TaskBatchSerializer Class
+
+    Validates a batch of up to `TASK_BATCH_MAX_SIZE` argument sets of `my_task`, each
+    a list of its two arguments.
+    """
+
+    args = ListField(
+        child=ListField(min_length=2, max_length=2),
+        allow_empty=False,
+        max_length=settings.TASK_BATCH_MAX_SIZE,
+    )
+
+
+class BatchResultsSerializer(Serializer):
+    """
+    BatchResultsSerializer Class
+
+    Validates a long poll of the results of a batch: the `cursor` of the last result
+    already read (from the previous poll), and the longest `timeout` to wait, in seconds.
+    """
+
+    cursor = RegexField(r'^\d+(-\d+)?$', default='0')
+    timeout = FloatField(
+        min_value=0,
+        max_value=settings.TASK_BATCH_POLL_TIMEOUT,
+        default=settings.TASK_BATCH_POLL_TIMEOUT,
+    )
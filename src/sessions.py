@@ -0,0 +1,250 @@
+"""
+Module: sessions.py
+
+This module defines the session engine of the project (`SESSION_ENGINE = 'src.sessions'`),
+reading sessions from three layers, fastest first:
+
+1. A small in-process LRU cache per worker (L1), holding sessions for at most
+   `SESSION_L1_TIMEOUT` seconds, so that the requests of a user hitting the same worker
+   in a burst cost no network round trip at all. It is off (0) by default.
+2. The `SESSION_CACHE_ALIAS` cache (Redis), shared by every worker.
+3. The database, the durable copy of every session.
+
+Sessions are written through to the database and Redis, and only when their data
+actually changes: a request setting a session key to its current value writes nothing.
+
+Since the L1 of a worker is not invalidated by writes on other workers, a session
+changed (or deleted, e.g. by a logout or `cycle_key`) elsewhere may be served stale by
+this worker for up to `SESSION_L1_TIMEOUT` seconds: a logged out session keeps working
+there meanwhile. Only enable it where that is acceptable, and keep it short.
+
+Classes:
+    - LocalSessionCache: A bounded, expiring LRU cache of serialized sessions.
+    - SessionStore: The session store, with an in-process L1 over Redis over the database.
+
+Attributes:
+    local_sessions (LocalSessionCache): The L1 cache of the process.
+
+"""
+
+import logging
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db, db
+
+logger = logging.getLogger(__name__)
+
+
+class LocalSessionCache:
+    """
+    LocalSessionCache Class
+
+    A bounded LRU cache of serialized sessions, each kept for at most `timeout` seconds.
+    Sessions are stored serialized, so that requests never share mutable session data.
+
+    Attributes:
+        size (int): The maximum number of sessions kept.
+        timeout (float): The number of seconds a session is kept.
+
+    """
+
+    def __init__(self, size, timeout):
+        self.size = size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, session_key):
+        """
+        Return a serialized session, if cached and fresh.
+
+        Args:
+            session_key (str): The key of the session.
+
+        Returns:
+            bytes or None: The serialized session data.
+
+        """
+        with self._lock:
+            entry = self._entries.get(session_key)
+            if entry is None:
+                return None
+
+            data, expires_at = entry
+            if expires_at <= monotonic():
+                del self._entries[session_key]
+                return None
+
+            self._entries.move_to_end(session_key)
+            return data
+
+    def set(self, session_key, data):
+        """
+        Cache a serialized session.
+
+        Args:
+            session_key (str): The key of the session.
+            data (bytes): The serialized session data.
+
+        """
+        if self.size <= 0 or self.timeout <= 0:
+            return
+
+        with self._lock:
+            self._entries[session_key] = (data, monotonic() + self.timeout)
+            self._entries.move_to_end(session_key)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def delete(self, session_key):
+        """
+        Forget a session.
+
+        Args:
+            session_key (str): The key of the session.
+
+        """
+        with self._lock:
+            self._entries.pop(session_key, None)
+
+    def clear(self):
+        """
+        Forget every session.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+local_sessions = LocalSessionCache(
+    size=settings.SESSION_L1_SIZE, timeout=settings.SESSION_L1_TIMEOUT
+)
+
+
+class SessionStore(cached_db.SessionStore):
+    """
+    SessionStore Class
+
+    Session store reading sessions from the L1 of the process, then Redis, then the
+    database, and writing them through to the database and Redis only when they change.
+    Redis errors are logged and ignored: the database alone keeps sessions working.
+    """
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._serializer = self.serializer()
+        self._loaded = None
+
+    def load(self):
+        """
+        Load the session data, from the fastest layer holding it.
+
+        Returns:
+            dict: The session data, empty if the session does not exist.
+
+        """
+        serialized = local_sessions.get(self.session_key)
+        if serialized is not None:
+            self._loaded = serialized
+            return self._serializer.loads(serialized)
+
+        try:
+            data = super().load()
+        # pylint: disable=W0718
+        except Exception:
+            logger.warning('Session cache unavailable', exc_info=True)
+            data = db.SessionStore.load(self)
+
+        if data:
+            serialized = self._serializer.dumps(data)
+            local_sessions.set(self.session_key, serialized)
+            self._loaded = serialized
+
+        return data
+
+    def exists(self, session_key):
+        """
+        Return whether a session key is taken, in Redis or in the database.
+
+        Args:
+            session_key (str): The key of the session.
+
+        Returns:
+            bool: True if the session exists.
+
+        """
+        try:
+            return super().exists(session_key)
+        # pylint: disable=W0718
+        except Exception:
+            logger.warning('Session cache unavailable', exc_info=True)
+            return db.SessionStore.exists(self, session_key)
+
+    def is_unchanged(self):
+        """
+        Return whether the session data is the same as when it was loaded.
+
+        Returns:
+            bool: True if saving the session would write the same data.
+
+        """
+        if self._loaded is None or self._session_cache is None:
+            return False
+
+        return self._serializer.dumps(self._session_cache) == self._loaded
+
+    def save(self, must_create=False):
+        """
+        Write the session to the database and Redis, unless it did not change.
+
+        With `SESSION_SAVE_EVERY_REQUEST`, sessions are always written, so that their
+        expiry date slides.
+
+        Args:
+            must_create (bool): Whether the session must be new.
+
+        """
+        if self.session_key is None:
+            self.create()
+            return
+
+        skip = not must_create and not settings.SESSION_SAVE_EVERY_REQUEST
+        if skip and self.is_unchanged():
+            return
+
+        db.SessionStore.save(self, must_create)
+        data = self._get_session(no_load=must_create)
+
+        try:
+            self._cache.set(self.cache_key, data, self.get_expiry_age())
+        # pylint: disable=W0718
+        except Exception:
+            logger.warning('Session cache unavailable', exc_info=True)
+
+        self._loaded = self._serializer.dumps(data)
+        local_sessions.set(self.session_key, self._loaded)
+
+    def delete(self, session_key=None):
+        """
+        Delete a session from every layer.
+
+        Args:
+            session_key (str): The key of the session, by default the current one.
+
+        """
+        if session_key is None:
+            session_key = self.session_key
+
+        if session_key is None:
+            return
+
+        local_sessions.delete(session_key)
+        db.SessionStore.delete(self, session_key)
+
+        try:
+            self._cache.delete(self.cache_key_prefix + session_key)
+        # pylint: disable=W0718
+        except Exception:
+            logger.warning('Session cache unavailable', exc_info=True)
@@ -0,0 +1,63 @@
+"""
+Module: signals.py
+
+This module defines the signal receivers of the Django application. They are connected
+when the app is ready (see `src.apps`).
+
+Functions:
+    - invalidate_post_cache: Invalidates the cached post responses when a post is written.
+    - index_username: Adds the username of a saved user to the username index.
+
+"""
+
+from functools import partial
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import post_cache
+from .models import Post
+from .usernames import username_index
+
+
+# pylint: disable=unused-argument
+@receiver(post_save, sender=Post, dispatch_uid='invalidate_post_cache_on_save')
+@receiver(post_delete, sender=Post, dispatch_uid='invalidate_post_cache_on_delete')
+def invalidate_post_cache(sender, using, **kwargs):
+    """
+    Invalidate the cached post responses once the write commits.
+
+    Args:
+        sender (Model): The Post model.
+        using (str): The alias of the database written to.
+        kwargs: The other arguments of the signal.
+
+    """
+    post_cache.invalidate_on_commit(using=using)
+
+
+# pylint: disable=unused-argument
+@receiver(post_save, sender=User, dispatch_uid='index_username_on_save')
+def index_username(sender, instance, created, update_fields, using, **kwargs):
+    """
+    Add the username of a created user, or of a user saved with its username, to the
+    username index (see `src.usernames`). Other saves, such as the `last_login` update
+    of every login, are skipped.
+
+    The username is added once the write commits, so that a build of the index reading
+    the users before the commit still gets it (see `UsernameIndex.rebuild`), and a
+    rolled back write adds nothing.
+
+    Args:
+        sender (Model): The User model.
+        instance (User): The saved user.
+        created (bool): Whether the user was created.
+        update_fields (frozenset or None): The fields saved, or None for every field.
+        using (str): The alias of the database written to.
+        kwargs: The other arguments of the signal.
+
+    """
+    if created or update_fields is None or 'username' in update_fields:
+        transaction.on_commit(partial(username_index.add, [instance.username]), using=using)
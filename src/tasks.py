@@ -6,9 +6,17 @@ This module contains a Celery shared task for background processing.
 It defines a Celery shared task called `my_task` that can be used for performing
 background processing. The task takes two arguments, arg1 and arg2, and returns
 a tuple containing these arguments after performing some background task logic.
+
+It also defines `run_batch_chunk`, running a chunk of a batch of tasks submitted at
+once, and publishing each result as soon as it is ready (see `src.batches`), and
+`build_username_index`, building the username index off the request path (see
+`src.usernames`).
 """
 
-from celery import shared_task
+from celery import current_app, shared_task
+
+from .batches import publish_errors, publish_result
+from .usernames import username_index
 
 
 @shared_task
@@ -30,3 +38,55 @@ def my_task(arg1, arg2):
 
     # Your background task logic here
     return arg1, arg2
+
+
+@shared_task
+def run_batch_chunk(batch_id, task_name, offset, arg_sets):
+    """
+    Run a chunk of a batch of tasks, in this worker, publishing each result.
+
+    The tasks are called directly rather than sent as messages of their own, and an
+    error of one task is published as its result without stopping the others. If the
+    chunk itself fails (e.g. a result cannot be published), an error is published for
+    each of its tasks not published yet, so the batch still completes.
+
+    Args:
+        batch_id (str): The id of the batch.
+        task_name (str): The name of the task run on each argument set.
+        offset (int): The position of the first task of the chunk in the batch.
+        arg_sets (list): The positional arguments of each task of the chunk.
+
+    Returns:
+        int: The number of tasks run.
+
+    """
+    task = current_app.tasks[task_name]
+    index = offset
+
+    try:
+        for index, args in enumerate(arg_sets, start=offset):
+            try:
+                result = task(*args)
+            # pylint: disable=W0718
+            except Exception as exc:
+                publish_result(batch_id, index, error=f'{type(exc).__name__}: {exc}')
+            else:
+                publish_result(batch_id, index, result=result)
+    except Exception as exc:
+        error = f'Chunk failed: {type(exc).__name__}: {exc}'
+        publish_errors(batch_id, range(index, offset + len(arg_sets)), error)
+        raise
+
+    return len(arg_sets)
+
+
+@shared_task(ignore_result=True)
+def build_username_index():
+    """
+    Build the username index from the database, unless another build is in progress.
+
+    Returns:
+        int or None: The number of usernames added, or None if no build was done.
+
+    """
+    return username_index.rebuild()
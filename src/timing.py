@@ -0,0 +1,250 @@
+"""
+Module: timing.py
+
+This module measures where the time of a request goes: in database queries, in cache
+calls and in template rendering.
+
+`RequestTimingMiddleware` (see `src.middleware`) starts a `RequestTimer` per request, in
+a context variable, so it follows the request across threads (`sync_to_async`) and
+coroutines. The measuring points add to the timer of the current request, if any:
+
+- every database connection gets an execute wrapper, installed when it connects,
+- the cache backends of `CACHES` are the timed subclasses defined here,
+- the template backend of `TEMPLATES` is the timed subclass defined here.
+
+Nested calls of the same kind (e.g. `get_or_set` calling `get` and `add`) are only
+counted once.
+
+Classes:
+    - RequestTimer: The time spent per kind of call during a request.
+    - TimedCacheMixin: Cache backend mixin timing every public call.
+    - TimedLocMemCache: The local-memory cache backend, timed.
+    - TimedRedisCache: The Redis cache backend, timed.
+    - TimedDjangoTemplates: The Django template backend, timing the renders.
+
+Functions:
+    - get_timer: Return the timer of the current request.
+    - timed: Time a block of code as a kind of call of the current request.
+    - time_query: Database execute wrapper timing queries.
+
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import DjangoTemplates
+
+CACHE_METHODS = (
+    'add', 'get', 'set', 'touch', 'delete', 'get_many', 'get_or_set', 'has_key',
+    'incr', 'decr', 'set_many', 'delete_many', 'clear',
+)
+
+_current_timer = ContextVar('request_timer', default=None)
+
+
+class RequestTimer:
+    """
+    RequestTimer Class
+
+    The time spent per kind of call ('db', 'cache', 'template') during a request.
+
+    Attributes:
+        durations (dict): The seconds spent, by kind.
+        counts (dict): The number of calls, by kind.
+
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.counts = {}
+        self._active = set()
+
+    def add(self, kind, seconds):
+        """
+        Record a call.
+
+        Args:
+            kind (str): The kind of call.
+            seconds (float): The duration of the call.
+
+        """
+        self.durations[kind] = self.durations.get(kind, 0.0) + seconds
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    @contextmanager
+    def measure(self, kind):
+        """
+        Time a block of code as a call of some kind, unless it is nested in another call
+        of the same kind.
+
+        Args:
+            kind (str): The kind of call.
+
+        """
+        if kind in self._active:
+            yield
+            return
+
+        self._active.add(kind)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(kind, perf_counter() - start)
+            self._active.discard(kind)
+
+    def start(self):
+        """
+        Make this timer the timer of the current request.
+
+        Returns:
+            Token: The token restoring the previous timer, for `stop`.
+
+        """
+        return _current_timer.set(self)
+
+    @staticmethod
+    def stop(token):
+        """
+        Restore the timer current before `start`.
+
+        Args:
+            token (Token): The token returned by `start`.
+
+        """
+        _current_timer.reset(token)
+
+
+def get_timer():
+    """
+    Return the timer of the current request.
+
+    Returns:
+        RequestTimer or None: The timer, or None outside of a timed request.
+
+    """
+    return _current_timer.get()
+
+
+@contextmanager
+def timed(kind):
+    """
+    Time a block of code as a call of some kind of the current request, if any.
+
+    Args:
+        kind (str): The kind of call.
+
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+
+    with timer.measure(kind):
+        yield
+
+
+def time_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper timing queries as 'db' calls of the current request.
+
+    Args:
+        execute (callable): The next wrapper, or the execution of the query.
+        sql (str): The query.
+        params: The parameters of the query.
+        many (bool): Whether the query is an `executemany`.
+        context (dict): The connection and cursor of the query.
+
+    Returns:
+        The result of `execute`.
+
+    """
+    with timed('db'):
+        return execute(sql, params, many, context)
+
+
+# pylint: disable=unused-argument
+@receiver(connection_created, dispatch_uid='timing_connection_created')
+def install_query_timer(sender, connection, **kwargs):
+    """
+    Install the query timer on a new database connection, once per connection object.
+
+    Args:
+        sender: The database backend.
+        connection (DatabaseWrapper): The connection.
+        kwargs: The other arguments of the signal.
+
+    """
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+def _timed_method(method):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with timed('cache'):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+class TimedCacheMixin:
+    """
+    TimedCacheMixin Class
+
+    Cache backend mixin timing every public call as a 'cache' call of the current request.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in CACHE_METHODS:
+            setattr(cls, name, _timed_method(getattr(cls, name)))
+
+
+class TimedLocMemCache(TimedCacheMixin, LocMemCache):
+    """
+    TimedLocMemCache Class
+
+    The local-memory cache backend, timed.
+    """
+
+
+class TimedRedisCache(TimedCacheMixin, RedisCache):
+    """
+    TimedRedisCache Class
+
+    The Redis cache backend, timed.
+    """
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        with timed('template'):
+            return self.template.render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    TimedDjangoTemplates Class
+
+    The Django template backend, timing each render as a 'template' call of the current
+    request (includes and extended templates being part of it).
+    """
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
@@ -8,6 +8,8 @@ URL Patterns:
     - Index: Default landing page.
     - Users: API routes for user-related views (using a DefaultRouter).
     - Posts: API routes for post-related views (using a DefaultRouter).
+    - Task batches: API routes submitting batches of tasks, and reading their results.
+    - Async posts: Native async list and detail of posts, for ASGI servers.
     - Signup: User registration view.
     - Profile: User profile view.
     - Login: Custom login view.
@@ -23,12 +25,19 @@ from . import views
 router = routers.DefaultRouter()
 router.register(r'users', views.UserViewSet)
 router.register(r'posts', views.PostViewSet)
+router.register(r'tasks/batches', views.TaskBatchViewSet, basename='task-batch')
 
 auth_redirect = include('rest_framework.urls', namespace='rest_framework')
 
 urlpatterns = [
     path('', views.index, name='index'),  # Default landing page.
     path('', include(router.urls)),  # API routes for users and posts.
+    path(
+        'async/posts/', views.async_post_list, name='async-post-list'
+    ),  # Native async list of posts.
+    path(
+        'async/posts/<int:pk>/', views.async_post_detail, name='async-post-detail'
+    ),  # Native async detail of a post.
     path('signup/', views.signup, name='signup'),  # User registration view.
     path('profile/', views.profile, name='profile'),  # User profile view.
     path('login/', views.CustomLoginView.as_view(), name='login'),  # Custom login view.
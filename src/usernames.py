@@ -0,0 +1,646 @@
+"""
+Module: usernames.py
+
+This module answers whether usernames are available (not taken) mostly without querying
+the database, from a Bloom filter of every taken username.
+
+A Bloom filter has no false negatives: a username it does not contain is certainly
+available. Only the usernames it may contain (taken ones, and rare false positives) are
+checked against the database, by a single `IN (...)` query per batch.
+
+The filter is a bitmap kept in Redis (`USERNAME_INDEX_URL`), shared by every worker, or
+in the memory of the process when the setting is empty (for a single process only, since
+the users created by other processes would be missed). It is kept up to date by the
+`post_save` signal of `User` (see `src.signals`), once the write commits; users created
+without signals (e.g. by `bulk_create`) must be added with `username_index.add`. Deleted
+or renamed usernames stay in the filter, as false positives, until it is rebuilt.
+
+The filter is built off the request path: by `manage.py build_username_index` during the
+deploy, or, when it is found missing, by the `build_username_index` Celery task (in a
+background thread for an in-memory filter). Until it is built, every username is checked
+against the database. A build holds a lock, fills a staging bitmap, then swaps it in at
+once, so readers never see a partly built filter. While it runs, usernames added go to
+both bitmaps, so that the users committed after the build read them are not lost.
+
+Classes:
+    - BloomFilter: The bit positions of values in a Bloom filter.
+    - LocalBitmap: A bitmap in the memory of the process.
+    - RedisBitmap: A bitmap in Redis, shared by every process.
+    - UsernameIndex: The Bloom filter of taken usernames, backed by the database.
+
+Attributes:
+    username_index (UsernameIndex): The username index of the process.
+
+"""
+
+import logging
+from functools import cached_property
+from hashlib import blake2b
+from secrets import token_hex
+from threading import Lock, Thread
+from time import monotonic
+
+import redis
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Sets bits of the bitmap (KEYS[1]), and of the staging bitmap of the build holding the
+# lock (KEYS[2]), if any, renewing its expiry (ARGV[1])
+SET_SCRIPT = """
+local token = redis.call('get', KEYS[2])
+local staging = token and KEYS[1] .. ':staging:' .. token
+for i = 2, #ARGV do
+    redis.call('setbit', KEYS[1], ARGV[i], 1)
+    if staging then
+        redis.call('setbit', staging, ARGV[i], 1)
+    end
+end
+if staging then
+    redis.call('expire', staging, ARGV[1])
+end
+return 1
+"""
+
+# Each script only acts while the build lock (KEYS[1]) is held by the caller's token
+EXTEND_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+SWAP_SCRIPT = """
+if redis.call('get', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if redis.call('exists', KEYS[2]) == 1 then
+    redis.call('rename', KEYS[2], KEYS[3])
+    redis.call('persist', KEYS[3])
+else
+    redis.call('del', KEYS[3])
+end
+redis.call('set', KEYS[4], 1)
+redis.call('del', KEYS[1])
+return 1
+"""
+
+
+class BloomFilter:
+    """
+    BloomFilter Class
+
+    Computes the bit positions of values in a Bloom filter of `bits` bits, with `hashes`
+    hash functions derived from one BLAKE2 digest (double hashing).
+
+    With n values, the rate of false positives is about (1 - e^(-hashes * n / bits))^hashes,
+    e.g. 0.05% for a million usernames in 2^24 bits (2 MiB) with 7 hashes.
+
+    Attributes:
+        bits (int): The number of bits of the filter.
+        hashes (int): The number of bits set per value.
+
+    """
+
+    def __init__(self, bits, hashes):
+        self.bits = bits
+        self.hashes = hashes
+
+    def positions(self, value):
+        """
+        Return the bit positions of a value.
+
+        Args:
+            value (str): The value.
+
+        Returns:
+            list: The `hashes` positions of the value.
+
+        """
+        digest = blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+
+class LocalBitmap:
+    """
+    LocalBitmap Class
+
+    A bitmap in the memory of the process.
+
+    Attributes:
+        bits (int): The number of bits of the bitmap.
+        shared (bool): False, since other processes do not see the bitmap.
+
+    """
+
+    shared = False
+
+    def __init__(self, bits):
+        self.bits = bits
+        self._bytes = bytearray((bits + 7) // 8)
+        self._staging = None
+        self._ready = False
+        self._build_token = None
+        self._lock = Lock()
+
+    def get(self, positions):
+        """
+        Return the bits at some positions.
+
+        Args:
+            positions (list): The positions.
+
+        Returns:
+            list: The bits, 0 or 1.
+
+        """
+        data = self._bytes
+        return [(data[position >> 3] >> (position & 7)) & 1 for position in positions]
+
+    def set(self, positions):
+        """
+        Set the bits at some positions, and in the staging bitmap of a build in progress.
+
+        Args:
+            positions (list): The positions.
+
+        """
+        with self._lock:
+            for data in (self._bytes, self._staging):
+                if data is None:
+                    continue
+
+                for position in positions:
+                    data[position >> 3] |= 1 << (position & 7)
+
+    def is_ready(self):
+        """
+        Return whether the bitmap was built.
+
+        Returns:
+            bool: True once `mark_ready` was called, or a build swapped in.
+
+        """
+        return self._ready
+
+    def mark_ready(self):
+        """
+        Record that the bitmap was built.
+        """
+        self._ready = True
+
+    def acquire_build(self):
+        """
+        Claim the build of the bitmap, into a new, empty staging bitmap.
+
+        Returns:
+            object or None: The token of the build, or None if another thread is
+            building it.
+
+        """
+        with self._lock:
+            if self._build_token is not None:
+                return None
+
+            self._build_token = object()
+            self._staging = bytearray(len(self._bytes))
+            return self._build_token
+
+    def set_staging(self, token, positions):
+        """
+        Set the bits at some positions of the staging bitmap of a build.
+
+        Args:
+            token (object): The token of the build.
+            positions (list): The positions.
+
+        """
+        with self._lock:
+            if token is not self._build_token:
+                return
+
+            for position in positions:
+                self._staging[position >> 3] |= 1 << (position & 7)
+
+    def swap(self, token):
+        """
+        Replace the bitmap with the staging bitmap of a build, and record it as built.
+
+        Args:
+            token (object): The token of the build.
+
+        Returns:
+            bool: False if the build is no longer claimed by the token.
+
+        """
+        with self._lock:
+            if token is not self._build_token:
+                return False
+
+            self._bytes, self._staging, self._build_token = self._staging, None, None
+            self._ready = True
+            return True
+
+    def release_build(self, token):
+        """
+        Release the claim on the build of the bitmap, if the token still holds it.
+
+        Args:
+            token (object): The token of the build.
+
+        """
+        with self._lock:
+            if token is self._build_token:
+                self._build_token = self._staging = None
+
+
+class RedisBitmap:
+    """
+    RedisBitmap Class
+
+    A bitmap stored as a Redis string, read and written with one round trip per call. A `<key>:ready` key records that it was built, and a `<key>:lock` key holds
+    the token of the process building it, into a `<key>:staging:<token>` key renamed over
+    the bitmap once complete.
+
+    Attributes:
+        url (str): The URL of the Redis database, connected to on first use.
+        key (str): The Redis key of the bitmap.
+        build_timeout (int): The number of seconds a build is claimed for, renewed as it
+            progresses.
+        shared (bool): True, since every process sees the bitmap.
+
+    """
+
+    shared = True
+
+    def __init__(self, url, key, build_timeout=300):
+        self.url = url
+        self.key = key
+        self.build_timeout = build_timeout
+
+    @cached_property
+    def _client(self):
+        return redis.Redis.from_url(self.url)
+
+    @cached_property
+    def _scripts(self):
+        return {
+            'set': self._client.register_script(SET_SCRIPT),
+            'extend': self._client.register_script(EXTEND_SCRIPT),
+            'release': self._client.register_script(RELEASE_SCRIPT),
+            'swap': self._client.register_script(SWAP_SCRIPT),
+        }
+
+    @property
+    def lock_key(self):
+        """
+        Return the key holding the token of the build.
+
+        Returns:
+            str: The key of the build lock.
+
+        """
+        return f'{self.key}:lock'
+
+    def get(self, positions):
+        """
+        Return the bits at some positions.
+
+        Args:
+            positions (list): The positions.
+
+        Returns:
+            list: The bits, 0 or 1.
+
+        """
+        pipeline = self._client.pipeline(transaction=False)
+        for position in positions:
+            pipeline.getbit(self.key, position)
+
+        return pipeline.execute()
+
+    def set(self, positions):
+        """
+        Set the bits at some positions, and in the staging bitmap of a build in progress,
+        atomically.
+
+        Args:
+            positions (list): The positions.
+
+        """
+        if positions:
+            self._scripts['set'](
+                keys=[self.key, self.lock_key], args=[self.build_timeout, *positions]
+            )
+
+    def is_ready(self):
+        """
+        Return whether the bitmap was built.
+
+        Returns:
+            bool: True once `mark_ready` was called, or a build swapped in.
+
+        """
+        return bool(self._client.exists(f'{self.key}:ready'))
+
+    def mark_ready(self):
+        """
+        Record that the bitmap was built.
+        """
+        self._client.set(f'{self.key}:ready', 1)
+
+    def acquire_build(self):
+        """
+        Claim the build of the bitmap, for `build_timeout` seconds.
+
+        Returns:
+            str or None: The token of the build, or None if another process is
+            building it.
+
+        """
+        token = token_hex(16)
+        if self._client.set(self.lock_key, token, nx=True, ex=self.build_timeout):
+            return token
+
+        return None
+
+    def set_staging(self, token, positions):
+        """
+        Set the bits at some positions of the staging bitmap of a build, and renew the
+        claim on the build (the staging bitmap of a crashed build expires).
+
+        Args:
+            token (str): The token of the build.
+            positions (list): The positions.
+
+        """
+        staging_key = f'{self.key}:staging:{token}'
+
+        pipeline = self._client.pipeline(transaction=False)
+        for position in positions:
+            pipeline.setbit(staging_key, position, 1)
+        pipeline.expire(staging_key, self.build_timeout)
+        self._scripts['extend'](
+            keys=[self.lock_key], args=[token, self.build_timeout], client=pipeline
+        )
+
+        pipeline.execute()
+
+    def swap(self, token):
+        """
+        Rename the staging bitmap of a build over the bitmap, and record it as built,
+        atomically.
+
+        Args:
+            token (str): The token of the build.
+
+        Returns:
+            bool: False if the build is no longer claimed by the token (e.g. it took
+            longer than `build_timeout` seconds between two chunks).
+
+        """
+        keys = [self.lock_key, f'{self.key}:staging:{token}', self.key, f'{self.key}:ready']
+        return bool(self._scripts['swap'](keys=keys, args=[token]))
+
+    def release_build(self, token):
+        """
+        Release the claim on the build of the bitmap, if the token still holds it.
+
+        Args:
+            token (str): The token of the build.
+
+        """
+        self._scripts['release'](keys=[self.lock_key], args=[token])
+
+
+class UsernameIndex:
+    """
+    UsernameIndex Class
+
+    The Bloom filter of taken usernames, backed by the database. Bitmap errors (e.g.
+    Redis being down) are logged, and the database answers alone.
+
+    Attributes:
+        bloom (BloomFilter): The positions of usernames in the bitmap.
+        bitmap (LocalBitmap or RedisBitmap): The bits of the filter.
+        chunk_size (int): The number of usernames added per round trip when building.
+        build_interval (float): The minimum number of seconds between two builds
+            requested by this process while the filter is missing.
+
+    """
+
+    def __init__(self, bloom, bitmap, chunk_size=10000, build_interval=60):
+        self.bloom = bloom
+        self.bitmap = bitmap
+        self.chunk_size = chunk_size
+        self.build_interval = build_interval
+        self._build_requested = None
+        self._lock = Lock()
+
+    @classmethod
+    def from_settings(cls):
+        """
+        Create the username index configured by the settings.
+
+        Returns:
+            UsernameIndex: The index, in Redis if `USERNAME_INDEX_URL` is set.
+
+        """
+        bloom = BloomFilter(settings.USERNAME_BLOOM_BITS, settings.USERNAME_BLOOM_HASHES)
+
+        if settings.USERNAME_INDEX_URL:
+            bitmap = RedisBitmap(settings.USERNAME_INDEX_URL, 'usernames:bloom')
+        else:
+            bitmap = LocalBitmap(bloom.bits)
+
+        return cls(bloom, bitmap)
+
+    def positions(self, usernames):
+        """
+        Return the bit positions of usernames, `bloom.hashes` per username.
+
+        Args:
+            usernames (iterable): The usernames.
+
+        Returns:
+            list: The positions of every username, in order.
+
+        """
+        return [
+            position for username in usernames for position in self.bloom.positions(username)
+        ]
+
+    def add(self, usernames):
+        """
+        Add taken usernames to the filter.
+
+        Args:
+            usernames (iterable): The usernames.
+
+        """
+        try:
+            self.bitmap.set(self.positions(usernames))
+        # pylint: disable=W0718
+        except Exception:
+            logger.warning('Username index unavailable', exc_info=True)
+
+    def rebuild(self):
+        """
+        Build the filter from the usernames of the database, unless another build is in
+        progress.
+
+        The usernames are added to a staging bitmap, swapped in once complete. The
+        usernames added meanwhile (see `add`) go to the staging bitmap too, so those
+        committed after the query read the users are kept.
+
+        Returns:
+            int or None: The number of usernames added, or None if the filter was not
+            built, another build holding (or having taken over) the lock.
+
+        """
+        token = self.bitmap.acquire_build()
+        if token is None:
+            return None
+
+        try:
+            count, chunk = 0, []
+            users = User.objects.order_by('pk').values_list('username', flat=True)
+            for username in users.iterator(chunk_size=self.chunk_size):
+                chunk.append(username)
+                if len(chunk) == self.chunk_size:
+                    self.bitmap.set_staging(token, self.positions(chunk))
+                    count, chunk = count + len(chunk), []
+
+            self.bitmap.set_staging(token, self.positions(chunk))
+            if not self.bitmap.swap(token):
+                logger.warning('The username index build lost its lock, and was dropped')
+                return None
+        finally:
+            self.bitmap.release_build(token)
+
+        return count + len(chunk)
+
+    def request_build(self):
+        """
+        Build the filter in the background, at most once per `build_interval` seconds
+        per process: with the `build_username_index` Celery task for a shared bitmap, or
+        in a thread of this process otherwise.
+        """
+        now = monotonic()
+        with self._lock:
+            requested = self._build_requested
+            if requested is not None and now - requested < self.build_interval:
+                return
+            self._build_requested = now
+
+        if self.bitmap.shared:
+            # pylint: disable=import-outside-toplevel
+            from .tasks import build_username_index
+
+            build_username_index.delay()
+        else:
+            Thread(target=self._build_in_thread, daemon=True).start()
+
+    def _build_in_thread(self):
+        try:
+            count = self.rebuild()
+            if count is not None:
+                logger.info('Built the username index from %d users', count)
+        # pylint: disable=W0718
+        except Exception:
+            logger.warning('Username index build failed', exc_info=True)
+        finally:
+            connections.close_all()
+
+    def candidates(self, usernames):
+        """
+        Return the usernames the filter may contain.
+
+        Args:
+            usernames (list): The unique usernames to check.
+
+        Returns:
+            list: The usernames possibly taken; every username while the filter is not
+            built (its build being requested), or unavailable.
+
+        """
+        try:
+            if not self.bitmap.is_ready():
+                self.request_build()
+                return usernames
+
+            bits = self.bitmap.get(self.positions(usernames))
+        # pylint: disable=W0718
+        except Exception:
+            logger.warning('Username index unavailable', exc_info=True)
+            return usernames
+
+        hashes = self.bloom.hashes
+        return [
+            username
+            for index, username in enumerate(usernames)
+            if all(bits[index * hashes:(index + 1) * hashes])
+        ]
+
+    def taken(self, usernames):
+        """
+        Return which usernames are taken.
+
+        Args:
+            usernames (iterable): The usernames to check.
+
+        Returns:
+            set: The taken usernames, found by one query for the possibly taken ones.
+
+        """
+        candidates = self.candidates(list(dict.fromkeys(usernames)))
+        if not candidates:
+            return set()
+
+        return set(
+            User.objects.filter(username__in=candidates).values_list('username', flat=True)
+        )
+
+    def availability(self, usernames):
+        """
+        Return whether usernames are available.
+
+        Args:
+            usernames (iterable): The usernames to check.
+
+        Returns:
+            dict: True for each available username, False for each taken one.
+
+        """
+        usernames = list(usernames)
+        taken = self.taken(usernames)
+
+        return {username: username not in taken for username in usernames}
+
+    def is_available(self, username):
+        """
+        Return whether a username is available.
+
+        Args:
+            username (str): The username to check.
+
+        Returns:
+            bool: True if no user has the username.
+
+        """
+        return username not in self.taken([username])
+
+
+username_index = UsernameIndex.from_settings()
@@ -50,7 +50,8 @@ import re
 
 from django.core.exceptions import ValidationError
 from django.contrib.auth import password_validation
-from django.contrib.auth.password_validation import CommonPasswordValidator
+
+from .passwords import SharedCommonPasswordValidator
 
 logger = logging.getLogger(__name__)
 
@@ -130,14 +131,15 @@ def validate_common_password(password):
     """
     Validates the given password against a list of common passwords.
 
+    The list is loaded once per process (see `src.passwords`).
+
     Args:
         password (str): The password to be validated.
 
     Raises:
         ValidationError: If the password is found in the list of common passwords.
     """
-    validator = CommonPasswordValidator()
-    validator.validate(password)
+    SharedCommonPasswordValidator().validate(password)
 
 
 def validate_password_numeric(password):
@@ -7,28 +7,66 @@ including user authentication, posts, and profiles.
 Views and ViewSets:
     - index: Default landing page view.
     - PostViewSet: ViewSet for handling Post model data.
+    - async_post_list: Native async list of posts.
+    - async_post_detail: Native async detail of a post.
+    - UsernameAvailabilityThrottle: Throttles the username availability checks.
     - UserViewSet: ViewSet for handling User model data with authentication.
+    - TaskBatchViewSet: ViewSet submitting batches of tasks and delivering their results.
     - CustomLoginView: Custom login view.
     - CustomLogoutView: Custom logout view.
     - signup: User registration view.
     - profile: User profile view.
+    - metrics: Prometheus metrics of the requests and tasks of every worker.
 
 """
 
+import os
+
+from django.conf import settings
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib.auth.views import LoginView, LogoutView as BaseLogoutView
 from django.shortcuts import render, redirect
 from django.urls import reverse_lazy
-from django.http import HttpResponse
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.viewsets import ModelViewSet
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
+from rest_framework.throttling import UserRateThrottle
+from rest_framework.viewsets import ModelViewSet, ViewSet
 
 from .models import Post
 from .forms import CustomUserCreationForm
-from .serializers import PostSerializer, CustomUserSerializer
+from .pagination import PostKeysetPagination, UserKeysetPagination
+from .search import search_posts
+from .bulk import delete_in_batches
+from .caching import CachedResponseMixin, ConditionalGetMixin, post_cache
+from .fastpath import FastReadMixin, ValuesSerializer, ordering_columns
+from .batches import batch_exists, read_results, stream_events, submit_batch
+from .renderers import EventStreamRenderer, ORJSONRenderer
+from .export import EXPORT_FORMATS, IgnoreClientContentNegotiation, stream_export
+from .serializers import (
+    BatchResultsSerializer,
+    BulkDeleteSerializer,
+    BulkPostListSerializer,
+    PostSerializer,
+    PubDateRangeSerializer,
+    CustomUserSerializer,
+    TaskBatchSerializer,
+    UsernameAvailabilitySerializer,
+)
+from .metrics import RequestMetrics, load_metrics, request_metrics
+from .middleware import flush_request_metrics
 from .tasks import my_task
+from .usernames import username_index
 
 
 def index(request):
@@ -56,21 +94,400 @@ def my_view(request):
 # ViewSets define the view behavior.
 
 # pylint: disable=too-many-ancestors
-class PostViewSet(ModelViewSet):
+class PostViewSet(CachedResponseMixin, ConditionalGetMixin, FastReadMixin, ModelViewSet):
     """
     PostViewSet Class
 
     ViewSet for handling Post model data.
 
+    The list accepts a `?q=` full-text search on the title and content of posts, in which
+    case the results are ranked, best matches first.
+
+    List and detail GETs accept sparse fieldsets, `?fields=id,title` or `?omit=content`,
+    which trim the output and restrict the columns read from the database accordingly.
+    With the `API_FAST_READ` setting, they are rendered from `values()` rows instead of
+    model instances (see `src.fastpath`), with the same output.
+
+    The `bulk/` route creates (POST) or updates (PATCH) a JSON array of posts in a single
+    transaction, answering with per-item errors when any item is invalid, and deletes
+    (DELETE) posts by ids or publication date range in bounded batches.
+
+    List and detail GETs are served from a Redis response cache, invalidated whenever a
+    post is written, without any query; the `cache-stats/` route reports its hit/miss
+    counters. They carry ETag and Last-Modified validators derived from `updated_at`,
+    and conditional GETs of unchanged posts are answered with 304 responses.
+
+    The `export/` route streams every post, or those of a publication date range, as
+    NDJSON or CSV.
+
     Attributes:
-        queryset (QuerySet): The queryset for retrieving Post model instances.
+        queryset (QuerySet): The queryset for retrieving Post model instances, newest first.
         serializer_class (PostSerializer): The serializer class for Post model data.
+        pagination_class (PostKeysetPagination): The keyset paginator on `(pub_date, id)`.
+        response_cache (ResponseCache): The cache of the list and detail responses.
 
     """
 
     # pylint: disable=E1101
-    queryset = Post.objects.all()
+    queryset = Post.objects.defer('search_vector').order_by('-pub_date', '-id')
     serializer_class = PostSerializer
+    pagination_class = PostKeysetPagination
+    response_cache = post_cache
+    search_query_param = 'q'
+    export_fields = ('id', 'title', 'content', 'pub_date')
+
+    def get_queryset(self):
+        """
+        Return the posts of the request, filtered by the search query if any.
+
+        Returns:
+            QuerySet: The posts, newest first, or ranked by relevance when searching.
+
+        """
+        queryset = super().get_queryset()
+
+        text = self.request.query_params.get(self.search_query_param, '').strip()
+        if text and self.action == 'list':
+            queryset = search_posts(queryset, text)
+
+        if self.action in ('list', 'retrieve'):
+            queryset = self.only_selected_fields(queryset)
+
+        return queryset
+
+    def only_selected_fields(self, queryset):
+        """
+        Restrict the columns read to the fields selected by `?fields=` and `?omit=`.
+
+        The ordering columns are always read, since the paginator needs them to build
+        the cursors.
+
+        Args:
+            queryset (QuerySet): The posts of the request.
+
+        Returns:
+            QuerySet: The posts, deferring the columns of unselected fields.
+
+        """
+        serializer_class = self.get_serializer_class()
+        if not serializer_class.is_sparse(self.request.query_params):
+            return queryset
+
+        columns = {field.name for field in queryset.model._meta.concrete_fields}
+        sources = {field.source for field in self.get_serializer().fields.values()}
+        ordering = {
+            field.lstrip('-') for field in queryset.query.order_by if isinstance(field, str)
+        }
+
+        return queryset.only(*((sources | ordering) & columns))
+
+    def get_bulk_items(self, request):
+        """
+        Return the JSON array of a bulk request.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            tuple: The items of the array, or None, and the error response, or None.
+
+        """
+        items = request.data
+
+        if not isinstance(items, list):
+            error = {'detail': 'Expected a JSON array of posts.'}
+            return None, Response(error, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(items) > settings.BULK_MAX_ITEMS:
+            error = {'detail': f'At most {settings.BULK_MAX_ITEMS} posts per request.'}
+            return None, Response(error, status=status.HTTP_400_BAD_REQUEST)
+
+        return items, None
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Create a JSON array of posts in one transaction.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            Response: The created posts, or the errors of every item (an empty object
+            for valid items) if any item is invalid, in which case nothing is written.
+
+        """
+        items, error = self.get_bulk_items(request)
+        if error is not None:
+            return error
+
+        serializer = self.get_serializer(data=items, many=True)
+        if not serializer.is_valid():
+            return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            serializer.save()
+            # bulk_create() sends no post_save signal
+            post_cache.invalidate_on_commit()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk.mapping.patch
+    def bulk_update(self, request):
+        """
+        Update a JSON array of posts, each identified by its `id`, in one transaction.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            Response: The updated posts, or the errors of every item (an empty object
+            for valid items) if any item is invalid, in which case nothing is written.
+
+        """
+        items, error = self.get_bulk_items(request)
+        if error is not None:
+            return error
+
+        # Coerced as the items are validated, so an id such as "5" is fetched too
+        ids = {BulkPostListSerializer.get_item_id(item) for item in items}
+        ids.discard(None)
+
+        with transaction.atomic():
+            posts = list(Post.objects.select_for_update().filter(pk__in=ids))
+            serializer = self.get_serializer(posts, data=items, many=True, partial=True)
+
+            if not serializer.is_valid():
+                return Response(
+                    {'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+            serializer.save()
+            # bulk_update() sends no post_save signal
+            post_cache.invalidate_on_commit()
+
+        return Response(serializer.data)
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request):
+        """
+        Delete posts by ids and/or publication date range, in bounded batches.
+
+        The selection is read from the request body, or from the query string when the
+        body is empty. Every batch is deleted in its own short transaction.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            Response: The number of posts deleted.
+
+        """
+        serializer = BulkDeleteSerializer(data=request.data or request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        queryset = serializer.filter_queryset(Post.objects.all())
+        deleted = delete_in_batches(queryset, settings.BULK_BATCH_SIZE)
+
+        return Response({'deleted': deleted})
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='export',
+        content_negotiation_class=IgnoreClientContentNegotiation,
+    )
+    def export(self, request):
+        """
+        Stream posts as NDJSON (default) or CSV, oldest first.
+
+        The format is chosen with `?output=ndjson|csv`, or `Accept: text/csv`, and the
+        posts can be restricted with `pub_date_after` and `pub_date_before`.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            StreamingHttpResponse: The exported posts, sent chunk by chunk.
+
+        """
+        export_format = request.query_params.get('output')
+        if export_format is None:
+            accepted = request.META.get('HTTP_ACCEPT', '')
+            export_format = 'csv' if EXPORT_FORMATS['csv'] in accepted else 'ndjson'
+
+        if export_format not in EXPORT_FORMATS:
+            error = {'output': [f'Choose one of: {", ".join(EXPORT_FORMATS)}.']}
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = PubDateRangeSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        queryset = serializer.filter_queryset(Post.objects.order_by('pub_date', 'id'))
+
+        content = stream_export(
+            queryset,
+            self.export_fields,
+            export_format,
+            settings.EXPORT_CHUNK_SIZE,
+            datetime_fields=('pub_date',),
+        )
+        response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[export_format])
+        response['Content-Disposition'] = f'attachment; filename="posts.{export_format}"'
+
+        return response
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='cache-stats',
+        permission_classes=[IsAdminUser],
+    )
+    def cache_stats(self, request):
+        """
+        Report the hit/miss counters of the response cache of this process.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            Response: The number of hits and misses, and the hit ratio.
+
+        """
+        return Response(self.response_cache.stats())
+
+
+def _json_response(data, status_code=status.HTTP_200_OK):
+    """
+    Render data into a JSON response, outside of DRF's views.
+
+    Args:
+        data: The data to render.
+        status_code (int): The status code of the response.
+
+    Returns:
+        HttpResponse: The JSON response.
+
+    """
+    content = ORJSONRenderer().render(data)
+    return HttpResponse(content, status=status_code, content_type='application/json')
+
+
+def _error_response(exc):
+    """
+    Render an API exception like the exception handler of the API does.
+
+    Args:
+        exc (APIException): The exception raised.
+
+    Returns:
+        HttpResponse: The JSON error response.
+
+    """
+    data = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+    return _json_response({**data, 'status_code': exc.status_code}, exc.status_code)
+
+
+def _async_read(request):
+    """
+    Prepare a read of posts from an async view.
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+
+    Returns:
+        tuple: The DRF request and the values serializer of its (sparse) fields.
+
+    Raises:
+        APIException: If the requested fields are invalid.
+
+    """
+    api_request = Request(request)
+    serializer = ValuesSerializer(PostSerializer(context={'request': api_request}))
+
+    return api_request, serializer
+
+
+async def async_post_list(request):
+    """
+    async_post_list View
+
+    Native async list of posts, for ASGI servers: the same representation, keyset
+    pagination, search (`?q=`) and sparse fieldsets as the list of `PostViewSet`,
+    read with Django's async ORM instead of through a thread. Responses are JSON,
+    and neither conditional nor cached.
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+
+    Returns:
+        HttpResponse: The page of posts, with the links to the next and previous pages.
+
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+
+    try:
+        api_request, serializer = _async_read(request)
+
+        queryset = PostViewSet.queryset.all()
+        text = api_request.query_params.get(PostViewSet.search_query_param, '').strip()
+        if text:
+            queryset = search_posts(queryset, text)
+
+        paginator = PostKeysetPagination()
+        rows = serializer.values(queryset, *ordering_columns(queryset))
+        rows = [row async for row in paginator.get_page_queryset(rows, api_request)]
+    except APIException as exc:
+        return _error_response(exc)
+
+    page = paginator.set_page(rows)
+    return _json_response({
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+        'results': serializer.many(page),
+    })
+
+
+async def async_post_detail(request, pk):
+    """
+    async_post_detail View
+
+    Native async detail of a post, with the same representation and sparse fieldsets
+    as the detail of `PostViewSet`.
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+        pk (int): The id of the post.
+
+    Returns:
+        HttpResponse: The post, or a 404 response.
+
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+
+    try:
+        _, serializer = _async_read(request)
+    except APIException as exc:
+        return _error_response(exc)
+
+    row = await serializer.values(PostViewSet.queryset.filter(pk=pk)).afirst()
+    if row is None:
+        error = {'detail': 'No Post matches the given query.', 'status_code': 404}
+        return _json_response(error, status.HTTP_404_NOT_FOUND)
+
+    return _json_response(serializer.to_representation(row))
+
+
+class UsernameAvailabilityThrottle(UserRateThrottle):
+    """
+    UsernameAvailabilityThrottle Class
+
+    Throttles the username availability checks per user, or per IP address of anonymous
+    clients, at the `usernames` rate of `DEFAULT_THROTTLE_RATES`.
+    """
+
+    scope = 'usernames'
 
 
 # pylint: disable=R0901
@@ -80,16 +497,163 @@ class UserViewSet(ModelViewSet):
 
     ViewSet for handling User model data with authentication.
 
+    The list is paginated on the primary key, and list and detail GETs only read the
+    columns of the serialized fields.
+
+    The `available/` route reports whether candidate usernames are taken, to anyone, at
+    the `usernames` throttle rate.
+
     Attributes:
         queryset (QuerySet): The queryset for retrieving User model instances.
         serializer_class (CustomUserSerializer): The serializer class for User model data.
         permission_classes (list): The list of permission classes, including IsAuthenticated.
+        pagination_class (UserKeysetPagination): The keyset paginator on `id`.
+        read_fields (tuple): The columns read by list and detail GETs.
 
     """
 
-    queryset = User.objects.all()
+    queryset = User.objects.order_by('id')
     serializer_class = CustomUserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = UserKeysetPagination
+    read_fields = ('id', 'username', 'email', 'is_staff')
+
+    def get_queryset(self):
+        """
+        Return the users, reading only the serialized columns for list and detail GETs.
+
+        Returns:
+            QuerySet: The users, oldest first.
+
+        """
+        queryset = super().get_queryset()
+
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.only(*self.read_fields)
+
+        return queryset
+
+    @action(
+        detail=False,
+        methods=['get', 'post'],
+        url_path='available',
+        permission_classes=[AllowAny],
+        throttle_classes=[UsernameAvailabilityThrottle],
+    )
+    def available(self, request):
+        """
+        Report whether candidate usernames are available, e.g. while signing up.
+
+        The usernames are given as repeated `?username=` parameters, or as a `username`
+        list in the body of a POST. They are checked against the username index (see
+        `src.usernames`), so only the possibly taken ones cost a database query.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            Response: True for each available username, False for each taken one.
+
+        """
+        data = request.data if request.method == 'POST' else request.query_params
+        serializer = UsernameAvailabilitySerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(username_index.availability(serializer.validated_data['username']))
+
+
+class TaskBatchViewSet(ViewSet):
+    """
+    TaskBatchViewSet Class
+
+    ViewSet submitting batches of `my_task` at once, and delivering their results as
+    they finish (see `src.batches`).
+
+    A POST of `{"args": [[1, 2], [3, 4], ...]}` sends the whole batch as one Celery
+    group, and answers 202 with the id of the batch and the URL of its results.
+
+    The results are read with a long poll, answered as soon as new results are ready
+    (or after `?timeout=` seconds), and given the `cursor` of the previous answer; or
+    as server-sent events (`Accept: text/event-stream`), resumed from `Last-Event-ID`.
+    Both hold a worker thread while they wait, so they need threaded or ASGI workers.
+
+    Attributes:
+        permission_classes (list): The list of permission classes, including IsAuthenticated.
+        renderer_classes (list): The renderers of the API, and server-sent events.
+        lookup_value_regex (str): The format of the batch ids.
+        task_name (str): The name of the task run on each argument set.
+
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, EventStreamRenderer]
+    lookup_value_regex = '[0-9a-f]{32}'
+    task_name = my_task.name
+
+    def create(self, request):
+        """
+        Submit a batch of argument sets.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            Response: The `batch_id`, `total` number of tasks and `results` URL.
+
+        """
+        serializer = TaskBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        arg_sets = serializer.validated_data['args']
+        batch_id = submit_batch(self.task_name, arg_sets)
+        url = reverse('task-batch-detail', kwargs={'pk': batch_id}, request=request)
+
+        return Response(
+            {'batch_id': batch_id, 'total': len(arg_sets), 'results': url},
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': url},
+        )
+
+    def retrieve(self, request, pk=None):
+        """
+        Deliver the results of a batch, by long poll or as server-sent events.
+
+        Args:
+            request (Request): The incoming request.
+            pk (str): The id of the batch.
+
+        Returns:
+            Response or StreamingHttpResponse: The new results, the `cursor` to poll
+            from next, and whether the batch is `done`; or the stream of events.
+
+        """
+        params = request.query_params.dict()
+        if 'HTTP_LAST_EVENT_ID' in request.META:
+            params['cursor'] = request.META['HTTP_LAST_EVENT_ID']
+
+        serializer = BatchResultsSerializer(data=params)
+        serializer.is_valid(raise_exception=True)
+        cursor = serializer.validated_data['cursor']
+
+        if request.accepted_renderer.format == EventStreamRenderer.format:
+            if not batch_exists(pk):
+                raise NotFound('No batch matches the given id.')
+
+            events = stream_events(pk, cursor, settings.TASK_BATCH_STREAM_DURATION)
+            response = StreamingHttpResponse(events, content_type=EventStreamRenderer.media_type)
+            response['Cache-Control'] = 'no-cache'
+            response['X-Accel-Buffering'] = 'no'
+
+            return response
+
+        batch = read_results(pk, cursor, timeout=serializer.validated_data['timeout'])
+        if batch is None:
+            raise NotFound('No batch matches the given id.')
+
+        batch['results'] = [payload for _event_id, payload in batch['results']]
+
+        return Response(batch)
+
 
 # pylint: disable=no-member
 class CustomLoginView(LoginView):
@@ -141,13 +705,18 @@ def signup(request):
         form = CustomUserCreationForm(request.POST)
         if form.is_valid():
             # Save the form, which includes first_name, last_name, and email fields
-            form.save()
-
-            # Log in the user after registration
-            login(request, form.instance)
-
-            # Redirect to the user's profile page
-            return redirect('profile')
+            try:
+                with transaction.atomic():
+                    form.save()
+            except IntegrityError:
+                # Taken by a concurrent signup since the form was validated
+                form.add_error('username', form.username_taken_message)
+            else:
+                # Log in the user after registration
+                login(request, form.instance)
+
+                # Redirect to the user's profile page
+                return redirect('profile')
     else:
         form = CustomUserCreationForm()
 
@@ -171,3 +740,42 @@ def profile(request):
     # Fetch and display user information
     user = request.user
     return render(request, 'src/profile.html', {'user': user})
+
+
+def metrics(request):
+    """
+    metrics View
+
+    Prometheus metrics of the requests of every web worker (merged from the files of
+    `REQUEST_METRICS_DIR`, or of this process only), and of the Celery tasks (from
+    `TASK_METRICS_DIR`). Requires the `METRICS_TOKEN` bearer token, or, when no token
+    is set, a client address of `INTERNAL_IPS`.
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+
+    Returns:
+        HttpResponse: The metrics, in the Prometheus text format.
+
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS:
+            return HttpResponse('Forbidden', status=status.HTTP_403_FORBIDDEN)
+    elif not constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {token}'
+    ):
+        return HttpResponse('Unauthorized', status=status.HTTP_401_UNAUTHORIZED)
+
+    if settings.REQUEST_METRICS_DIR:
+        flush_request_metrics()
+        lines = load_metrics(settings.REQUEST_METRICS_DIR, RequestMetrics).render()
+    else:
+        lines = request_metrics.render()
+
+    if settings.TASK_METRICS_DIR and os.path.isdir(settings.TASK_METRICS_DIR):
+        lines += load_metrics(settings.TASK_METRICS_DIR).render()
+
+    return HttpResponse(
+        '\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
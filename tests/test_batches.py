@@ -0,0 +1,87 @@
+"""
+This module contains test cases for the batches of tasks in 'src.batches'.
+"""
+
+from time import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.batches import build_batch, format_event, read_results
+from src.renderers import EventStreamRenderer
+from src.serializers import BatchResultsSerializer, TaskBatchSerializer
+from src.tasks import run_batch_chunk
+
+
+def test_build_batch_chunks_arg_sets():
+    """
+    Test that a batch is split into one chunk task per `chunk_size` argument sets.
+    """
+    arg_sets = [[i, i] for i in range(5)]
+
+    batch = build_batch('abc', 'src.tasks.my_task', arg_sets, chunk_size=2)
+
+    assert [task.args for task in batch.tasks] == [
+        ('abc', 'src.tasks.my_task', 0, [[0, 0], [1, 1]]),
+        ('abc', 'src.tasks.my_task', 2, [[2, 2], [3, 3]]),
+        ('abc', 'src.tasks.my_task', 4, [[4, 4]]),
+    ]
+
+
+def test_format_event():
+    """
+    Test the format of server-sent events, with and without an id.
+    """
+    assert format_event('result', {'index': 0, 'result': [1, 2]}, '1-0') == (
+        b'id: 1-0\nevent: result\ndata: {"index":0,"result":[1,2]}\n\n'
+    )
+    assert format_event('done', {'total': 1}) == b'event: done\ndata: {"total":1}\n\n'
+    assert EventStreamRenderer().render({'detail': 'Not found.'}) == (
+        b'event: error\ndata: {"detail":"Not found."}\n\n'
+    )
+
+
+def test_batch_serializers():
+    """
+    Test that argument sets must hold two arguments, and that cursors are stream ids.
+    """
+    assert TaskBatchSerializer(data={'args': [[1, 2], ['a', 'b']]}).is_valid()
+    assert not TaskBatchSerializer(data={'args': [[1, 2, 3]]}).is_valid()
+    assert not TaskBatchSerializer(data={'args': []}).is_valid()
+
+    serializer = BatchResultsSerializer(data={'cursor': '1700000000000-3'})
+    assert serializer.is_valid()
+    assert serializer.validated_data['cursor'] == '1700000000000-3'
+    assert not BatchResultsSerializer(data={'cursor': '$'}).is_valid()
+    assert not BatchResultsSerializer(data={'timeout': 3600}).is_valid()
+
+
+def test_read_results_past_deadline_reports_lost():
+    """
+    Test that a batch missing results past its deadline is done, without waiting.
+    """
+    client = MagicMock()
+    client.pipeline.return_value.execute.return_value = [[b'3', str(time() - 1).encode()], 1]
+    client.xread.return_value = [(b'stream', [(b'1-0', {b'data': b'{"index":0}'})])]
+
+    with patch('src.batches.get_client', return_value=client):
+        batch = read_results('abc', timeout=10)
+
+    assert client.xread.call_args.kwargs['block'] is None
+    assert batch['done']
+    assert batch['lost'] == 2
+    assert batch['cursor'] == '1-0'
+
+
+def test_failed_chunk_publishes_remaining_errors():
+    """
+    Test that a chunk failing to publish a result publishes an error for the tasks left.
+    """
+    with patch('src.tasks.publish_result', side_effect=[None, ConnectionError('down')]), \
+            patch('src.tasks.publish_errors') as publish_errors:
+        with pytest.raises(ConnectionError):
+            run_batch_chunk('abc', 'src.tasks.my_task', 10, [[1, 1], [2, 2], [3, 3]])
+
+    batch_id, indexes, error = publish_errors.call_args.args
+    assert (batch_id, list(indexes)) == ('abc', [11, 12])
+    assert error == 'Chunk failed: ConnectionError: down'
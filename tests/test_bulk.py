@@ -0,0 +1,163 @@
+"""
+This module contains test cases for the bulk helpers in 'src.bulk', and for the `bulk/`
+route of the posts they serve.
+"""
+
+import pytest
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from src.bulk import batched
+from src.models import Post
+from src.views import PostViewSet
+from tests.factories import PostFactory
+
+PUB_DATE = '2024-01-01T00:00:00Z'
+
+
+def create_posts(*titles):
+    """
+    Save posts of the given titles, in order.
+    """
+    posts = [PostFactory(title=title, content='Content') for title in titles]
+    for post in posts:
+        post.save()
+
+    return posts
+
+
+def test_batched_splits_items():
+    """
+    Test that items are split in batches of at most the given size, in order.
+    """
+    assert list(batched(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_batched_empty():
+    """
+    Test that no batch is produced for no items.
+    """
+    assert not list(batched([], 3))
+
+
+@pytest.fixture
+def bulk_view():
+    """
+    Return the view of the `bulk/` route of the posts, called by a superuser.
+    """
+    view = PostViewSet.as_view({'post': 'bulk', 'patch': 'bulk_update', 'delete': 'bulk_destroy'})
+    user = User.objects.create_superuser('admin', 'admin@jungle.com', None)
+    factory = APIRequestFactory()
+
+    def call(method, data):
+        request = getattr(factory, method)('/api/posts/bulk/', data, format='json')
+        force_authenticate(request, user=user)
+        return view(request)
+
+    return call
+
+
+@pytest.mark.django_db
+def test_bulk_create(bulk_view):
+    """
+    Test that a JSON array of posts is created in one request.
+    """
+    response = bulk_view('post', [
+        {'title': 'Jungle', 'content': 'Vines', 'pub_date': PUB_DATE},
+        {'title': 'Savanna', 'content': 'Lions', 'pub_date': PUB_DATE},
+    ])
+
+    assert response.status_code == 201
+    assert Post.objects.filter(title__in=['Jungle', 'Savanna']).count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_create_invalid_item_writes_nothing(bulk_view):
+    """
+    Test that one invalid item fails the whole array, with the errors of every item.
+    """
+    response = bulk_view('post', [
+        {'title': 'Jungle', 'content': 'Vines', 'pub_date': PUB_DATE},
+        {'title': 'Savanna', 'content': 'Lions'},
+    ])
+
+    assert response.status_code == 400
+    assert response.data['errors'][0] == {}
+    assert 'pub_date' in response.data['errors'][1]
+    assert not Post.objects.filter(title='Jungle').exists()
+
+
+@pytest.mark.django_db
+def test_bulk_update(bulk_view):
+    """
+    Test that posts are updated by id, with only the fields given.
+    """
+    jungle, savanna = create_posts('Jungle', 'Savanna')
+
+    response = bulk_view('patch', [
+        {'id': jungle.id, 'title': 'Deep jungle'},
+        {'id': str(savanna.id), 'content': 'Lions'},
+    ])
+
+    assert response.status_code == 200
+    jungle.refresh_from_db()
+    savanna.refresh_from_db()
+    assert (jungle.title, jungle.content) == ('Deep jungle', 'Content')
+    assert (savanna.title, savanna.content) == ('Savanna', 'Lions')
+
+
+@pytest.mark.django_db
+def test_bulk_update_invalid_item_rolls_back(bulk_view):
+    """
+    Test that one invalid item leaves every post unchanged.
+    """
+    jungle, savanna = create_posts('Jungle', 'Savanna')
+
+    response = bulk_view('patch', [
+        {'id': jungle.id, 'title': 'Deep jungle'},
+        {'id': savanna.id, 'title': 'x' * 201},
+    ])
+
+    assert response.status_code == 400
+    assert response.data['errors'][0] == {}
+    assert 'title' in response.data['errors'][1]
+    jungle.refresh_from_db()
+    assert jungle.title == 'Jungle'
+
+
+@pytest.mark.django_db
+def test_bulk_update_unknown_id(bulk_view):
+    """
+    Test that an unknown id is reported as the error of its item.
+    """
+    jungle, = create_posts('Jungle')
+
+    response = bulk_view('patch', [
+        {'id': jungle.id, 'title': 'Deep jungle'},
+        {'id': jungle.id + 1000, 'title': 'Savanna'},
+    ])
+
+    assert response.status_code == 400
+    assert response.data['errors'][1] == {'id': ['No post found with this id.']}
+    jungle.refresh_from_db()
+    assert jungle.title == 'Jungle'
+
+
+@pytest.mark.django_db
+def test_bulk_delete(bulk_view):
+    """
+    Test that posts are deleted by ids, and that an empty selection is rejected.
+    """
+    jungle, savanna, _desert = create_posts('Jungle', 'Savanna', 'Desert')
+
+    response = bulk_view('delete', {'ids': [jungle.id, savanna.id]})
+    assert response.status_code == 200
+    assert response.data == {'deleted': 2}
+    titles = ['Jungle', 'Savanna', 'Desert']
+    assert list(Post.objects.filter(title__in=titles).values_list('title', flat=True)) == [
+        'Desert'
+    ]
+
+    count = Post.objects.count()
+    assert bulk_view('delete', {}).status_code == 400
+    assert Post.objects.count() == count
@@ -0,0 +1,180 @@
+"""
+This module contains test cases for the viewset mixins in 'src.caching'.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from src.caching import CachedResponseMixin, ConditionalGetMixin, ResponseCache
+
+ETAG = '"abc"'
+LAST_MODIFIED = datetime(2023, 8, 27, 13, 1, tzinfo=timezone.utc)
+
+
+def test_matching_etag_is_not_modified(request_factory):
+    """
+    Test that a request carrying the current ETag is answered with a 304.
+    """
+    request = request_factory.get('/api/posts/', HTTP_IF_NONE_MATCH=ETAG)
+
+    response = ConditionalGetMixin().get_conditional_response(request, ETAG, LAST_MODIFIED)
+
+    assert response.status_code == 304
+
+
+def test_stale_etag_needs_resource(request_factory):
+    """
+    Test that a request carrying an outdated ETag needs the resource.
+    """
+    request = request_factory.get('/api/posts/', HTTP_IF_NONE_MATCH='"old"')
+
+    response = ConditionalGetMixin().get_conditional_response(request, ETAG, LAST_MODIFIED)
+
+    assert response is None
+
+
+def test_unmodified_since_is_not_modified(request_factory):
+    """
+    Test that a request with an If-Modified-Since not older than the resource gets a 304.
+    """
+    request = request_factory.get(
+        '/api/posts/', HTTP_IF_MODIFIED_SINCE='Sun, 27 Aug 2023 13:01:00 GMT'
+    )
+
+    response = ConditionalGetMixin().get_conditional_response(request, ETAG, LAST_MODIFIED)
+
+    assert response.status_code == 304
+
+
+def test_set_validators():
+    """
+    Test that successful responses carry the ETag and Last-Modified headers.
+    """
+    response = ConditionalGetMixin().set_validators(Response({}), ETAG, LAST_MODIFIED)
+
+    assert response['ETag'] == ETAG
+    assert response['Last-Modified'] == 'Sun, 27 Aug 2023 13:01:00 GMT'
+
+
+@override_settings(API_CACHE_ALIAS='default')
+def test_list_version_follows_the_response_cache():
+    """
+    Test that the version in the list validators is bumped by writes, and empty without
+    a response cache.
+    """
+    view = ConditionalGetMixin()
+    assert view.get_list_version() == ''
+
+    view.response_cache = ResponseCache('test-list-version')
+    version = view.get_list_version()
+    view.response_cache.bump()
+
+    assert view.get_list_version() == version + 1
+
+
+@override_settings(API_CACHE_ALIAS='default')
+def test_response_cache_round_trip(request_factory):
+    """
+    Test that a stored response is served on the next request, and counted as a hit.
+    """
+    request = Request(request_factory.get('/api/posts/?page_size=3'))
+    request.accepted_media_type = 'application/json'
+    response_cache = ResponseCache('test-round-trip')
+
+    cached, key = response_cache.get(request)
+    assert cached is None
+
+    response = HttpResponse(b'[]', content_type='application/json')
+    response['ETag'] = ETAG
+    response_cache.set(key, response)
+
+    cached, _ = response_cache.get(request)
+    assert cached.content == b'[]'
+    assert cached['ETag'] == ETAG
+    assert cached['X-Cache'] == 'HIT'
+    assert response_cache.stats() == {'hits': 1, 'misses': 1, 'hit_ratio': 0.5}
+
+
+@override_settings(API_CACHE_ALIAS='default')
+def test_response_cache_bump_invalidates(request_factory):
+    """
+    Test that bumping the version invalidates the stored responses.
+    """
+    request = Request(request_factory.get('/api/posts/'))
+    request.accepted_media_type = 'application/json'
+    response_cache = ResponseCache('test-bump')
+
+    _, key = response_cache.get(request)
+    response_cache.set(key, HttpResponse(b'[]'))
+    response_cache.bump()
+
+    cached, _ = response_cache.get(request)
+    assert cached is None
+
+
+def test_response_cache_invalidate_on_commit_bumps_once():
+    """
+    Test that the version is bumped once per committed transaction, however many writes
+    scheduled it, and still after a transaction rolled back.
+    """
+    response_cache = ResponseCache('test-on-commit')
+    callbacks = []
+
+    with patch('src.caching.transaction.on_commit',
+               side_effect=lambda func, **kwargs: callbacks.append(func)), \
+            patch.object(response_cache, 'bump') as bump:
+        for _ in range(3):
+            response_cache.invalidate_on_commit()
+        for callback in callbacks:
+            callback()
+        assert bump.call_count == 1
+
+        # A rolled back transaction drops its callbacks without running them
+        response_cache.invalidate_on_commit()
+        callbacks.clear()
+
+        response_cache.invalidate_on_commit()
+        callbacks[-1]()
+        assert bump.call_count == 2
+
+
+@override_settings(API_CACHE_ALIAS='default')
+def test_cached_response_replays_headers_and_validators(request_factory):
+    """
+    Test that a hit replays the headers of the stored response, and that a conditional
+    GET of a hit is answered with a 304 from its stored ETag, without rendering.
+    """
+    view = CachedResponseMixin()
+    view.response_cache = ResponseCache('test-replay')
+    renders = []
+
+    def render():
+        renders.append(1)
+        response = Response({})
+        response['ETag'] = ETAG
+        response['Vary'] = 'Accept'
+        response['Allow'] = 'GET, HEAD'
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = 'application/json'
+        response.renderer_context = {}
+        return response
+
+    def get(**headers):
+        request = Request(request_factory.get('/api/posts/', **headers))
+        request.accepted_renderer = JSONRenderer()
+        request.accepted_media_type = 'application/json'
+        return view.get_cached_response(request, render)
+
+    get().render()
+    cached = get()
+    assert cached['X-Cache'] == 'HIT'
+    assert (cached['ETag'], cached['Vary'], cached['Allow']) == (ETAG, 'Accept', 'GET, HEAD')
+
+    assert get(HTTP_IF_NONE_MATCH=ETAG).status_code == 304
+    assert len(renders) == 1
@@ -0,0 +1,33 @@
+"""
+This module contains test cases for the export encoders in 'src.export'.
+"""
+
+from datetime import datetime, timezone
+
+from src.export import encode_csv, encode_ndjson
+
+FIELDS = ('id', 'title', 'pub_date')
+ROWS = [(1, 'Café, "au lait"', datetime(2023, 8, 27, 13, 1, tzinfo=timezone.utc))]
+
+
+def test_encode_ndjson():
+    """
+    Test that every row is encoded as one JSON object per line.
+    """
+    lines = list(encode_ndjson(ROWS, FIELDS, datetime_fields=('pub_date',)))
+
+    assert lines == [
+        '{"id":1,"title":"Café, \\"au lait\\"","pub_date":"2023-08-27T13:01:00Z"}\n'.encode()
+    ]
+
+
+def test_encode_csv():
+    """
+    Test that rows are encoded as quoted CSV lines after a header line.
+    """
+    lines = list(encode_csv(ROWS, FIELDS, datetime_fields=('pub_date',)))
+
+    assert lines == [
+        'id,title,pub_date\r\n',
+        '1,"Café, ""au lait""",2023-08-27T13:01:00Z\r\n',
+    ]
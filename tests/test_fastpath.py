@@ -0,0 +1,70 @@
+"""
+This module contains test cases for the fast read path in 'src.fastpath'.
+
+The tests check that `ValuesSerializer` gives the same representation as
+`PostSerializer`, on unsaved posts and their `values()` rows, without a database.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils import timezone
+from rest_framework.request import Request
+
+from src.fastpath import ValuesSerializer
+from src.models import Post
+from src.serializers import PostSerializer
+
+
+def make_post():
+    """
+    Build an unsaved post and its `values()` row.
+    """
+    post = Post(
+        id=7,
+        title='Title',
+        content='Content',
+        pub_date=datetime(2023, 8, 27, 13, 1, 2, 345678, tzinfo=dt_timezone.utc),
+        updated_at=datetime(2023, 8, 28, 9, 0, tzinfo=dt_timezone.utc),
+    )
+    row = {field.attname: getattr(post, field.attname) for field in Post._meta.concrete_fields}
+
+    return post, row
+
+
+def test_same_representation():
+    """
+    Test that the fast path represents a row like the serializer.
+    """
+    post, row = make_post()
+    fast = ValuesSerializer(PostSerializer())
+
+    assert fast.to_representation(row) == PostSerializer(post).data
+    assert fast.many([row, row]) == PostSerializer([post, post], many=True).data
+
+
+def test_same_representation_in_other_timezone():
+    """
+    Test that datetimes are converted to the current time zone like the serializer.
+    """
+    post, row = make_post()
+
+    with timezone.override('America/Sao_Paulo'):
+        fast = ValuesSerializer(PostSerializer())
+        expected = PostSerializer(post).data
+
+    assert fast.to_representation(row) == expected
+    assert expected['pub_date'].endswith('-03:00')
+
+
+def test_sparse_fields(request_factory):
+    """
+    Test that the fast path only reads and represents the selected fields.
+    """
+    post, row = make_post()
+    request = Request(request_factory.get('/api/posts/', {'fields': 'id,title'}))
+    serializer = PostSerializer(context={'request': request})
+
+    fast = ValuesSerializer(serializer)
+
+    assert fast.sources == ['id', 'title']
+    assert fast.many([row]) == [{'id': post.id, 'title': post.title}]
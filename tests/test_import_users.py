@@ -0,0 +1,84 @@
+"""
+This module contains test cases for the helpers of the 'import_users' command.
+"""
+
+from django.contrib.auth.hashers import check_password
+from django.test import override_settings
+
+from src.management.commands.import_users import prepare_user, read_records
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+def test_read_records(tmp_path):
+    """
+    Test that CSV and NDJSON files are read as numbered records.
+    """
+    csv_path = tmp_path / 'users.csv'
+    csv_path.write_text('username,password\njane,Jungle-Vine-42\ntarzan,\n', encoding='utf-8')
+    ndjson_path = tmp_path / 'users.ndjson'
+    ndjson_path.write_text('{"username": "jane"}\n\n{"username": "tarzan"}\n', encoding='utf-8')
+
+    assert list(read_records(csv_path, 'csv')) == [
+        (1, {'username': 'jane', 'password': 'Jungle-Vine-42'}),
+        (2, {'username': 'tarzan', 'password': ''}),
+    ]
+    assert list(read_records(ndjson_path, 'ndjson')) == [
+        (1, {'username': 'jane'}),
+        (2, {'username': 'tarzan'}),
+    ]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+def test_prepare_user_hashes_password():
+    """
+    Test that a valid record gets its password hashed, and its email normalized.
+    """
+    record = {'username': 'jane', 'password': 'Jungle-Vine-42', 'email': 'jane@JUNGLE.com'}
+
+    number, fields, errors = prepare_user((7, record))
+
+    assert (number, errors) == (7, [])
+    assert fields['email'] == 'jane@jungle.com'
+    assert check_password('Jungle-Vine-42', fields['password'])
+
+
+def test_prepare_user_reports_errors():
+    """
+    Test that an invalid record is reported with the messages of every failing check.
+    """
+    number, fields, errors = prepare_user((3, {'username': 'ta rzan', 'password': '1234'}))
+
+    assert (number, fields) == (3, None)
+    assert errors[0].startswith('username: ')
+    assert 'password: This password is entirely numeric.' in errors
+    assert len(errors) == 4
+
+
+def test_prepare_user_rejects_values_of_other_types():
+    """
+    Test that NDJSON values which are not strings are reported, not raised.
+    """
+    number, fields, errors = prepare_user((4, {'username': 42, 'email': ['jane']}))
+    assert (number, fields) == (4, None)
+    assert errors == ['username: Not a string.', 'email: Not a string.']
+
+    assert prepare_user((5, ['jane'])) == (5, None, ['record: Not an object.'])
+
+
+def test_malformed_ndjson_lines_are_reported(tmp_path):
+    """
+    Test that a malformed NDJSON line is reported as the errors of its record, and the
+    next lines still read.
+    """
+    path = tmp_path / 'users.ndjson'
+    path.write_text('{"username": "jane"}\n{"username": \n{"username": "tarzan"}\n',
+                    encoding='utf-8')
+
+    records = list(read_records(path, 'ndjson'))
+    assert [number for number, _record in records] == [1, 2, 3]
+    assert records[2] == (3, {'username': 'tarzan'})
+
+    number, fields, errors = prepare_user(records[1])
+    assert (number, fields) == (2, None)
+    assert errors[0].startswith('record: Invalid JSON: ')
@@ -0,0 +1,85 @@
+"""
+This module contains test cases for the bulk post loader in 'src.loaders'.
+"""
+
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db.backends.postgresql.operations import DatabaseOperations
+
+from src.loaders import copy_objects, iter_json_array, load_posts
+from src.models import Post
+
+
+def test_iter_json_array_across_chunks():
+    """
+    Test that the items of an array are parsed one at a time, whatever the chunk size.
+    """
+    text = ' [ {"title": "a, b]"}, 12345, "x", [1, 2], null ] '
+
+    for chunk_size in (1, 2, 7, 1024):
+        items = list(iter_json_array(StringIO(text), chunk_size=chunk_size))
+        assert items == [{'title': 'a, b]'}, 12345, 'x', [1, 2], None]
+
+
+def test_iter_json_array_empty():
+    """
+    Test that an empty array yields no item.
+    """
+    assert not list(iter_json_array(StringIO('[]')))
+
+
+@pytest.mark.parametrize('text', ['', '{"title": "a"}', '[{"title": "a"}', '[{"title": '])
+def test_iter_json_array_invalid(text):
+    """
+    Test that files not holding a complete JSON array are rejected.
+    """
+    with pytest.raises(ValueError):
+        list(iter_json_array(StringIO(text), chunk_size=4))
+
+
+def test_copy_objects_escapes_values():
+    """
+    Test that the posts are sent to COPY as escaped, tab-separated rows.
+    """
+    cursor = MagicMock()
+    connection = MagicMock(ops=DatabaseOperations(connection=None))
+    connection.cursor.return_value.__enter__.return_value = cursor
+
+    post = Post(title='Tab\there', content='Line\nand \\ slash', pub_date='2024-01-01T00:00Z')
+
+    with patch('src.loaders.connections', {'default': connection}):
+        copy_objects(Post, [post])
+
+    sql, data = cursor.copy_expert.call_args[0]
+    title, content, pub_date, updated_at, search_vector = data.read().rstrip('\n').split('\t')
+
+    assert sql == (
+        'COPY "src_post" ("title", "content", "pub_date", "updated_at", "search_vector") '
+        'FROM STDIN'
+    )
+    assert (title, content) == ('Tab\\there', 'Line\\nand \\\\ slash')
+    assert pub_date == '2024-01-01 00:00:00+00:00'
+    assert updated_at and search_vector == '\\N'
+
+
+def test_load_posts_invalidates_cache_per_batch(tmp_path):
+    """
+    Test that the cached post responses are invalidated after each batch written.
+    """
+    path = tmp_path / 'posts.json'
+    path.write_text(
+        '[' + ', '.join(
+            f'{{"title": "t{i}", "content": "c", "pub_date": "2023-08-27T13:01:00Z"}}'
+            for i in range(5)
+        ) + ']',
+        encoding='utf-8',
+    )
+
+    with patch('src.loaders.insert_objects') as insert_objects, \
+            patch('src.loaders.post_cache.invalidate_on_commit') as invalidate_on_commit:
+        assert list(load_posts(Post, path, batch_size=2)) == [2, 4, 5]
+
+    assert insert_objects.call_count == 3
+    assert invalidate_on_commit.call_count == 3
@@ -0,0 +1,122 @@
+"""
+This module contains test cases for the logging handler, filter and formatter in 'setup.logs'.
+"""
+
+import json
+import logging
+from logging.handlers import WatchedFileHandler
+from unittest.mock import patch
+
+from setup.logs import JsonFormatter, QueuedFileHandler, RateLimitFilter
+
+
+def make_record(name='jungle', level=logging.INFO, msg='Hello %s', args=('Jane',)):
+    """
+    Return a log record.
+    """
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_queued_file_handler_writes_in_background(tmp_path):
+    """
+    Test that records are formatted and written by the background thread.
+    """
+    path = tmp_path / 'test.log'
+    handler = QueuedFileHandler(str(path))
+    handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+
+    handler.handle(make_record())
+    handler.close()
+
+    assert path.read_text(encoding='utf-8') == 'INFO Hello Jane\n'
+    # Reopened when moved, rather than rotated by each process
+    assert isinstance(handler.target, WatchedFileHandler)
+
+
+def test_queued_file_handler_drops_when_full(tmp_path):
+    """
+    Test that records are dropped, and never waited for, when the queue is full.
+    """
+    handler = QueuedFileHandler(str(tmp_path / 'test.log'), queue_size=2)
+    handler.listener.stop()
+
+    for _ in range(3):
+        handler.handle(make_record(level=logging.WARNING))
+
+    assert handler.dropped == 1
+    handler.listener = None
+    handler.close()
+
+
+def test_queued_file_handler_samples_debug_under_load(tmp_path):
+    """
+    Test that only a sample of the DEBUG records is kept while the queue is over half full.
+    """
+    handler = QueuedFileHandler(str(tmp_path / 'test.log'), queue_size=100, debug_sample_rate=0.25)
+    handler.listener.stop()
+
+    for _ in range(60):
+        handler.handle(make_record(level=logging.DEBUG))
+
+    # The first 51 records fill the queue past half, then 1 out of 4 is kept
+    assert handler.queue.qsize() == 51 + 2
+    assert handler.sampled_out == 7
+    handler.listener = None
+    handler.close()
+
+
+def test_queued_file_handler_reports_losses(tmp_path):
+    """
+    Test that the numbers of records lost are written once, and only when they changed.
+    """
+    path = tmp_path / 'test.log'
+    handler = QueuedFileHandler(str(path), queue_size=1)
+    handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+    handler.listener.stop()
+
+    for _ in range(3):
+        handler.handle(make_record(level=logging.WARNING))
+    handler.report_losses(force=True)
+    handler.report_losses(force=True)
+
+    handler.listener = None
+    handler.close()
+
+    assert path.read_text(encoding='utf-8') == (
+        'WARNING Log records lost: 2 dropped (queue full), 0 DEBUG records sampled out\n'
+    )
+
+
+def test_rate_limit_filter():
+    """
+    Test that the records of a logger over its rate are dropped, and counted on the next.
+    """
+    rate_limit = RateLimitFilter(rate=1, burst=2)
+
+    with patch('setup.logs.monotonic', return_value=100.0):
+        passed = [rate_limit.filter(make_record()) for _ in range(4)]
+        other = rate_limit.filter(make_record(name='other'))
+        error = rate_limit.filter(make_record(level=logging.ERROR))
+
+    assert passed == [True, True, False, False]
+    assert other and error
+
+    record = make_record()
+    with patch('setup.logs.monotonic', return_value=101.0):
+        assert rate_limit.filter(record)
+    assert record.suppressed == 2
+
+
+def test_json_formatter():
+    """
+    Test that a record is formatted as one JSON object.
+    """
+    record = make_record()
+    record.suppressed = 3
+
+    data = json.loads(JsonFormatter().format(record))
+
+    assert data['level'] == 'INFO'
+    assert data['logger'] == 'jungle'
+    assert data['message'] == 'Hello Jane'
+    assert data['suppressed'] == 3
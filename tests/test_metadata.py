@@ -0,0 +1,46 @@
+"""
+This module contains test cases for the project metadata in 'setup.metadata'.
+"""
+
+from setup.metadata import get_project_metadata, parse_authors, read_pyproject
+
+
+def test_read_pyproject_unquotes_values(tmp_path):
+    """
+    Test that TOML strings and arrays are decoded, and other values left as written.
+    """
+    path = tmp_path / 'pyproject.toml'
+    path.write_text(
+        '[tool.poetry]\n'
+        'name = "tarzan"\n'
+        'authors = ["Jane Porter <jane@jungle.com>", "Cheeta"]\n'
+        'packages = [{include = "src"}]\n',
+        encoding='utf-8',
+    )
+
+    assert read_pyproject(path) == {
+        'name': 'tarzan',
+        'authors': ['Jane Porter <jane@jungle.com>', 'Cheeta'],
+        'packages': '[{include = "src"}]',
+    }
+
+
+def test_parse_authors():
+    """
+    Test that authors are split into their name and email, the email being optional.
+    """
+    assert parse_authors(['Jane Porter <jane@jungle.com>', 'Cheeta']) == [
+        {'name': 'Jane Porter', 'email': 'jane@jungle.com'},
+        {'name': 'Cheeta', 'email': ''},
+    ]
+
+
+def test_get_project_metadata():
+    """
+    Test that the metadata of the project's pyproject.toml is read without quotes.
+    """
+    metadata = get_project_metadata()
+
+    assert metadata['name'] == 'tarzan'
+    assert metadata['license'] == 'MIT'
+    assert metadata['authors'][0]['email'] == 'brunolnetto@gmail.com'
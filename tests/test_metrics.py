@@ -0,0 +1,182 @@
+"""
+This module contains test cases for the task and request metrics in 'src.metrics'.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from socket import gethostname
+from threading import Thread
+from time import time
+
+import pytest
+
+from src.metrics import (
+    BUCKETS,
+    RETIRED_FILE,
+    Histogram,
+    ProcessMetrics,
+    RequestMetrics,
+    TaskMetrics,
+    load_metrics,
+    process_file_name,
+)
+
+TASK = 'src.tasks.my_task'
+
+
+def test_histogram_buckets_and_quantiles():
+    """
+    Test that values fall into their bucket, and quantiles into the right bound.
+    """
+    histogram = Histogram()
+    for value in (0.0005, 0.001, 0.003, 0.2, 0.2, 1000):
+        histogram.observe(value)
+
+    assert histogram.counts[BUCKETS.index(0.001)] == 2
+    assert histogram.counts[BUCKETS.index(0.25)] == 2
+    assert histogram.counts[-1] == 1
+    assert histogram.quantile(0.5) == 0.005
+    assert histogram.quantile(0.8) == 0.25
+    assert histogram.quantile(1) == float('inf')
+    assert Histogram().quantile(0.5) is None
+
+
+def test_task_metrics_record_runs():
+    """
+    Test that a run records its queue wait, run time and outcome.
+    """
+    metrics = TaskMetrics()
+
+    metrics.start('1', TASK, published_at=time() - 0.5)
+    metrics.finish('1', TASK, 'SUCCESS')
+    metrics.start('2', TASK, published_at=None)
+    metrics.fail(TASK, ValueError('boom'))
+    metrics.finish('2', TASK, 'FAILURE')
+
+    task = metrics.tasks[TASK]
+    assert task['queue_wait'].count == 1
+    assert 0.5 <= task['queue_wait'].sum < 1
+    assert task['run_time'].count == 2
+    assert task['outcomes'] == {'SUCCESS': 1, 'FAILURE': 1}
+    assert task['exceptions'] == {'ValueError': 1}
+
+
+def test_metrics_files_are_merged(tmp_path):
+    """
+    Test that the files of several processes are merged, and rendered for Prometheus.
+    """
+    metrics = TaskMetrics()
+    metrics.start('1', TASK, published_at=time())
+    metrics.finish('1', TASK, 'SUCCESS')
+    metrics.flush(tmp_path)
+    assert (tmp_path / process_file_name()).exists()
+    assert process_file_name().startswith(f'{gethostname()}-{os.getpid()}-')
+
+    # The file of a worker process of another host
+    (tmp_path / 'other-1-0.json').write_text(json.dumps(metrics.to_dict()), encoding='utf-8')
+
+    merged = load_metrics(tmp_path)
+
+    assert merged.tasks[TASK]['outcomes'] == {'SUCCESS': 2}
+    assert merged.tasks[TASK]['run_time'].count == 2
+
+    lines = merged.render()
+    assert f'celery_task_run_time_seconds_count{{task="{TASK}"}} 2' in lines
+    assert f'celery_task_run_time_seconds_bucket{{task="{TASK}",le="+Inf"}} 2' in lines
+    assert f'celery_task_outcomes_total{{task="{TASK}",state="SUCCESS"}} 2' in lines
+
+
+def test_request_metrics_record_and_merge(tmp_path):
+    """
+    Test that requests are recorded per view, and merged across processes with the
+    integer counters of their caches.
+    """
+    metrics = RequestMetrics()
+    metrics.record('post-list', 200, 0.02, {'db': 0.01}, {'db': 3, 'cache': 1})
+    metrics.record('post-list', 404, 0.002, {}, {})
+    metrics.set_cache_stats('posts', {'hits': 2, 'misses': 1, 'hit_ratio': 0.67})
+    metrics.flush(str(tmp_path))
+
+    other = RequestMetrics.from_dict(metrics.to_dict())
+    (tmp_path / 'other.json').write_text(json.dumps(other.to_dict()), encoding='utf-8')
+
+    merged = load_metrics(tmp_path, RequestMetrics)
+    view = merged.views['post-list']
+
+    assert view['duration'].count == 4
+    assert view['db'].sum == 0.02
+    assert view['statuses'] == {'200': 2, '404': 2}
+    assert view['queries'] == 6
+    assert merged.caches == {'posts': {'hits': 4, 'misses': 2}}
+
+    lines = merged.render()
+    assert 'http_requests_total{view="post-list",status="404"} 2' in lines
+    assert 'http_request_queries_total{view="post-list"} 6' in lines
+    assert 'app_cache_hits_total{cache="posts"} 4' in lines
+    assert '# TYPE http_request_template_seconds histogram' in lines
+
+
+def test_files_of_exited_processes_are_retired(tmp_path):
+    """
+    Test that the files of exited processes are folded into the retired file once, and
+    their counters kept, without the gauges of their caches.
+    """
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+
+    metrics = RequestMetrics()
+    metrics.record('post-list', 200, 0.02, {}, {})
+    metrics.set_cache_stats('resolver', {'hits': 2, 'size': 10})
+    data = json.dumps(metrics.to_dict())
+    (tmp_path / f'{gethostname()}-{process.pid}-0.json').write_text(data, encoding='utf-8')
+    (tmp_path / process_file_name()).write_text(data, encoding='utf-8')
+
+    for _ in range(2):
+        merged = load_metrics(tmp_path, RequestMetrics)
+        assert merged.views['post-list']['statuses'] == {'200': 2}
+        assert merged.caches == {'resolver': {'hits': 4, 'size': 10}}
+
+    assert sorted(path.name for path in tmp_path.glob('*.json')) == sorted(
+        [RETIRED_FILE, process_file_name()]
+    )
+
+
+def test_concurrent_flushes_do_not_fail(tmp_path):
+    """
+    Test that the threads of a process flush concurrently without error, leaving a
+    single complete file, and that a failed write is logged instead of raised.
+    """
+    metrics = RequestMetrics()
+    metrics.record('post-list', 200, 0.02, {}, {})
+    errors = []
+
+    def flush():
+        try:
+            for _ in range(200):
+                metrics.flush(str(tmp_path))
+        except Exception as error:  # pylint: disable=W0718
+            errors.append(error)
+
+    threads = [Thread(target=flush) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert [path.name for path in tmp_path.iterdir()] == [process_file_name()]
+    assert load_metrics(tmp_path, RequestMetrics).views['post-list']['statuses'] == {'200': 1}
+
+    blocker = tmp_path / 'file'
+    blocker.write_text('', encoding='utf-8')
+    metrics.flush(str(blocker / 'metrics'))
+
+
+def test_process_metrics_is_abstract():
+    """
+    Test that metrics classes must define how they merge and serialize.
+    """
+    with pytest.raises(TypeError):
+        ProcessMetrics()
@@ -21,6 +21,16 @@ the provided test cases. Actual behavior may vary depending on the real implemen
 middleware.
 """
 
+import asyncio
+
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.test import override_settings
+
+from src.metrics import request_metrics
+from src.middleware import RedirectMiddleware, RequestTimingMiddleware
+from src.timing import timed
+
 REDIRECT_URL = '/api/'
 VALID_URL = REDIRECT_URL
 INVALID_URL = '/invalid/'
@@ -48,3 +58,71 @@ def test_valid_url(middleware, request_factory):
     request = request_factory.get(VALID_URL)
     response = middleware(request)
     assert response == '42'
+
+
+def test_invalid_url_redirected(middleware, request_factory):
+    """
+    Test that an invalid URL is redirected, including when its 404 is cached.
+    """
+    for _ in range(2):
+        response = middleware(request_factory.get(INVALID_URL))
+
+        assert response.status_code == 302
+        assert response.url == REDIRECT_URL
+
+
+def test_async_mode(request_factory):
+    """
+    Test that the middleware runs natively in an async chain.
+    """
+
+    async def get_response(request):
+        return '42'
+
+    middleware = RedirectMiddleware(get_response)
+
+    assert iscoroutinefunction(middleware)
+    assert asyncio.run(middleware(request_factory.get(VALID_URL))) == '42'
+    assert asyncio.run(middleware(request_factory.get(INVALID_URL))).status_code == 302
+
+
+def timed_view(request):
+    """
+    A view spending time in a database call.
+    """
+    with timed('db'):
+        return HttpResponse('42')
+
+
+@override_settings(REQUEST_METRICS_DIR='')
+def test_request_timing(request_factory):
+    """
+    Test that the timings of a request are sent in a Server-Timing header, and recorded
+    per view name.
+    """
+    middleware = RequestTimingMiddleware(timed_view)
+    request = request_factory.get(VALID_URL)
+    before = request_metrics.views.get('<unresolved>', {}).get('queries', 0)
+
+    response = middleware(request)
+
+    assert response['Server-Timing'].startswith('total;dur=')
+    assert 'db;dur=' in response['Server-Timing']
+    assert 'desc="1 queries"' in response['Server-Timing']
+    assert request_metrics.views['<unresolved>']['queries'] == before + 1
+
+
+@override_settings(REQUEST_METRICS_DIR='')
+def test_request_timing_async(request_factory):
+    """
+    Test that the timing middleware runs natively in an async chain.
+    """
+
+    async def get_response(request):
+        return timed_view(request)
+
+    middleware = RequestTimingMiddleware(get_response)
+    response = asyncio.run(middleware(request_factory.get(VALID_URL)))
+
+    assert iscoroutinefunction(middleware)
+    assert 'db;dur=' in response['Server-Timing']
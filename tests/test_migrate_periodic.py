@@ -0,0 +1,97 @@
+"""
+This module contains test cases for the helpers of the 'migrate_periodic' command.
+"""
+
+from unittest.mock import MagicMock
+
+from django.db import DatabaseError
+
+from src.management.commands.migrate_periodic import (
+    Command,
+    TimedMigrateCommand,
+    fingerprint,
+    migration_files,
+)
+
+
+def fake_connection(rows=None, error=None):
+    """
+    Return a connection whose cursor returns some rows, or raises an error.
+    """
+    cursor = MagicMock()
+    cursor.fetchall.return_value = rows
+    cursor.execute.side_effect = error
+
+    connection = MagicMock(vendor='sqlite')
+    connection.cursor.return_value.__enter__.return_value = cursor
+
+    return connection
+
+
+def test_migration_files():
+    """
+    Test that the migration files of every app are listed, without the package modules.
+    """
+    files = migration_files()
+
+    assert ('src', '0001_initial') in files
+    assert ('src', '0004_post_updated_at') in files
+    assert ('auth', '0001_initial') in files
+    assert not any(name.startswith('_') for _app, name in files)
+
+
+def test_fingerprint():
+    """
+    Test that the fingerprint depends on the migrations, not on their order.
+    """
+    migrations = [('src', '0001_initial'), ('auth', '0001_initial')]
+
+    assert fingerprint(migrations) == fingerprint(reversed(migrations))
+    assert fingerprint(migrations) != fingerprint(migrations[:1])
+    assert len(fingerprint(migrations)) == 12
+
+
+def test_pending():
+    """
+    Test that the pending migrations are the files not recorded as applied.
+    """
+    files = {('src', '0001_initial'), ('src', '0002_post_pub_date_id_idx')}
+    applied = [('src', '0001_initial'), ('auth', '0001_initial')]
+
+    assert Command.pending(fake_connection(applied), files) == {
+        ('src', '0002_post_pub_date_id_idx')
+    }
+    assert Command.pending(fake_connection(applied + list(files)), files) == set()
+
+
+def test_pending_without_migrations_table():
+    """
+    Test that every file is pending when the migrations table does not exist.
+    """
+    files = {('src', '0001_initial')}
+
+    assert Command.pending(fake_connection(error=DatabaseError), files) == files
+
+
+def test_lock_skipped_on_other_databases():
+    """
+    Test that the advisory lock is only taken on PostgreSQL.
+    """
+    connection = fake_connection()
+
+    assert Command.lock(connection, wait=True)
+    connection.cursor.assert_not_called()
+
+
+def test_timed_migrate_records_timings():
+    """
+    Test that the time taken by each migration applied is recorded.
+    """
+    command = TimedMigrateCommand()
+    command.verbosity = 0
+
+    command.migration_progress_callback('apply_start', 'src.0001_initial')
+    command.migration_progress_callback('apply_success', 'src.0001_initial')
+
+    assert [migration for migration, _elapsed in command.timings] == ['src.0001_initial']
+    assert command.timings[0][1] >= 0
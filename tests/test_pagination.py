@@ -0,0 +1,90 @@
+"""
+This module contains test cases for the keyset pagination classes in 'src.pagination'.
+
+The tests cover the seek filter built from a cursor position, the encoding of cursor
+positions and the links generated for a page. They do not need a database: pages are
+fed to the paginator as plain lists of rows.
+"""
+
+from datetime import datetime, timezone
+
+from django.db.models import Q
+import pytest
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from src.pagination import PostKeysetPagination, seek_filter
+
+
+def test_seek_filter_descending():
+    """
+    Test the filter selecting the rows after a position on a descending ordering.
+    """
+    condition = seek_filter(('-pub_date', '-id'), ['2023-08-27T13:01:00', 7])
+    expected = Q(pub_date__lt='2023-08-27T13:01:00') | Q(
+        pub_date='2023-08-27T13:01:00', id__lt=7
+    )
+    assert condition == expected
+
+
+def test_seek_filter_mixed_directions():
+    """
+    Test the filter selecting the rows after a position on a mixed ordering.
+    """
+    condition = seek_filter(('rank', '-id'), [0.5, 3])
+    assert condition == Q(rank__gt=0.5) | Q(rank=0.5, id__lt=3)
+
+
+def test_position_round_trip():
+    """
+    Test that a row's ordering values survive encoding into a cursor position.
+    """
+    paginator = PostKeysetPagination()
+    row = {'id': 42, 'pub_date': datetime(2023, 8, 27, 13, 1, tzinfo=timezone.utc)}
+
+    position = paginator.encode_position(row)
+
+    assert paginator.decode_position(position) == ['2023-08-27T13:01:00+00:00', 42]
+
+
+def test_invalid_position():
+    """
+    Test that a position not matching the ordering is rejected.
+    """
+    paginator = PostKeysetPagination()
+
+    with pytest.raises(NotFound):
+        paginator.decode_position('[1]')
+
+    with pytest.raises(NotFound):
+        paginator.decode_position('not json')
+
+
+def test_page_links(request_factory):
+    """
+    Test the next and previous links of a first and a following page.
+    """
+    rows = [
+        {'id': index, 'pub_date': datetime(2023, 8, 27, 13, index, tzinfo=timezone.utc)}
+        for index in range(3, 0, -1)
+    ]
+
+    paginator = PostKeysetPagination()
+    paginator.request = Request(request_factory.get('/api/posts/', {'page_size': 2}))
+    paginator.page_size = paginator.get_page_size(paginator.request)
+    paginator.base_url = 'http://testserver/api/posts/?page_size=2'
+    paginator.cursor = paginator.decode_cursor(paginator.request)
+
+    page = paginator.set_page(rows)
+
+    assert page == rows[:2]
+    assert paginator.get_previous_link() is None
+    assert 'cursor=' in paginator.get_next_link()
+
+    next_request = Request(request_factory.get(paginator.get_next_link()))
+    paginator.cursor = paginator.decode_cursor(next_request)
+    paginator.set_page(rows[2:])
+
+    assert paginator.cursor.position == '["2023-08-27T13:02:00+00:00",2]'
+    assert paginator.get_next_link() is None
+    assert paginator.get_previous_link() is not None
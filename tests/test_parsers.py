@@ -0,0 +1,36 @@
+"""
+This module contains test cases for the parsers in 'src.parsers'.
+"""
+
+from io import BytesIO
+
+import msgpack
+import pytest
+from rest_framework.exceptions import ParseError
+
+from src.parsers import MessagePackParser, ORJSONParser
+
+
+def test_orjson_parser():
+    """
+    Test that JSON bodies are parsed, and invalid ones rejected.
+    """
+    parser = ORJSONParser()
+
+    assert parser.parse(BytesIO('[{"title": "Café"}]'.encode())) == [{'title': 'Café'}]
+
+    with pytest.raises(ParseError):
+        parser.parse(BytesIO(b'{"title": NaN}'))
+
+
+def test_msgpack_parser():
+    """
+    Test that MessagePack bodies are parsed, and invalid ones rejected.
+    """
+    parser = MessagePackParser()
+    data = [{'title': 'Café', 'content': 'Content'}]
+
+    assert parser.parse(BytesIO(msgpack.packb(data))) == data
+
+    with pytest.raises(ParseError):
+        parser.parse(BytesIO(b'\xc1'))
@@ -0,0 +1,143 @@
+"""
+This module contains test cases for the common password checks in 'src.passwords'.
+"""
+
+from django.contrib.auth.password_validation import (
+    MinimumLengthValidator,
+    NumericPasswordValidator,
+    UserAttributeSimilarityValidator,
+)
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import override_settings
+import pytest
+
+from src.passwords import (
+    PasswordPipeline,
+    SharedCommonPasswordValidator,
+    SortedPasswordFile,
+    get_common_passwords,
+    get_password_pipeline,
+    is_common_password,
+)
+
+
+def test_django_list_loaded_once():
+    """
+    Test that Django's list is loaded once, and matches normalized passwords.
+    """
+    assert get_common_passwords() is get_common_passwords()
+    assert is_common_password(' PassWord ')
+    assert not is_common_password('correct horse battery staple')
+
+
+def test_sorted_password_file(tmp_path):
+    """
+    Test the binary search of a sorted password file, on every line and between them.
+    """
+    passwords = sorted(['abc', 'abcd', 'hunter2', 'zz', 'é'], key=str.encode)
+    path = tmp_path / 'passwords.txt'
+    path.write_bytes(''.join(f'{password}\n' for password in passwords).encode())
+
+    sorted_file = SortedPasswordFile(path)
+
+    for password in passwords:
+        assert password in sorted_file
+    for password in ['', 'a', 'abcc', 'abcde', 'zzz', 'hunter']:
+        assert password not in sorted_file
+
+
+def test_empty_password_file(tmp_path):
+    """
+    Test that an empty file holds no password.
+    """
+    path = tmp_path / 'empty.txt'
+    path.write_bytes(b'')
+
+    assert 'password' not in SortedPasswordFile(path)
+
+
+def test_build_common_passwords(tmp_path):
+    """
+    Test that the built file merges the lists into sorted, unique, normalized lines.
+    """
+    source = tmp_path / 'breached.txt'
+    source.write_text('Zebra\nhunter2\n\nHUNTER2\nabc\tdef\napple\n', encoding='utf-8')
+    output = tmp_path / 'passwords.txt'
+
+    call_command('build_common_passwords', str(source), output=str(output), no_django=True,
+                 run_size=2, stdout=open(tmp_path / 'out.txt', 'w', encoding='utf-8'))
+
+    assert output.read_bytes() == b'apple\nhunter2\nzebra\n'
+
+
+def test_shared_validator(tmp_path):
+    """
+    Test that the validator rejects the passwords of the configured file.
+    """
+    path = tmp_path / 'passwords.txt'
+    path.write_bytes(b'hunter2\n')
+
+    get_common_passwords.cache_clear()
+    try:
+        with override_settings(COMMON_PASSWORDS_FILE=str(path)):
+            with pytest.raises(ValidationError) as error:
+                SharedCommonPasswordValidator().validate('Hunter2')
+            SharedCommonPasswordValidator().validate('password')
+    finally:
+        get_common_passwords.cache_clear()
+
+    assert error.value.code == 'password_too_common'
+
+
+def test_pipeline_orders_rules_by_cost():
+    """
+    Test that the pipeline of the settings runs the cheap rules first.
+    """
+    names = [type(rule).__name__ for rule in get_password_pipeline().rules]
+
+    assert names == [
+        'MinimumLengthValidator',
+        'NumericPasswordValidator',
+        'SharedCommonPasswordValidator',
+        'UserAttributeSimilarityValidator',
+    ]
+
+
+def test_pipeline_collects_or_stops():
+    """
+    Test that the pipeline collects every error, or stops at the first one.
+    """
+    pipeline = PasswordPipeline(
+        [UserAttributeSimilarityValidator(), NumericPasswordValidator(), MinimumLengthValidator()]
+    )
+
+    errors, timings = pipeline.run('1234')
+    assert [error.code for error in errors] == ['password_too_short', 'password_entirely_numeric']
+    assert [name for name, _ in timings] == [
+        'MinimumLengthValidator',
+        'NumericPasswordValidator',
+        'UserAttributeSimilarityValidator',
+    ]
+
+    errors, timings = pipeline.run('1234', fail_fast=True)
+    assert [error.code for error in errors] == ['password_too_short']
+    assert len(timings) == 1
+
+    assert pipeline.stats()['MinimumLengthValidator']['calls'] == 2
+    assert pipeline.stats()['UserAttributeSimilarityValidator']['calls'] == 1
+
+
+def test_pipeline_validates_against_user():
+    """
+    Test that the pipeline raises the errors, and checks the similarity to the user.
+    """
+    pipeline = get_password_pipeline()
+    user = User(username='tarzanjungle', email='tarzan@jungle.com')
+
+    with pytest.raises(ValidationError) as error:
+        pipeline.validate('tarzanjungle', user)
+
+    assert [e.code for e in error.value.error_list] == ['password_too_similar']
+    pipeline.validate('tarzanjungle')
@@ -0,0 +1,70 @@
+"""
+This module contains test cases for the renderers in 'src.renderers'.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+import json
+from uuid import UUID
+
+import msgpack
+from rest_framework.renderers import JSONRenderer
+
+from src.renderers import MessagePackRenderer, ORJSONRenderer
+
+DATA = {
+    'id': 1,
+    'title': 'Café',
+    'pub_date': '2023-08-27T13:01:00Z',
+    'tags': ['a', 'b'],
+    'score': None,
+}
+
+
+def test_orjson_same_as_json_renderer():
+    """
+    Test that the orjson renderer gives the same JSON as DRF's renderer.
+    """
+    content = ORJSONRenderer().render(DATA, 'application/json')
+
+    assert json.loads(content) == json.loads(JSONRenderer().render(DATA, 'application/json'))
+
+
+def test_orjson_native_types():
+    """
+    Test that datetimes, Decimals and UUIDs are encoded natively.
+    """
+    data = {
+        'date': datetime(2023, 8, 27, 13, 1, tzinfo=timezone.utc),
+        'price': Decimal('1.10'),
+        'uuid': UUID(int=1),
+    }
+
+    content = ORJSONRenderer().render(data)
+
+    assert json.loads(content) == {
+        'date': '2023-08-27T13:01:00Z',
+        'price': '1.10',
+        'uuid': '00000000-0000-0000-0000-000000000001',
+    }
+
+
+def test_orjson_indent_and_line_separators():
+    """
+    Test the `indent` media type parameter and the escaping of line separators.
+    """
+    renderer = ORJSONRenderer()
+
+    assert b'\n  "a"' in renderer.render({'a': 1}, 'application/json; indent=4')
+    assert renderer.render([' ']) == b'["\\u2028"]'
+    assert renderer.render(None) == b''
+
+
+def test_msgpack_round_trip():
+    """
+    Test that MessagePack payloads decode to the same data, and are smaller than JSON.
+    """
+    content = MessagePackRenderer().render(DATA)
+
+    assert msgpack.unpackb(content) == DATA
+    assert len(content) < len(ORJSONRenderer().render(DATA))
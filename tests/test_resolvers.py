@@ -0,0 +1,67 @@
+"""
+This module contains test cases for the resolver cache in 'src.resolvers'.
+"""
+
+from django.urls import Resolver404
+import pytest
+
+from src.resolvers import ResolverCache
+
+
+def test_hits_and_evictions():
+    """
+    Test that resolutions are cached, and the least recently used evicted.
+    """
+    cache = ResolverCache(size=2, negative_size=2)
+
+    match = cache.resolve('/api/posts/')
+    assert cache.resolve('/api/posts/') is match
+    cache.resolve('/api/users/')
+    cache.resolve('/api/posts/')
+    cache.resolve('/api/signup/')
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (2, 3, 1)
+
+    # '/api/users/' was the least recently used
+    cache.resolve('/api/posts/')
+    cache.resolve('/api/users/')
+    assert cache.stats()['misses'] == 4
+
+
+def test_not_found_kept_apart():
+    """
+    Test that unresolved paths never evict the matches of resolved ones.
+    """
+    cache = ResolverCache(size=2, negative_size=2)
+    match = cache.resolve('/api/posts/')
+
+    for index in range(10):
+        with pytest.raises(Resolver404):
+            cache.resolve(f'/probe-{index}/')
+
+    with pytest.raises(Resolver404):
+        cache.resolve('/probe-9/')
+
+    stats = cache.stats()
+    assert cache.resolve('/api/posts/') is match
+    assert stats['negative_evictions'] == 8
+    assert stats['negative_size'] == 2
+    assert stats['evictions'] == 0
+
+
+def test_unique_paths_kept_on_probation():
+    """
+    Test that a flood of unique valid paths never evicts a path requested again.
+    """
+    cache = ResolverCache(size=8, negative_size=2, probation_size=2)
+    cache.resolve('/api/posts/')
+    match = cache.resolve('/api/posts/')
+
+    for index in range(20):
+        cache.resolve(f'/api/posts/{index}/')
+
+    stats = cache.stats()
+    assert cache.resolve('/api/posts/') is match
+    assert stats['evictions'] == 18
+    assert stats['probation_size'] == 2
@@ -0,0 +1,104 @@
+"""
+This module contains test cases for the full-text search helpers in 'src.search'.
+
+The database tests run on SQLite, through the FTS5 table and its triggers.
+"""
+
+import pytest
+from django.test import override_settings
+
+from src.models import Post
+from src.search import fts5_query, search_posts
+from src.views import PostViewSet
+from tests.factories import PostFactory
+
+
+def create_posts(*posts):
+    """
+    Save posts of the given titles and contents, in order.
+    """
+    saved = []
+    for title, content in posts:
+        post = PostFactory(title=title, content=content)
+        post.save()
+        saved.append(post)
+
+    return saved
+
+
+def search(text):
+    """
+    Return the ids of the posts matching a search, best matches first.
+    """
+    return list(search_posts(Post.objects.all(), text).values_list('id', flat=True))
+
+
+def test_fts5_query_quotes_terms():
+    """
+    Test that every term of the search text is quoted for FTS5.
+    """
+    assert fts5_query('django  search') == '"django" "search"'
+
+
+def test_fts5_query_escapes_operators():
+    """
+    Test that FTS5 operators and quotes typed by users are matched literally.
+    """
+    assert fts5_query('title: AND "x') == '"title:" "AND" """x"'
+
+
+def test_fts5_query_empty():
+    """
+    Test that blank search text gives an empty query.
+    """
+    assert fts5_query('   ') == ''
+
+
+@pytest.mark.django_db
+def test_search_posts_ranks_title_matches_first():
+    """
+    Test that the posts matching every term are found, those matching in their title
+    ranked first.
+    """
+    in_title, in_content, _other = create_posts(
+        ('Jungle vines', 'How to swing'),
+        ('Swinging', 'Life in the jungle, among the vines'),
+        ('Savanna', 'Life among the lions'),
+    )
+
+    assert search('jungle vines') == [in_title.id, in_content.id]
+    assert search('jungle lions') == []
+
+
+@pytest.mark.django_db
+def test_search_index_follows_writes():
+    """
+    Test that the triggers keep the search index in sync with updates and deletions.
+    """
+    post, = create_posts(('Jungle', 'Vines'))
+
+    post.content = 'Lions'
+    post.save()
+    assert search('vines') == []
+    assert search('lions') == [post.id]
+
+    post.delete()
+    assert search('jungle') == []
+
+
+@pytest.mark.django_db
+@override_settings(API_CACHE_ALIAS='default')
+def test_post_list_search_is_ranked(request_factory):
+    """
+    Test that the post list filtered by `?q=` is ordered by rank rather than by date.
+    """
+    in_title, in_content = create_posts(
+        ('Jungle book', 'A story'),
+        ('A story', 'Of the jungle'),
+    )
+
+    request = request_factory.get('/api/posts/', {'q': 'jungle'})
+    response = PostViewSet.as_view({'get': 'list'})(request)
+
+    assert response.status_code == 200
+    assert [post['id'] for post in response.data['results']] == [in_title.id, in_content.id]
@@ -0,0 +1,114 @@
+"""
+This module contains test cases for the serializers in 'src.serializers' that do not
+need a database.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.reverse import reverse as drf_reverse
+
+from src.serializers import (
+    BulkDeleteSerializer,
+    BulkPostListSerializer,
+    CustomUserSerializer,
+    PostSerializer,
+)
+
+
+def test_bulk_item_id():
+    """
+    Test that the ids of the items to update are coerced as integers, or None if invalid.
+    """
+    items = [{'id': 5}, {'id': '6'}, {'id': 'seven'}, {'title': 'Tarzan'}, ['id'], None]
+
+    assert [BulkPostListSerializer.get_item_id(item) for item in items] == [
+        5, 6, None, None, None, None,
+    ]
+
+
+def test_bulk_delete_requires_selection():
+    """
+    Test that an empty bulk delete selection is rejected.
+    """
+    serializer = BulkDeleteSerializer(data={})
+
+    assert not serializer.is_valid()
+    assert 'non_field_errors' in serializer.errors
+
+
+def test_bulk_delete_ids():
+    """
+    Test that a list of ids is a valid bulk delete selection.
+    """
+    serializer = BulkDeleteSerializer(data={'ids': [1, '2']})
+
+    assert serializer.is_valid()
+    assert serializer.validated_data == {'ids': [1, 2]}
+
+
+def test_bulk_delete_invalid_range():
+    """
+    Test that an invalid publication date is reported on its field.
+    """
+    serializer = BulkDeleteSerializer(data={'pub_date_after': 'yesterday'})
+
+    assert not serializer.is_valid()
+    assert 'pub_date_after' in serializer.errors
+
+
+def test_sparse_fields(request_factory):
+    """
+    Test that `?fields=` and `?omit=` trim the fields of a post.
+    """
+    request = Request(request_factory.get('/api/posts/', {'fields': 'id,title,content'}))
+    serializer = PostSerializer(context={'request': request})
+    assert list(serializer.fields) == ['id', 'title', 'content']
+
+    request = Request(request_factory.get('/api/posts/', {'omit': 'content'}))
+    serializer = PostSerializer(context={'request': request})
+    assert 'content' not in serializer.fields
+    assert 'title' in serializer.fields
+
+
+def test_sparse_fields_unknown(request_factory):
+    """
+    Test that selecting an unknown field is rejected.
+    """
+    request = Request(request_factory.get('/api/posts/', {'fields': 'id,search_vector'}))
+
+    with pytest.raises(ValidationError) as error:
+        PostSerializer(context={'request': request})
+
+    assert 'fields' in error.value.detail
+
+
+def test_sparse_fields_ignored_on_writes(request_factory):
+    """
+    Test that writes validate every field, whatever the query string.
+    """
+    request = Request(request_factory.post('/api/posts/?fields=id'))
+    serializer = PostSerializer(context={'request': request})
+
+    assert 'content' in serializer.fields
+
+
+def test_user_urls_reverse_once(request_factory):
+    """
+    Test that the user hyperlinks match `reverse()`, which is only called once per request.
+    """
+    request = Request(request_factory.get('/api/users/'))
+    users = [User(pk=pk, username=f'user{pk}') for pk in (1, 22, 333)]
+
+    with patch('rest_framework.relations.reverse', wraps=drf_reverse) as mock_reverse:
+        data = CustomUserSerializer(users, many=True, context={'request': request}).data
+
+    assert mock_reverse.call_count == 1
+    assert [user['url'] for user in data] == [
+        request.build_absolute_uri(reverse('user-detail', kwargs={'pk': pk}))
+        for pk in (1, 22, 333)
+    ]
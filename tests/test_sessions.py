@@ -0,0 +1,84 @@
+"""
+This module contains test cases for the session engine in 'src.sessions'.
+
+The tests only exercise the in-process layer, so they need neither Redis nor a database:
+any access to the database would fail the test.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.sessions import LocalSessionCache, SessionStore, local_sessions
+
+SESSION_KEY = 'a' * 32
+
+
+@pytest.fixture
+def enabled_l1():
+    """
+    Enable the L1 of the process, off by default.
+    """
+    with patch.object(local_sessions, 'timeout', 5):
+        yield
+
+
+def test_local_cache_lru_and_expiry():
+    """
+    Test that the local cache evicts the least recently used and expired sessions.
+    """
+    cache = LocalSessionCache(size=2, timeout=10)
+    cache.set('a', b'1')
+    cache.set('b', b'2')
+    cache.get('a')
+    cache.set('c', b'3')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1'
+
+    with patch('src.sessions.monotonic', return_value=10 ** 9):
+        assert cache.get('a') is None
+
+
+def test_disabled_local_cache_keeps_nothing():
+    """
+    Test that the L1 keeps no session with a zero timeout, the default.
+    """
+    cache = LocalSessionCache(size=2, timeout=0)
+    cache.set('a', b'1')
+
+    assert cache.get('a') is None
+
+
+@pytest.mark.usefixtures('enabled_l1')
+def test_load_from_local_cache():
+    """
+    Test that a session cached locally is loaded without Redis nor the database.
+    """
+    store = SessionStore(SESSION_KEY)
+    local_sessions.set(SESSION_KEY, store.serializer().dumps({'_auth_user_id': '1'}))
+
+    try:
+        assert store['_auth_user_id'] == '1'
+    finally:
+        local_sessions.delete(SESSION_KEY)
+
+
+@pytest.mark.usefixtures('enabled_l1')
+def test_unchanged_session_not_saved():
+    """
+    Test that saving a session whose data did not change writes nothing.
+    """
+    store = SessionStore(SESSION_KEY)
+    local_sessions.set(SESSION_KEY, store.serializer().dumps({'theme': 'dark'}))
+
+    try:
+        store['theme'] = 'dark'
+        assert store.modified
+        assert store.is_unchanged()
+        store.save()
+
+        store['theme'] = 'light'
+        assert not store.is_unchanged()
+    finally:
+        local_sessions.delete(SESSION_KEY)
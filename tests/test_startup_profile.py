@@ -0,0 +1,22 @@
+"""
+This module contains test cases for the helpers of the 'startup_profile' command.
+"""
+
+from src.management.commands.startup_profile import parse_importtime
+
+
+def test_parse_importtime():
+    """
+    Test that the import time lines are parsed, and any other line ignored.
+    """
+    output = (
+        'import time: self [us] | cumulative | imported package\n'
+        'import time:       120 |        120 |   decouple\n'
+        'some warning\n'
+        'import time:      1825 |      29240 | setup.settings\n'
+    )
+
+    assert parse_importtime(output) == [
+        ('decouple', 120, 120),
+        ('setup.settings', 1825, 29240),
+    ]
@@ -0,0 +1,61 @@
+"""
+This module contains test cases for the precomputed OpenAPI schema served by 'setup.swagger'.
+"""
+
+import gzip
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import RequestFactory, override_settings
+
+from setup.swagger import SchemaDocument, openapi_schema
+
+CONTENT = b'{"swagger": "2.0"}'
+
+
+@override_settings(DEBUG=False)
+@patch('setup.swagger.get_schema_document', return_value=SchemaDocument(CONTENT))
+def test_openapi_schema_gzip_and_etag(_get_schema_document):
+    """
+    Test that the schema is gzipped for the clients accepting it, with its ETag.
+    """
+    request = RequestFactory().get('/swagger/openapi.json', HTTP_ACCEPT_ENCODING='gzip, br')
+    response = openapi_schema(request)
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(response.content) == CONTENT
+    assert response.headers['ETag'] == SchemaDocument(CONTENT).etag
+
+
+@override_settings(DEBUG=False)
+@patch('setup.swagger.get_schema_document', return_value=SchemaDocument(CONTENT))
+def test_openapi_schema_not_modified(_get_schema_document):
+    """
+    Test that a matching If-None-Match is answered with a 304, and plain content otherwise.
+    """
+    factory = RequestFactory()
+    etag = SchemaDocument(CONTENT).etag
+
+    response = openapi_schema(factory.get('/swagger/openapi.json', HTTP_IF_NONE_MATCH=etag))
+    assert response.status_code == 304
+
+    response = openapi_schema(factory.get('/swagger/openapi.json', HTTP_IF_NONE_MATCH='"old"'))
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert 'Content-Encoding' not in response.headers
+
+
+@patch('src.management.commands.build_openapi_schema.generate_schema', return_value=CONTENT)
+def test_build_openapi_schema(_generate_schema, tmp_path):
+    """
+    Test that the command writes the schema to the output file, leaving no partial file.
+    """
+    path = tmp_path / 'static' / 'openapi.json'
+
+    call_command('build_openapi_schema', output=str(path), stdout=StringIO())
+
+    assert path.read_bytes() == CONTENT
+    assert [item.name for item in path.parent.iterdir()] == ['openapi.json']
@@ -0,0 +1,69 @@
+"""
+This module contains test cases for the request timing helpers in 'src.timing'.
+"""
+
+from django.template import engines
+
+from src.timing import RequestTimer, TimedLocMemCache, get_timer, timed
+
+
+def test_timer_counts_nested_calls_once():
+    """
+    Test that a call nested in a call of the same kind is not counted twice.
+    """
+    timer = RequestTimer()
+    token = timer.start()
+    try:
+        assert get_timer() is timer
+        with timed('db'):
+            with timed('db'):
+                pass
+        with timed('cache'):
+            pass
+    finally:
+        RequestTimer.stop(token)
+
+    assert get_timer() is None
+    assert timer.counts == {'db': 1, 'cache': 1}
+    assert timer.durations['db'] >= 0
+
+
+def test_timed_outside_of_a_request():
+    """
+    Test that calls outside of a timed request are not recorded.
+    """
+    with timed('db'):
+        pass
+
+    assert get_timer() is None
+
+
+def test_timed_cache():
+    """
+    Test that the calls of the timed cache backends are recorded once each.
+    """
+    cache = TimedLocMemCache('timing-test', {})
+    timer = RequestTimer()
+    token = timer.start()
+    try:
+        cache.set('jane', 'porter')
+        assert cache.get_or_set('tarzan', 'ape') == 'ape'
+    finally:
+        RequestTimer.stop(token)
+
+    assert timer.counts == {'cache': 2}
+
+
+def test_timed_templates():
+    """
+    Test that template renders are recorded.
+    """
+    template = engines['django'].from_string('Hello {{ name }}')
+    timer = RequestTimer()
+    token = timer.start()
+    try:
+        assert template.render({'name': 'Jane'}) == 'Hello Jane'
+    finally:
+        RequestTimer.stop(token)
+
+    assert timer.counts == {'template': 1}
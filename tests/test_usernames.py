@@ -0,0 +1,170 @@
+"""
+This module contains test cases for the username index in 'src.usernames'.
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+
+from src.serializers import UsernameAvailabilitySerializer
+from src.signals import index_username
+from src.usernames import BloomFilter, LocalBitmap, UsernameIndex
+
+
+def make_index(usernames):
+    """
+    Build a ready, in-memory username index holding some usernames.
+    """
+    bloom = BloomFilter(1 << 16, 7)
+    index = UsernameIndex(bloom, LocalBitmap(bloom.bits))
+    index.add(usernames)
+    index.bitmap.mark_ready()
+
+    return index
+
+
+def test_bloom_positions():
+    """
+    Test that the positions of a value are stable and within the filter.
+    """
+    bloom = BloomFilter(1000, 5)
+
+    positions = bloom.positions('tarzan')
+
+    assert positions == bloom.positions('tarzan')
+    assert len(positions) == 5
+    assert all(0 <= position < 1000 for position in positions)
+
+
+def test_candidates_have_no_false_negatives():
+    """
+    Test that every taken username is a candidate, and that few others are.
+    """
+    taken = [f'user{i}' for i in range(1000)]
+    index = make_index(taken)
+
+    assert index.candidates(taken) == taken
+
+    others = [f'other{i}' for i in range(1000)]
+    assert len(index.candidates(others)) < 10
+
+
+def test_unbuilt_index_checks_every_username():
+    """
+    Test that every username is a candidate until the index is built, in the background.
+    """
+    bloom = BloomFilter(1 << 16, 7)
+    index = UsernameIndex(bloom, LocalBitmap(bloom.bits))
+
+    with patch.object(index, 'request_build') as request_build:
+        assert index.candidates(['tarzan', 'jane']) == ['tarzan', 'jane']
+
+    request_build.assert_called_once_with()
+
+
+def test_build_requests_are_throttled():
+    """
+    Test that a process requests a build at most once per build interval.
+    """
+    bloom = BloomFilter(1 << 16, 7)
+    index = UsernameIndex(bloom, LocalBitmap(bloom.bits), build_interval=60)
+
+    with patch('src.usernames.Thread') as thread:
+        index.request_build()
+        index.request_build()
+
+    thread.assert_called_once()
+
+
+def test_rebuild_skipped_while_another_build_holds_the_lock():
+    """
+    Test that a rebuild neither waits for nor disturbs a build in progress.
+    """
+    bloom = BloomFilter(1 << 16, 7)
+    index = UsernameIndex(bloom, LocalBitmap(bloom.bits))
+    token = index.bitmap.acquire_build()
+
+    assert index.rebuild() is None
+
+    index.bitmap.release_build(object())
+    assert index.bitmap.acquire_build() is None
+    index.bitmap.release_build(token)
+    assert index.bitmap.acquire_build() is not None
+
+
+def test_build_is_swapped_in_once_complete():
+    """
+    Test that readers see the previous bitmap until the staging bitmap is swapped in.
+    """
+    bitmap = LocalBitmap(64)
+    bitmap.set([1])
+    token = bitmap.acquire_build()
+
+    bitmap.set_staging(token, [2])
+    assert bitmap.get([1, 2]) == [1, 0]
+    assert not bitmap.is_ready()
+
+    assert bitmap.swap(token)
+    assert bitmap.get([1, 2]) == [0, 1]
+    assert bitmap.is_ready()
+    assert not bitmap.swap(token)
+
+
+def test_usernames_added_during_a_build_are_kept():
+    """
+    Test that the usernames added while a build runs, e.g. committed after it read the
+    users, are in the bitmap swapped in.
+    """
+    bloom = BloomFilter(1 << 16, 7)
+    index = UsernameIndex(bloom, LocalBitmap(bloom.bits))
+
+    def read_users(*args, **kwargs):
+        index.add(['jane'])
+        yield 'tarzan'
+
+    with patch('src.usernames.User.objects.order_by') as order_by:
+        order_by.return_value.values_list.return_value.iterator.side_effect = read_users
+        assert index.rebuild() == 1
+
+    assert index.candidates(['tarzan', 'jane', 'cheeta']) == ['tarzan', 'jane']
+
+
+def test_index_username_skips_other_saves():
+    """
+    Test that only created users and username changes are added to the index.
+    """
+    user = User(username='tarzan')
+
+    with patch('src.signals.transaction.on_commit',
+               side_effect=lambda func, **kwargs: func()), \
+            patch('src.signals.username_index.add') as add:
+        index_username(User, user, created=False, update_fields=frozenset(['last_login']),
+                       using='default')
+        add.assert_not_called()
+
+        index_username(User, user, created=True, update_fields=None, using='default')
+        index_username(User, user, created=False, update_fields=frozenset(['username']),
+                       using='default')
+        assert add.call_count == 2
+
+
+def test_available_usernames_need_no_query():
+    """
+    Test that usernames missing from the index are available without a query.
+    """
+    index = make_index(['tarzan'])
+
+    assert index.availability(['jane', 'cheeta']) == {'jane': True, 'cheeta': True}
+
+
+def test_availability_serializer(request_factory):
+    """
+    Test that the usernames are read from repeated query parameters, and bounded.
+    """
+    request = request_factory.get('/api/users/available/?username=jane&username=tarzan')
+    serializer = UsernameAvailabilitySerializer(data=request.GET)
+    assert serializer.is_valid()
+    assert serializer.validated_data['username'] == ['jane', 'tarzan']
+
+    usernames = [f'user{i}' for i in range(UsernameAvailabilitySerializer.max_usernames + 1)]
+    assert not UsernameAvailabilitySerializer(data={'username': usernames}).is_valid()
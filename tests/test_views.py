@@ -1,7 +1,12 @@
 """
 Test module for src.views.
 """
-from src.views import index, signup
+from unittest.mock import patch
+
+from django.db import IntegrityError
+from django.test import override_settings
+
+from src.views import UsernameAvailabilityThrottle, index, metrics, signup
 
 
 def test_index_view(request_factory):
@@ -48,3 +53,54 @@ def test_signup_view_get(request_factory):
 
     # Check for a successful response status code
     assert response.status_code == 200
+
+
+def test_signup_view_username_taken_meanwhile(request_factory):
+    """
+    Test that a username taken by a concurrent signup, after the form was validated, is
+    reported on the form instead of failing the request.
+    """
+    request = request_factory.post('/signup/', {'username': 'tarzan'})
+
+    with patch('src.views.CustomUserCreationForm') as form_class, \
+            patch('src.views.transaction.atomic'), \
+            patch('src.views.render') as render:
+        form = form_class.return_value
+        form.is_valid.return_value = True
+        form.save.side_effect = IntegrityError
+        signup(request)
+
+    form.add_error.assert_called_once_with('username', form.username_taken_message)
+    render.assert_called_once_with(request, 'src/signup.html', {'form': form})
+
+
+@override_settings(METRICS_TOKEN='secret', TASK_METRICS_DIR='')
+def test_metrics_view(request_factory, tmp_path):
+    """
+    Test that the metrics are served in the Prometheus text format, with the token only.
+    """
+    with override_settings(REQUEST_METRICS_DIR=str(tmp_path)):
+        assert metrics(request_factory.get('/metrics')).status_code == 401
+
+        response = metrics(request_factory.get('/metrics', HTTP_AUTHORIZATION='Bearer secret'))
+
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    assert b'# TYPE http_request_duration_seconds histogram' in response.content
+    assert b'app_cache_hits_total{cache="posts"}' in response.content
+
+
+@override_settings(METRICS_TOKEN='', TASK_METRICS_DIR='', REQUEST_METRICS_DIR='')
+def test_metrics_view_without_token(request_factory):
+    """
+    Test that without a token, the metrics are only served to the internal addresses.
+    """
+    assert metrics(request_factory.get('/metrics', REMOTE_ADDR='203.0.113.7')).status_code == 403
+    assert metrics(request_factory.get('/metrics', REMOTE_ADDR='127.0.0.1')).status_code == 200
+
+
+def test_username_availability_throttle_rate():
+    """
+    Test that the username availability checks are throttled at the configured rate.
+    """
+    assert UsernameAvailabilityThrottle().rate == '60/min'